@@ -1,8 +1,11 @@
 # analizador_lexico.py
+import hashlib
 import ply.lex as lex  # se importa lex del paquete ply para el analizador léxico
 
+from diagnosticos import tabla_de
+
 # Listas para errores léxicos
-listar_errores_lexicos = []      # guarda (linea, columna, mensaje)
+listar_errores_lexicos = []      # guarda (línea desde 0, offset en el texto, mensaje)
 errores_Desc = []                # mensajes descriptivos
 
 # Lista de tokens
@@ -50,6 +53,8 @@ t_PUNTOYCOMA = r";"
 # Reglas regulares con acciones
 def t_CADENA(t):
     r'"[^"]*"'
+    # Una cadena puede ocupar varias líneas: lineno tiene que seguir al texto
+    t.lexer.lineno += t.value.count("\n")
     return t
 
 def t_REAL(t):
@@ -74,13 +79,49 @@ def t_newline(t):
 # Manejo de errores léxicos con mensaje costeño
 def t_error(t):
     error_char = t.value[0]
+    linea, columna = tabla_de(t.lexer).posicion(t.lexpos)
     mensaje = (
         f" Nojoda llave, esa vaina está mala: "
-        f"esa vaina '{error_char}' no va ahí {t.lexpos}"
+        f"esa vaina '{error_char}' no va ahí (línea {linea}, columna {columna})"
     )
-    listar_errores_lexicos.append((t.lineno - 1, t.lexpos, mensaje))
-    errores_Desc.append(mensaje)
+    # Cada lexer guarda sus propios errores (ver nuevo_lexer)
+    t.lexer.listar_errores_lexicos.append((t.lineno - 1, t.lexpos, mensaje))
+    t.lexer.errores_Desc.append(mensaje)
     t.lexer.skip(1)
 
-# Crear el analizador léxico
-lexer = lex.lex()
+# Tabla precalculada del léxico (pqek_lextab.py, se regenera con generar_tablas.py)
+LEXTAB = "pqek_lextab"
+
+
+def firma_lexico():
+    """Huella de las reglas del léxico; si cambia, la tabla precalculada ya no sirve."""
+    reglas = [v for k, v in globals().items() if k.startswith("t_") and callable(v)]
+    reglas.sort(key=lambda f: f.__code__.co_firstlineno)
+    partes = [repr(tokens), repr(sorted(reserved.items())), repr(t_ignore)]
+    partes += [f"{k}={v!r}" for k, v in sorted(globals().items())
+               if k.startswith("t_") and isinstance(v, str)]
+    partes += [f"{f.__name__}={f.__doc__!r}" for f in reglas]
+    return hashlib.md5("\n".join(partes).encode("utf-8")).hexdigest()
+
+
+def _tabla_vigente():
+    try:
+        tabla = __import__(LEXTAB)
+    except ImportError:
+        return False
+    return getattr(tabla, "_firma_pqek", None) == firma_lexico()
+
+
+# Crear el analizador léxico (desde la tabla si está al día; nunca escribe archivos)
+lexer = lex.lex(optimize=_tabla_vigente(), lextab=LEXTAB)
+lexer.listar_errores_lexicos = listar_errores_lexicos
+lexer.errores_Desc = errores_Desc
+
+
+def nuevo_lexer():
+    """Clon del lexer con sus propias listas de errores y la línea en 1."""
+    nuevo = lexer.clone()
+    nuevo.lineno = 1
+    nuevo.listar_errores_lexicos = []
+    nuevo.errores_Desc = []
+    return nuevo
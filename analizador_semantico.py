@@ -1,27 +1,47 @@
 from analizador_sintactico import *
+from despacho import Despacho
+from diagnosticos import Diagnostico
 
 class SemanticAnalyzer:
+    # visit_<clase del nodo> por tipo de nodo (ver despacho.py)
+    visitas = Despacho("visit_", "generic_visit", Node)
+
     def __init__(self):
+        self._visitas = self.visitas.tabla(type(self))
         self.symbols = {}
+        # nombre → slot: el índice de la variable en la memoria del intérprete
+        # (0, 1, 2... en orden de aparición), que queda anotado en cada VarDecl,
+        # Assign y VarRef. En ejecución ya no se busca nada por nombre: symbols
+        # queda solo para los diagnósticos. También tienen slot los nombres sin
+        # declarar, así en ejecución fallan igual que antes ("no existe").
+        self.slots = {}
         self.errors = []
+        self.diagnosticos = []  # los mismos errores, con su posición
 
     def analyze(self, node):
         self.visit(node)
+        self.check()
+
+    def check(self):
+        """Lanza la excepción con todos los errores acumulados, si hay alguno."""
         if self.errors:
             msg = "Ey llave… esa vaina está mala revisa bien:\n"
             for e in self.errors:
                 msg += f"   ➤ {e}\n"
             raise Exception(msg)
 
+    def error(self, node, msg, largo=1):
+        """Anota un error en errors y, con la posición del nodo, en diagnosticos."""
+        self.errors.append(msg)
+        self.diagnosticos.append(
+            Diagnostico("semantico", getattr(node, "lineno", None), getattr(node, "col", None), msg, largo)
+        )
+
     def visit(self, node):
-        name = "visit_" + node.__class__.__name__
-        func = getattr(self, name, self.generic_visit)
-        return func(node)
+        return self._visitas[node.__class__](self, node)
 
     def generic_visit(self, node):
-        self.errors.append(
-            f"Nojoda, quedé mamando '{type(node).__name__}'."
-        )
+        self.error(node, f"Nojoda, quedé mamando '{type(node).__name__}'.")
 
     def visit_Program(self, node):
         for s in node.stmts:
@@ -29,25 +49,30 @@ class SemanticAnalyzer:
 
     def visit_VarDecl(self, node):
         if node.name in self.symbols:
-            self.errors.append(
-                f"hey mi llave, ¿pa' qué declaras '{node.name}' otra vez? ¡Ya existe!"
+            self.error(
+                node, f"hey mi llave, ¿pa' qué declaras '{node.name}' otra vez? ¡Ya existe!", len(node.name)
             )
         else:
             self.symbols[node.name] = {"tipo": node.tipo, "valor": None}
+        node.slot = self.slot(node.name)
 
     def visit_Assign(self, node):
+        node.slot = self.slot(node.name)
         if node.name not in self.symbols:
-            self.errors.append(
-                f"hey loco, ¿y dónde declaraste '{node.name}'? Esa vaina ni existe."
+            self.error(
+                node, f"hey loco, ¿y dónde declaraste '{node.name}'? Esa vaina ni existe.", len(node.name)
             )
+            self._anotar_slots(node.expr)
             return
 
         tipo_var = self.symbols[node.name]["tipo"]
         val, tipo_expr = self.visit(node.expr)
 
         if not self.type_compatible(tipo_var, tipo_expr):
-            self.errors.append(
-                f"Esa vaina no sirve, No puedes meter '{tipo_expr}' dentro de '{tipo_var}' en '{node.name}'."
+            self.error(
+                node,
+                f"Esa vaina no sirve, No puedes meter '{tipo_expr}' dentro de '{tipo_var}' en '{node.name}'.",
+                len(node.name),
             )
         else:
             self.symbols[node.name]["valor"] = val
@@ -59,17 +84,58 @@ class SemanticAnalyzer:
         return None, None
 
     def visit_BinaryOp(self, node):
-        l, tl = self.visit(node.left)
-        r, tr = self.visit(node.right)
-
-        if tl not in ("Entero", "Real") or tr not in ("Entero", "Real"):
-            self.errors.append(
-                f"Aja llave… ¿cómo vas a operar '{tl}' con '{tr}'? ¡Eso no pega ni con gota magica!"
-            )
+        # Postorden con pila explícita: la profundidad no choca con el límite de
+        # recursión. Los errores salen en el mismo orden que visitando
+        # izquierda, derecha y después la operación. Un None en la pila marca
+        # que el nodo de abajo ya tiene sus dos operandos resueltos.
+        tipos = []
+        hojas = []  # valores de las hojas, de izquierda a derecha
+        pendientes = [node]
+        while pendientes:
+            n = pendientes.pop()
+            if n is not None:
+                if n.__class__ is BinaryOp:
+                    pendientes += (n, None, n.right, n.left)
+                else:
+                    val, tipo = self.visit(n)
+                    hojas.append(val)
+                    tipos.append(tipo)
+                continue
+
+            n = pendientes.pop()
+            tr = tipos.pop()
+            tl = tipos.pop()
+            if tl not in ("Entero", "Real") or tr not in ("Entero", "Real"):
+                self.error(
+                    n, f"Aja llave… ¿cómo vas a operar '{tl}' con '{tr}'? ¡Eso no pega ni con gota magica!"
+                )
+                tipos.append(None)
+            else:
+                tipos.append("Real" if "Real" in (tl, tr) else "Entero")
+
+        tipo = tipos.pop()
+        if tipo is None:
             return None, None
-
-        tipo = "Real" if "Real" in (tl, tr) else "Entero"
-        return f"({l} {node.op} {r})", tipo
+        return self._mostrar(node, hojas), tipo
+
+    def _mostrar(self, node, hojas):
+        """Arma el texto "(l op r)" de toda la expresión de una sola pasada."""
+        partes = []
+        hojas = iter(hojas)
+        pendientes = [node]
+        while pendientes:
+            n = pendientes.pop()
+            if n.__class__ is str:
+                partes.append(n)
+            elif n.__class__ is BinaryOp:
+                partes.append("(")
+                pendientes.append(")")
+                pendientes.append(n.right)
+                pendientes.append(f" {n.op} ")
+                pendientes.append(n.left)
+            else:
+                partes.append(f"{next(hojas)}")
+        return "".join(partes)
 
     def visit_Number(self, node):
         return node.value, node.kind.capitalize()
@@ -78,14 +144,36 @@ class SemanticAnalyzer:
         return node.value, "Texto"
 
     def visit_VarRef(self, node):
+        node.slot = self.slot(node.name)
         if node.name not in self.symbols:
-            self.errors.append(
-                f"hey loco, '{node.name}'¿esa vaina que?"
-            )
+            self.error(node, f"hey loco, '{node.name}'¿esa vaina que?", len(node.name))
             return None, None
 
         info = self.symbols[node.name]
-        return info["valor"], info["tipo"]
+        valor = info["valor"]
+        if isinstance(valor, str) and valor.startswith("("):
+            # Expresión: se nombra la variable en vez de copiarla; copiarla hacía
+            # crecer sin límite los textos en cadenas largas de asignaciones
+            valor = node.name
+        return valor, info["tipo"]
+
+    def slot(self, nombre):
+        """El slot de la variable; la primera vez que aparece el nombre, uno nuevo."""
+        slot = self.slots.get(nombre)
+        if slot is None:
+            slot = self.slots[nombre] = len(self.slots)
+        return slot
+
+    def _anotar_slots(self, node):
+        """Solo los slots de las variables de una expresión que no se revisa."""
+        pendientes = [node]
+        while pendientes:
+            n = pendientes.pop()
+            if n.__class__ is BinaryOp:
+                pendientes.append(n.right)
+                pendientes.append(n.left)
+            elif n.__class__ is VarRef:
+                n.slot = self.slot(n.name)
 
     def type_compatible(self, esperado, recibido):
         if esperado == recibido:
@@ -1,57 +1,100 @@
+import copy
+import os
+import threading
+import ply.lex as lex
 import ply.yacc as yacc
-from analizador_lexico import tokens, lexer
+from analizador_lexico import tokens as tokens_lexicos, lexer
+from diagnosticos import Diagnostico, tabla_de
+
+# INICIO no sale del lexer: lo pone parsear() al principio (ver ahí)
+tokens = tokens_lexicos + ["INICIO"]
 
 
 # NODOS DEL AST
 
 
+# Todos los nodos usan __slots__ (sin __dict__ por instancia) y guardan la
+# línea y la columna (ambas desde 1) del token que los origina. VarDecl, Assign
+# y VarRef llevan además el slot de su variable en la memoria del intérprete:
+# lo pone el análisis semántico (None = todavía sin resolver).
+
 class Node:
-    pass
+    __slots__ = ("lineno", "col")
 
 
 class Program(Node):
-    def __init__(self, stmts):
+    __slots__ = ("stmts",)
+
+    def __init__(self, stmts, lineno=None, col=None):
         self.stmts = stmts
+        self.lineno, self.col = lineno, col
 
 
 class VarDecl(Node):
-    def __init__(self, name, tipo):
+    __slots__ = ("name", "tipo", "slot")
+
+    def __init__(self, name, tipo, lineno=None, col=None, slot=None):
         self.name, self.tipo = name, tipo
+        self.lineno, self.col = lineno, col
+        self.slot = slot
 
 
 class Assign(Node):
-    def __init__(self, name, expr):
+    __slots__ = ("name", "expr", "slot")
+
+    def __init__(self, name, expr, lineno=None, col=None, slot=None):
         self.name, self.expr = name, expr
+        self.lineno, self.col = lineno, col
+        self.slot = slot
 
 
 class Captura(Node):
-    def __init__(self, tipo):
+    __slots__ = ("tipo",)
+
+    def __init__(self, tipo, lineno=None, col=None):
         self.tipo = tipo
+        self.lineno, self.col = lineno, col
 
 
 class Mensaje(Node):
-    def __init__(self, texto):
+    __slots__ = ("texto",)
+
+    def __init__(self, texto, lineno=None, col=None):
         self.texto = texto
+        self.lineno, self.col = lineno, col
 
 
 class BinaryOp(Node):
-    def __init__(self, op, left, right):
+    __slots__ = ("op", "left", "right")
+
+    def __init__(self, op, left, right, lineno=None, col=None):
         self.op, self.left, self.right = op, left, right
+        self.lineno, self.col = lineno, col
 
 
 class Number(Node):
-    def __init__(self, value, kind):
+    __slots__ = ("value", "kind")
+
+    def __init__(self, value, kind, lineno=None, col=None):
         self.value, self.kind = value, kind
+        self.lineno, self.col = lineno, col
 
 
 class String(Node):
-    def __init__(self, value):
+    __slots__ = ("value",)
+
+    def __init__(self, value, lineno=None, col=None):
         self.value = value
+        self.lineno, self.col = lineno, col
 
 
 class VarRef(Node):
-    def __init__(self, name):
+    __slots__ = ("name", "slot")
+
+    def __init__(self, name, lineno=None, col=None, slot=None):
         self.name = name
+        self.lineno, self.col = lineno, col
+        self.slot = slot
 
 
 # PRECEDENCIA
@@ -64,21 +107,33 @@ precedence = (
 start = "program"
 
 
+# POSICIONES
+
+def _pos(p, n):
+    """(línea, columna) del símbolo terminal n de la producción, sacadas de la
+    tabla de inicios de línea del texto (no de lexer.lineno)."""
+    return tabla_de(p.lexer).posicion(p.lexpos(n))
+
+
 # PRODUCCIONES
 
 def p_program(p):
-    "program : stmt_list"
-    p[0] = Program(p[1])
+    """program : stmt_list
+               | INICIO stmt_list"""
+    p[0] = Program(p[len(p) - 1])
 
 
 def p_stmt_list_multi(p):
     "stmt_list : stmt_list statement"
-    p[0] = p[1] + [p[2]]
+    # Se agrega sobre la misma lista: copiarla en cada sentencia hacía el parseo O(n²)
+    if p[2] is not None:
+        p[1].append(p[2])
+    p[0] = p[1]
 
 
 def p_stmt_list_single(p):
     "stmt_list : statement"
-    p[0] = [p[1]]
+    p[0] = [p[1]] if p[1] is not None else []
 
 
 def p_statement(p):
@@ -89,25 +144,31 @@ def p_statement(p):
     p[0] = p[1]
 
 
+def p_statement_error(p):
+    "statement : error PUNTOYCOMA"
+    # Recuperación en modo pánico: se descarta hasta el próximo ';' y se sigue
+    p[0] = None
+
+
 # DECLARACIÓN
 
 def p_declaracion(p):
     "declaracion : ID TIPO"
-    p[0] = VarDecl(p[1], p[2])
+    p[0] = VarDecl(p[1], p[2], *_pos(p, 1))
 
 
 # ASIGNACIÓN
 
 def p_asignacion(p):
     "asignacion : ID ASSIGN expresion"
-    p[0] = Assign(p[1], p[3])
+    p[0] = Assign(p[1], p[3], *_pos(p, 1))
 
 
 # LECTURA (Captura)
 
 def p_lectura(p):
     "lectura : ID ASSIGN FUNCION PUNTO TIPO PAREN_A PAREN_C"
-    p[0] = Assign(p[1], Captura(p[5]))
+    p[0] = Assign(p[1], Captura(p[5], *_pos(p, 3)), *_pos(p, 1))
 
 
 # ESCRITURA (Mensaje.Texto)
@@ -115,7 +176,7 @@ def p_lectura(p):
 def p_escritura(p):
     "escritura : FUNCION PUNTO TIPO PAREN_A CADENA PAREN_C"
     txt = p[5][1:-1]  # remover comillas
-    p[0] = Mensaje(txt)
+    p[0] = Mensaje(txt, *_pos(p, 1))
 
 
 # EXPRESIONES
@@ -125,7 +186,7 @@ def p_expresion_binaria(p):
                  | expresion MINUS expresion
                  | expresion TIMES expresion
                  | expresion DIVIDE expresion"""
-    p[0] = BinaryOp(p[2], p[1], p[3])
+    p[0] = BinaryOp(p[2], p[1], p[3], *_pos(p, 2))
 
 
 def p_expresion_paren(p):
@@ -139,35 +200,202 @@ def p_expresion_numero(p):
     raw = p[1]
 
     if "," in raw:
-        # Guarda reales como texto con coma (12,5)
-        p[0] = Number(raw, "Real")
+        # Reales como float: la coma solo vuelve al mostrarlos (Interpreter._formatear)
+        p[0] = Number(float(raw.replace(",", ".")), "Real", *_pos(p, 1))
     else:
         # Enteros como int
-        p[0] = Number(int(raw), "Entero")
+        p[0] = Number(int(raw), "Entero", *_pos(p, 1))
 
 
 def p_expresion_cadena(p):
     "expresion : CADENA"
-    p[0] = String(p[1][1:-1])
+    p[0] = String(p[1][1:-1], *_pos(p, 1))
 
 
 def p_expresion_id(p):
     "expresion : ID"
-    p[0] = VarRef(p[1])
+    p[0] = VarRef(p[1], *_pos(p, 1))
 
 
 # ERROR SINTÁCTICO
 
+# Errores del parseo en curso en este hilo; solo se llenan dentro de parsear().
+# Fuera de él (parser.parse directo) p_error sigue lanzando en el primer error.
+_recuperando = threading.local()
+
+# Token que parsear() agrega al final si la última sentencia no cerró con ';'
+FIN = "FIN"
+
+
 def p_error(p):
-    if p:
-        raise Exception(
-            f"Aja llave… ¿y esa vaina qué? "
-            f"Esa vaina '{p.value}' (tipo={p.type}) no va ahí, revise la línea {p.lineno}, llave."
-        )
+    if p is None:
+        linea = columna = None
+        largo = 1
+        msg = "Nojoda, como que te faltó algo por ahí."
     else:
-        raise Exception("Nojoda, como que te faltó algo por ahí.")
-
+        linea, columna = tabla_de(p.lexer).posicion(p.lexpos)
+        largo = len(p.value)
+        if p.type == FIN:
+            msg = "Nojoda, como que te faltó algo por ahí."
+        else:
+            msg = (
+                f"Aja llave… ¿y esa vaina qué? "
+                f"Esa vaina '{p.value}' (tipo={p.type}) no va ahí, revise la línea {linea}, llave."
+            )
+    errores = getattr(_recuperando, "errores", None)
+    if errores is None:
+        raise Exception(msg)
+
+    if p is None:
+        # Fin del archivo sin ninguna sentencia
+        linea, columna = tabla_de(_recuperando.lexer).posicion(len(_recuperando.lexer.lexdata))
+    errores.append(Diagnostico("sintactico", linea, columna, msg, largo))
+
+
+def _token_falso(tipo, ultimo, lexer):
+    """Token de mentiras justo después de `ultimo` (o al principio si es None)."""
+    tok = lex.LexToken()
+    tok.type, tok.value = tipo, ""
+    if ultimo is None:
+        tok.lineno, tok.lexpos = lexer.lineno, 0
+    else:
+        tok.lineno = ultimo.lineno
+        tok.lexpos = ultimo.lexpos + len(ultimo.value)
+    tok.lexer = lexer
+    return tok
+
+
+def parsear(code, lexer=None, parser=None):
+    """Parsea todo el código sin detenerse en el primer error sintáctico.
+
+    Cada sentencia mal escrita se descarta hasta su ';' (ver p_statement_error)
+    y se sigue con la próxima. Devuelve (Program con las sentencias válidas,
+    [Diagnostico] de todos los errores sintácticos).
+    """
+    if lexer is None:
+        from analizador_lexico import lexer
+    if parser is None:
+        parser = get_parser()
+
+    lexer.lineno = 1
+    lexer.input(code)
+    return parsear_flujo(lexer.token, lexer, parser)
+
+
+def parsear_flujo(siguiente, lexer, parser):
+    """Como parsear, pero los tokens salen de siguiente() (None al final).
+
+    lexer es quien da las posiciones: su tabla_lineas (ver tabla_de) tiene que
+    convertir el lexpos de esos tokens, como hace fuente_archivo.FuenteArchivo.
+    """
+    ultimo = None
+    # Con solo el estado inicial en la pila, PLY no usa la regla de error: va
+    # tirando tokens de a uno y reintenta desde ahí (y "3 x = 1;" quedaría como
+    # "x = 1;"). INICIO deja algo en la pila antes de la primera sentencia.
+    cierre = [_token_falso("INICIO", None, lexer)]
+
+    def token():
+        nonlocal ultimo
+        if cierre:
+            tok = cierre.pop()
+        else:
+            tok = siguiente()
+            if tok is None and ultimo is not None and ultimo.type != "PUNTOYCOMA":
+                # La última sentencia quedó sin ';'. En el fin del archivo PLY no se
+                # recupera (devuelve None y se pierde todo el AST): FIN provoca el
+                # error y el ';' de mentiras cierra la sentencia descartada.
+                cierre.append(_token_falso("PUNTOYCOMA", ultimo, lexer))
+                tok = _token_falso(FIN, ultimo, lexer)
+            elif ultimo is not None and ultimo.type == "PUNTOYCOMA":
+                # Empieza otra sentencia: su primer error se reporta aunque PLY
+                # siga en recuperación por la anterior (sin esto calla los
+                # errores de los tres tokens siguientes)
+                parser.errok()
+        if tok is not None:
+            ultimo = tok
+        return tok
+
+    errores = []
+    _recuperando.errores, _recuperando.lexer = errores, lexer
+    try:
+        ast = parser.parse(lexer=lexer, tokenfunc=token)
+    finally:
+        _recuperando.errores = _recuperando.lexer = None
+    return (ast if ast is not None else Program([])), errores
+
+
+
+# PARSEO EN FLUJO (sentencia por sentencia)
+
+class _TokenFeed:
+    """Le entrega al parser los tokens de una sola sentencia."""
+
+    def __init__(self, tokens, lexdata, tabla_lineas):
+        self._tokens = iter(tokens)
+        self.lexdata = lexdata
+        self.tabla_lineas = tabla_lineas  # para calcular líneas y columnas (ver _pos)
+
+    def input(self, data):
+        pass
+
+    def token(self):
+        return next(self._tokens, None)
+
+
+def iter_statements(code, lexer=None, parser=None):
+    """Genera cada sentencia apenas se lee su PUNTOYCOMA.
+
+    Como ninguna sentencia contiene otra, cortar el flujo de tokens en cada ';'
+    y parsear el pedazo como un programa de una sentencia da el mismo AST (y
+    los mismos errores) que parsear el archivo completo, pero sin esperar al
+    final ni armar la lista entera en memoria.
+    """
+    if lexer is None:
+        from analizador_lexico import lexer
+    if parser is None:
+        parser = get_parser()
+
+    lexer.lineno = 1
+    lexer.input(code)
+    tabla = tabla_de(lexer)
+    pendientes = []
+    for tok in iter(lexer.token, None):
+        pendientes.append(tok)
+        if tok.type == "PUNTOYCOMA":
+            yield parser.parse(lexer=_TokenFeed(pendientes, lexer.lexdata, tabla)).stmts[0]
+            pendientes = []
+
+    if pendientes:
+        # Sentencia sin ';' al final: que el parser reporte el error de siempre
+        parser.parse(lexer=_TokenFeed(pendientes, lexer.lexdata, tabla))
+
+
+# Tablas LALR precalculadas (pqek_parsetab.py, se regeneran con generar_tablas.py).
+# PLY compara la firma de la gramática: si la tabla quedó vieja la recalcula en
+# memoria, pero nunca escribe archivos en el directorio de trabajo.
+PARSETAB = "pqek_parsetab"
+_DIR = os.path.dirname(os.path.abspath(__file__))
 
 
 def build_parser(debug=False):
-    return yacc.yacc(debug=debug)
+    return yacc.yacc(debug=debug, tabmodule=PARSETAB, outputdir=_DIR, write_tables=False)
+
+
+_parser_compartido = None
+
+
+def get_parser():
+    """Parser compartido, construido la primera vez que se pide."""
+    global _parser_compartido
+    if _parser_compartido is None:
+        _parser_compartido = build_parser()
+    return _parser_compartido
+
+
+def nuevo_parser():
+    """Parser propio que comparte las tablas (solo lectura) con el compartido.
+
+    LRParser guarda las pilas del análisis en la instancia, así que cada hilo
+    necesita el suyo; copiarlo es mucho más barato que volver a llamar a yacc().
+    """
+    return copy.copy(get_parser())
@@ -0,0 +1,109 @@
+# bench_archivo.py
+# Pico de RSS contra tamaño del archivo al compilar programas .pqek grandes:
+#   texto    el archivo leído entero a un str y parseado (como la GUI y el CLI
+#            con archivos chicos)
+#   archivo  CompilationSession.parse_archivo: el archivo mapeado en memoria y
+#            lexeado por trozos (ver fuente_archivo.py); el AST sí queda entero
+#   flujo    iter_statements_archivo: cada sentencia se analiza y se descarta,
+#            sin texto ni AST completos en memoria
+#
+# Cada modo y tamaño corre en un proceso aparte para que el pico de RSS de uno
+# no contamine al siguiente. Los programas son de la forma "cadenas" del
+# generador, escritos a un directorio temporal.
+#
+# Uso:
+#   python benchmarks/bench_archivo.py [--tamanos 1 4 16] [--modos texto archivo flujo]
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+MODOS = ("texto", "archivo", "flujo")
+
+
+def _rss_mb():
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def medir(modo, ruta):
+    """Compila ruta de la forma pedida y devuelve tiempo, sentencias y RSS."""
+    from analizador_semantico import SemanticAnalyzer
+    from sesion import CompilationSession
+
+    sesion = CompilationSession()
+    rss_antes = _rss_mb()
+    inicio = time.perf_counter()
+    if modo == "texto":
+        with open(ruta, encoding="utf-8") as f:
+            code = f.read()
+        sentencias = len(sesion.parse(code).stmts)
+    elif modo == "archivo":
+        sentencias = len(sesion.parse_archivo(ruta).stmts)
+    else:
+        sem = SemanticAnalyzer()
+        sentencias = 0
+        for stmt in sesion.iter_statements_archivo(ruta):
+            sem.analyze(stmt)
+            sentencias += 1
+    return {
+        "modo": modo,
+        "sentencias": sentencias,
+        "errores": len(sesion.errores_sintacticos) + len(sesion.diagnosticos_lexicos),
+        "segundos": round(time.perf_counter() - inicio, 2),
+        "rss_antes_mb": rss_antes,
+        "rss_pico_mb": _rss_mb(),
+    }
+
+
+def escribir_programa(ruta, megas):
+    """Escribe un programa "cadenas" de más o menos `megas` MB y devuelve su tamaño."""
+    from generador import generar
+
+    muestra, _ = generar("cadenas", 1000)
+    cabecera, _ = generar("cadenas", 0)
+    por_sentencia = (len(muestra) - len(cabecera)) / 1000
+    n = max(1, int((megas * 1024 * 1024 - len(cabecera)) / por_sentencia))
+    code, _ = generar("cadenas", n)
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write(code)
+    return os.path.getsize(ruta)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Pico de RSS por tamaño de archivo: texto entero vs. por trozos.")
+    ap.add_argument("--tamanos", type=float, nargs="+", default=[1, 4, 16], help="MB de cada programa")
+    ap.add_argument("--modos", nargs="+", choices=MODOS, default=list(MODOS))
+    ap.add_argument("--medir", nargs=2, metavar=("MODO", "RUTA"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.medir:
+        print(json.dumps(medir(*args.medir)))
+        return
+
+    print(f"{'archivo MB':>10} {'modo':>8} {'sentencias':>11} {'s':>7} {'RSS base MB':>12} "
+          f"{'RSS pico MB':>12} {'pico - base':>12}")
+    with tempfile.TemporaryDirectory() as directorio:
+        for megas in args.tamanos:
+            ruta = os.path.join(directorio, f"programa_{megas:g}.pqek")
+            tamano = escribir_programa(ruta, megas) / (1024 * 1024)
+            for modo in args.modos:
+                out = subprocess.run([sys.executable, os.path.abspath(__file__), "--medir", modo, ruta],
+                                     check=True, capture_output=True, text=True).stdout
+                r = json.loads(out)
+                print(f"{tamano:>10.1f} {modo:>8} {r['sentencias']:>11} {r['segundos']:>7} "
+                      f"{r['rss_antes_mb']:>12} {r['rss_pico_mb']:>12} "
+                      f"{r['rss_pico_mb'] - r['rss_antes_mb']:>12.1f}")
+            os.remove(ruta)
+
+
+if __name__ == "__main__":
+    main()
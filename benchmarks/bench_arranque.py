@@ -0,0 +1,93 @@
+# bench_arranque.py
+# Mide el tiempo de arranque en frío del CLI y de la GUI (procesos nuevos), y
+# cuánto cuesta construir léxico y parser con y sin las tablas precalculadas.
+#
+# Uso:
+#   python benchmarks/bench_arranque.py [--repeticiones 10]
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+PROGRAMA = 'x Entero;\nx = 3 + 4 * 2;\nMensaje.Texto("listo");\n'
+
+# Cada corrida del CLI usa una caché vacía propia dentro del directorio
+# temporal del benchmark: siempre compila de cero y no toca la del usuario
+CLI = ("import compilador_cli, sys, tempfile; sys.exit(compilador_cli.main("
+       "[sys.argv[1], '-j', '1', '-o', os.devnull, '--cache', tempfile.mkdtemp(dir=sys.argv[2])]))")
+
+GUI = """
+from PyQt5.QtWidgets import QApplication
+app = QApplication([])
+import interfaz_compilador
+interfaz_compilador.PQEKCompilerApp()
+interfaz_compilador.CompilerGUI()
+"""
+
+
+def _mediana_proceso(codigo, args, repeticiones, env=None):
+    tiempos = []
+    for _ in range(repeticiones):
+        t = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import os\n" + codigo] + args,
+                       cwd=tempfile.gettempdir(), env=env, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        tiempos.append(time.perf_counter() - t)
+    return statistics.median(tiempos)
+
+
+def _mediana(func, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        re.purge()  # sin la caché de expresiones regulares, como en un proceso nuevo
+        t = time.perf_counter()
+        func()
+        tiempos.append(time.perf_counter() - t)
+    return statistics.median(tiempos)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Tiempo de arranque del CLI y la GUI.")
+    ap.add_argument("--repeticiones", type=int, default=10)
+    args = ap.parse_args()
+    n = args.repeticiones
+
+    import ply.lex as lex
+    import ply.yacc as yacc
+    import analizador_lexico
+    import analizador_sintactico
+
+    nulo = yacc.NullLogger()
+    print("Construcción en proceso (mediana):")
+    print(f"  léxico desde tabla      {_mediana(lambda: lex.lex(module=analizador_lexico, optimize=True, lextab=analizador_lexico.LEXTAB), n) * 1000:8.2f} ms")
+    print(f"  léxico desde reglas     {_mediana(lambda: lex.lex(module=analizador_lexico), n) * 1000:8.2f} ms")
+    print(f"  parser desde tabla      {_mediana(lambda: yacc.yacc(module=analizador_sintactico, tabmodule=analizador_sintactico.PARSETAB, write_tables=False, errorlog=nulo), n) * 1000:8.2f} ms")
+    print(f"  parser desde gramática  {_mediana(lambda: yacc.yacc(module=analizador_sintactico, tabmodule='_sin_tabla_pqek', write_tables=False, errorlog=nulo), n) * 1000:8.2f} ms")
+
+    with tempfile.NamedTemporaryFile("w", suffix=".pqek", delete=False) as f:
+        f.write(PROGRAMA)
+    env = dict(os.environ, PYTHONPATH=RAIZ, QT_QPA_PLATFORM="offscreen")
+    try:
+        print("Arranque en frío, proceso nuevo (mediana):")
+        with tempfile.TemporaryDirectory() as caches:
+            print(f"  CLI (un archivo)        {_mediana_proceso(CLI, [f.name, caches], n, env) * 1000:8.2f} ms")
+        try:
+            import PyQt5  # noqa: F401
+        except ImportError:
+            print("  GUI                     (PyQt5 no instalado)")
+        else:
+            print(f"  GUI (ambas ventanas)    {_mediana_proceso(GUI, [], n, env) * 1000:8.2f} ms")
+    finally:
+        os.remove(f.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+# bench_despacho.py
+# Microbenchmark del despacho por nodo en SemanticAnalyzer.visit,
+# Interpreter.run e Interpreter.eval: la tabla por tipo de nodo (despacho.py)
+# contra cómo era antes, con getattr("visit_" + nombre) en cada nodo en el
+# semántico y el nombre de la clase comparado contra cada rama en el intérprete.
+#
+# Mide ns por nodo para cada tipo de nodo por separado y, de punta a punta, el
+# semántico y el intérprete de árbol sobre un programa generado.
+#
+# Uso:
+#   python benchmarks/bench_despacho.py [--nodos 200000] [--sentencias 20000] [--repeticiones 5]
+
+import argparse
+import itertools
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from analizador_semantico import SemanticAnalyzer  # noqa: E402
+from analizador_sintactico import (  # noqa: E402
+    Assign, BinaryOp, Captura, Mensaje, Number, String, VarDecl, VarRef,
+)
+from entradas import EntradaScript  # noqa: E402
+from generador import generar  # noqa: E402
+from interprete import Interpreter  # noqa: E402
+from sesion import CompilationSession  # noqa: E402
+
+
+# ANTES
+
+class SemanticoPorNombre(SemanticAnalyzer):
+    """SemanticAnalyzer.visit tal como era: arma el nombre y lo busca con getattr."""
+
+    def visit(self, node):
+        name = "visit_" + node.__class__.__name__
+        func = getattr(self, name, self.generic_visit)
+        return func(node)
+
+
+class InterpreteMudo(Interpreter):
+    def log(self, text, error=False, info=False):
+        self.output_log.append(text)
+
+
+class InterpretePorNombre(InterpreteMudo):
+    """Interpreter.run y eval tal como eran: el nombre de la clase contra cada rama."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.memoria = {}
+
+    def run(self, node):
+        cls = node.__class__.__name__
+        try:
+            if cls == "Program":
+                for s in node.stmts:
+                    self.run(s)
+                self.sink.flush()
+            elif cls == "VarDecl":
+                self.memoria[node.name] = None
+                self.log(f"Variable declarada: {node.name} ({node.tipo})")
+            elif cls == "Assign":
+                value = self.eval(node.expr)
+                self.memoria[node.name] = value
+                self.log(f"{node.name} = {self._formatear(value)}")
+            elif cls == "Mensaje":
+                self.log(f"{node.texto}")
+            else:
+                raise Exception(f"No puedo ejecutar nodo {cls}")
+        except Exception as e:
+            self._error_ejecucion(cls, node.lineno, node.col, e)
+
+    def eval(self, node):
+        cls = node.__class__.__name__
+        if cls == "BinaryOp":
+            return self.eval_BinaryOp(node)
+        elif cls == "Number":
+            return node.value
+        elif cls == "String":
+            return node.value
+        elif cls == "VarRef":
+            if node.name not in self.memoria:
+                raise Exception(f"Variable '{node.name}' no existe.")
+            if self.memoria[node.name] is None:
+                raise Exception(f"La variable '{node.name}' no tiene valor, llave.")
+            return self.memoria[node.name]
+        elif cls == "Captura":
+            self._anunciar_captura(node.tipo)
+            return self._valor_capturado(node.tipo, self._read_input_from_output())
+        else:
+            raise Exception(f"No hay eval para '{cls}'.")
+
+    def eval_VarRef(self, node):
+        # eval_BinaryOp (heredado) despacha sus hojas por la tabla: que lean memoria
+        return self.eval(node)
+
+
+class SinkNulo:
+    def write(self, texto, tipo="info"):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+#   MEDICIÓN
+
+def _mejor(funcion, repeticiones):
+    mejor = None
+    for _ in range(repeticiones):
+        t = time.perf_counter()
+        funcion()
+        t = time.perf_counter() - t
+        mejor = t if mejor is None else min(mejor, t)
+    return mejor
+
+
+def _interprete(cls):
+    # Captura lee siempre "7": se mide el despacho, no la consola
+    interp = cls(sink=SinkNulo(), limite_log=None, entrada=EntradaScript(itertools.repeat("7")))
+    interp.run(VarDecl("x", "Entero", slot=0))
+    interp.run(Assign("x", Number(3, "entero"), slot=0))
+    return interp
+
+
+def _por_nodo(nodos, repeticiones):
+    """(tipo, ns antes, ns después) de cada recorrido y tipo de nodo."""
+    filas = []
+    hojas = {
+        "Number": Number(7, "entero"),
+        "String": String("hola"),
+        "VarRef": VarRef("x", slot=0),
+        "Captura": Captura("Entero"),
+        "BinaryOp": BinaryOp("+", Number(1, "entero"), Number(2, "entero")),
+    }
+    for nombre, nodo in hojas.items():
+        lista = [nodo] * nodos
+        antes, despues = _interprete(InterpretePorNombre), _interprete(InterpreteMudo)
+        t_antes = _mejor(lambda: list(map(antes.eval, lista)), repeticiones)
+        t_despues = _mejor(lambda: list(map(despues.eval, lista)), repeticiones)
+        filas.append((f"eval  {nombre}", t_antes, t_despues))
+
+    sentencias = {
+        "VarDecl": VarDecl("x", "Entero", slot=0),
+        "Assign": Assign("x", Number(7, "entero"), slot=0),
+        "Mensaje": Mensaje("hola"),
+    }
+    for nombre, nodo in sentencias.items():
+        lista = [nodo] * nodos
+        antes, despues = _interprete(InterpretePorNombre), _interprete(InterpreteMudo)
+        t_antes = _mejor(lambda: list(map(antes.run, lista)), repeticiones)
+        t_despues = _mejor(lambda: list(map(despues.run, lista)), repeticiones)
+        filas.append((f"run   {nombre}", t_antes, t_despues))
+
+    visitables = {**hojas, "Mensaje": Mensaje("hola")}
+    for nombre, nodo in visitables.items():
+        lista = [nodo] * nodos
+        antes, despues = SemanticoPorNombre(), SemanticAnalyzer()
+        for sem in (antes, despues):
+            sem.symbols["x"] = {"tipo": "Entero", "valor": 3}
+        t_antes = _mejor(lambda: list(map(antes.visit, lista)), repeticiones)
+        t_despues = _mejor(lambda: list(map(despues.visit, lista)), repeticiones)
+        filas.append((f"visit {nombre}", t_antes, t_despues))
+    return filas
+
+
+def _programa(sentencias, repeticiones):
+    code, entradas = generar("mixto", sentencias)
+    ast = CompilationSession().parse(code)
+    filas = []
+
+    def semantico(cls):
+        return lambda: cls().visit(ast)
+
+    filas.append(("semántico", _mejor(semantico(SemanticoPorNombre), repeticiones),
+                  _mejor(semantico(SemanticAnalyzer), repeticiones)))
+
+    logs = []
+
+    def ejecucion(cls):
+        def correr():
+            interp = cls(sink=SinkNulo(), limite_log=None, entrada=EntradaScript(entradas))
+            interp.run(ast)
+            logs.append(list(interp.output_log))
+        return correr
+
+    filas.append(("intérprete", _mejor(ejecucion(InterpretePorNombre), repeticiones),
+                  _mejor(ejecucion(InterpreteMudo), repeticiones)))
+    return filas, all(log == logs[0] for log in logs)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Despacho por nombre vs. tabla por tipo de nodo.")
+    ap.add_argument("--nodos", type=int, default=200000, help="nodos por medición de un tipo")
+    ap.add_argument("--sentencias", type=int, default=20000, help="sentencias del programa generado")
+    ap.add_argument("--repeticiones", type=int, default=5)
+    args = ap.parse_args()
+
+    print(f"{'por nodo':<16} {'antes ns':>9} {'después ns':>11}")
+    for nombre, antes, despues in _por_nodo(args.nodos, args.repeticiones):
+        print(f"{nombre:<16} {antes / args.nodos * 1e9:>9.1f} {despues / args.nodos * 1e9:>11.1f}"
+              f"   ×{antes / despues:.2f}")
+
+    filas, igual = _programa(args.sentencias, args.repeticiones)
+    print(f"\nprograma mixto de {args.sentencias} sentencias")
+    for nombre, antes, despues in filas:
+        print(f"{nombre:<16} {antes * 1000:>7.1f} ms {despues * 1000:>8.1f} ms   ×{antes / despues:.2f}")
+    print(f"misma salida: {igual}")
+
+
+if __name__ == "__main__":
+    main()
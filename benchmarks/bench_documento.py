@@ -0,0 +1,122 @@
+# bench_documento.py
+# Trabajo de front end de los botones de CompilerGUI sobre el mismo texto, en
+# el orden de siempre: "Analizar Léxico", "Analizar Sintáctico", "Analizar
+# Semántico" y "Ejecutar". Antes cada botón volvía a lexear y parsear el texto
+# desde cero y "Ejecutar" repetía también el semántico; ahora los botones
+# comparten un PipelineDocumento (documento.py) y cada fase se hace una vez.
+#
+# Mide el front end de cada botón (mejor de --repeticiones); la ejecución en sí
+# es la misma en los dos casos y no se cuenta.
+#
+# Uso:
+#   python benchmarks/bench_documento.py [--sentencias 200 1000] [--forma mixto] [--repeticiones 5]
+
+import argparse
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from analizador_lexico import nuevo_lexer  # noqa: E402
+from analizador_semantico import SemanticAnalyzer  # noqa: E402
+from analizador_sintactico import nuevo_parser  # noqa: E402
+from documento import PipelineDocumento  # noqa: E402
+from generador import FORMAS, generar  # noqa: E402
+
+BOTONES = ("lexico", "sintactico", "semantico", "ejecutar")
+
+
+# ANTES
+
+class BotonesPorSeparado:
+    """Los botones tal como eran: cada uno con su propio lexeo y parseo del texto."""
+
+    def __init__(self):
+        self.lexer = nuevo_lexer()
+        self.parser = nuevo_parser()
+
+    def _parsear(self, code):
+        self.lexer.lineno = 1
+        return self.parser.parse(code, lexer=self.lexer)
+
+    def lexico(self, code):
+        self.lexer.lineno = 1
+        self.lexer.input(code)
+        self.lexer.listar_errores_lexicos.clear()
+        return list(iter(self.lexer.token, None))
+
+    def sintactico(self, code):
+        return self._parsear(code.strip())
+
+    def semantico(self, code):
+        SemanticAnalyzer().analyze(self._parsear(code.strip()))
+
+    def ejecutar(self, code):
+        ast = self._parsear(code.strip())
+        SemanticAnalyzer().analyze(ast)
+        return ast
+
+
+# DESPUÉS
+
+class BotonesConDocumento:
+    def __init__(self):
+        self.documento = PipelineDocumento()
+
+    def lexico(self, code):
+        self.documento.actualizar(code)
+        return self.documento.tokens()
+
+    def sintactico(self, code):
+        self.documento.actualizar(code)
+        return self.documento.ast()
+
+    def semantico(self, code):
+        self.documento.actualizar(code)
+        self.documento.semantico()
+
+    def ejecutar(self, code):
+        self.documento.actualizar(code)
+        self.documento.semantico()
+        return self.documento.ast()
+
+
+#   MEDICIÓN
+
+def medir(code, cls, repeticiones):
+    """Mejor tiempo de cada botón, apretando los cuatro en orden con un objeto nuevo por vuelta."""
+    mejores = dict.fromkeys(BOTONES)
+    for _ in range(repeticiones):
+        botones = cls()
+        for nombre in BOTONES:
+            t = time.perf_counter()
+            getattr(botones, nombre)(code)
+            t = time.perf_counter() - t
+            mejores[nombre] = t if mejores[nombre] is None else min(mejores[nombre], t)
+    return mejores
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Front end por botón: cada fase desde cero vs. PipelineDocumento.")
+    ap.add_argument("--sentencias", type=int, nargs="+", default=[200, 1000])
+    ap.add_argument("--forma", choices=FORMAS, default="mixto")
+    ap.add_argument("--repeticiones", type=int, default=5)
+    args = ap.parse_args()
+
+    print(f"{'sentencias':>10} {'botón':<11} {'antes ms':>9} {'después ms':>11}")
+    for n in args.sentencias:
+        code, _ = generar(args.forma, n)
+        antes = medir(code, BotonesPorSeparado, args.repeticiones)
+        despues = medir(code, BotonesConDocumento, args.repeticiones)
+        for nombre in BOTONES:
+            print(f"{n:>10} {nombre:<11} {antes[nombre] * 1000:>9.1f} {despues[nombre] * 1000:>11.2f}")
+        total_antes, total_despues = sum(antes.values()), sum(despues.values())
+        print(f"{n:>10} {'total':<11} {total_antes * 1000:>9.1f} {total_despues * 1000:>11.2f}"
+              f"   ×{total_antes / total_despues:.2f}")
+
+
+if __name__ == "__main__":
+    main()
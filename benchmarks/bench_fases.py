@@ -0,0 +1,228 @@
+# bench_fases.py
+# Tiempo, rendimiento (sentencias/s) y pico de memoria de cada fase por
+# separado: léxico, sintáctico, semántico y ejecución, sobre programas
+# generados (ver generador.py) de 1k a 1M sentencias. Compara con una línea
+# base guardada y marca las fases que empeoraron más de la tolerancia.
+#
+# El sintáctico se mide como lo usan la GUI y el CLI (parsear, con
+# recuperación de errores); PLY pide los tokens a medida que parsea, así que
+# su tiempo incluye volver a lexear. La memoria se mide en una pasada aparte
+# con tracemalloc (que vuelve todo más lento) y cada tamaño corre en un
+# proceso propio.
+#
+# Uso:
+#   python benchmarks/bench_fases.py [--tamanos 1000 10000 100000] [--formas mixto cadenas]
+#                                    [--repeticiones 3] [--base benchmarks/base_fases.json]
+#                                    [--guardar-base] [--tolerancia 0.2]
+#
+# Sale con código 1 si alguna fase empeoró respecto de la base.
+#
+# La línea base depende de la máquina y no va en el repositorio (está en
+# .gitignore): se crea una vez con --guardar-base. Sin ella, o si le falta
+# alguna forma o tamaño, esas filas salen marcadas "sin base" y al final se
+# avisa cuántas no se compararon.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+FASES = ("lexico", "sintactico", "semantico", "ejecucion")
+BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "base_fases.json")
+
+# Por debajo de esto las diferencias son ruido y no cuentan como regresión
+MINIMO_SEGUNDOS = 0.05
+MINIMO_MB = 1.0
+
+
+class SinkNulo:
+    """Descarta la salida: se mide el intérprete, no la consola."""
+
+    def write(self, texto, tipo="info"):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+#   FASES
+
+def _fases(code, entradas):
+    """Generador: corre las fases en orden y entrega el nombre de cada una
+    antes de empezarla (para medirla desde afuera)."""
+    from analizador_lexico import nuevo_lexer
+    from analizador_sintactico import nuevo_parser, parsear
+    from analizador_semantico import SemanticAnalyzer
+    from interprete import Interpreter
+
+    lexer, parser = nuevo_lexer(), nuevo_parser()
+
+    yield "lexico"
+    lexer.input(code)
+    for _ in iter(lexer.token, None):
+        pass
+
+    yield "sintactico"
+    lexer.lineno = 1
+    ast, errores = parsear(code, lexer, parser)
+    if errores:
+        raise Exception(f"el programa generado no parsea: {errores[0].mensaje}")
+
+    yield "semantico"
+    SemanticAnalyzer().analyze(ast)
+
+    yield "ejecucion"
+    interp = Interpreter(sink=SinkNulo())
+    pasos = interp.ejecutar(ast)
+    pendientes = iter(entradas)
+    try:
+        next(pasos)
+        while True:
+            pasos.send(next(pendientes))
+    except StopIteration:
+        pass
+
+
+def _tiempos(code, entradas):
+    tiempos = {}
+    fase = None
+    for siguiente in _fases(code, entradas):
+        if fase is not None:
+            tiempos[fase] = time.perf_counter() - t
+        fase, t = siguiente, time.perf_counter()
+    tiempos[fase] = time.perf_counter() - t
+    return tiempos
+
+
+def _picos(code, entradas):
+    picos = {}
+    tracemalloc.start()
+    try:
+        fase = None
+        for siguiente in _fases(code, entradas):
+            actual, pico = tracemalloc.get_traced_memory()
+            if fase is not None:
+                picos[fase] = pico - base
+            fase, base = siguiente, actual
+            tracemalloc.reset_peak()
+        picos[fase] = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    return picos
+
+
+def medir(forma, n_sentencias, repeticiones):
+    """Números de cada fase para un programa de esa forma y tamaño."""
+    from generador import generar
+
+    code, entradas = generar(forma, n_sentencias)
+    mejores = {}
+    for _ in range(repeticiones):
+        for fase, t in _tiempos(code, entradas).items():
+            mejores[fase] = min(t, mejores.get(fase, t))
+    picos = _picos(code, entradas)
+    return {
+        fase: {
+            "segundos": round(mejores[fase], 4),
+            "sentencias_s": round(n_sentencias / mejores[fase]) if mejores[fase] else None,
+            "pico_mb": round(picos[fase] / (1024 * 1024), 2),
+        }
+        for fase in FASES
+    }
+
+
+#   LÍNEA BASE
+
+def _comparar(actual, base, tolerancia):
+    """Texto para la columna "vs base" y si hubo regresión."""
+    if base is None:
+        return "sin base", False
+    t = actual["segundos"] / base["segundos"] if base["segundos"] else 1.0
+    m = actual["pico_mb"] / base["pico_mb"] if base["pico_mb"] else 1.0
+    regresion = (t > 1 + tolerancia and actual["segundos"] - base["segundos"] > MINIMO_SEGUNDOS) or \
+                (m > 1 + tolerancia and actual["pico_mb"] - base["pico_mb"] > MINIMO_MB)
+    return f"tiempo ×{t:.2f}  memoria ×{m:.2f}" + ("  ← REGRESIÓN" if regresion else ""), regresion
+
+
+def main():
+    from generador import FORMAS
+
+    ap = argparse.ArgumentParser(description="Tiempo y memoria de cada fase del compilador.")
+    ap.add_argument("--tamanos", type=int, nargs="+", default=[1000, 10000, 100000],
+                    help="sentencias por programa (hasta 1000000)")
+    ap.add_argument("--formas", nargs="+", choices=FORMAS, default=["mixto"])
+    ap.add_argument("--repeticiones", type=int, default=3, help="se toma el mejor tiempo")
+    ap.add_argument("--base", default=BASE, help="archivo JSON con la línea base")
+    ap.add_argument("--guardar-base", action="store_true",
+                    help="guarda estos resultados como línea base en vez de comparar")
+    ap.add_argument("--tolerancia", type=float, default=0.2,
+                    help="cuánto puede empeorar una fase (0.2 = 20%%) antes de marcarla")
+    ap.add_argument("--medir", nargs=2, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.medir:
+        forma, n = args.medir
+        print(json.dumps(medir(forma, int(n), args.repeticiones)))
+        return 0
+
+    base = {}
+    if not args.guardar_base:
+        try:
+            with open(args.base, encoding="utf-8") as f:
+                base = json.load(f)
+        except FileNotFoundError:
+            print(f"AVISO: no hay línea base en {args.base}; no se compara nada. "
+                  f"Créala con --guardar-base.", file=sys.stderr)
+
+    resultados = {}
+    regresiones = 0
+    sin_base = 0
+    print(f"{'forma':<14} {'sentencias':>10} {'fase':<11} {'segundos':>9} {'sent/s':>11} {'pico MB':>9}")
+    for forma in args.formas:
+        for n in args.tamanos:
+            out = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--medir", forma, str(n),
+                 "--repeticiones", str(args.repeticiones)],
+                check=True, capture_output=True, text=True).stdout
+            clave = f"{forma}/{n}"
+            resultados[clave] = json.loads(out)
+            for fase in FASES:
+                r = resultados[clave][fase]
+                nota, regresion = _comparar(r, base.get(clave, {}).get(fase), args.tolerancia)
+                regresiones += regresion
+                sin_base += not args.guardar_base and clave not in base
+                print(f"{forma:<14} {n:>10} {fase:<11} {r['segundos']:>9.3f} "
+                      f"{r['sentencias_s'] or 0:>11} {r['pico_mb']:>9.2f}   {nota}")
+
+    if args.guardar_base:
+        try:
+            with open(args.base, encoding="utf-8") as f:
+                guardada = json.load(f)
+        except FileNotFoundError:
+            guardada = {}
+        guardada.update(resultados)
+        with open(args.base, "w", encoding="utf-8") as f:
+            json.dump(guardada, f, indent=2, sort_keys=True)
+        print(f"línea base guardada en {args.base}")
+        return 0
+    if sin_base:
+        print(f"AVISO: {sin_base} fases sin línea base en {args.base} no se compararon "
+              f"(agrégalas con --guardar-base y los mismos --tamanos y --formas)", file=sys.stderr)
+    if regresiones:
+        print(f"{regresiones} fases empeoraron más de {args.tolerancia:.0%} respecto de la base")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
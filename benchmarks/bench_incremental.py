@@ -0,0 +1,67 @@
+# bench_incremental.py
+# Tiempo por tecla del front end incremental sobre un programa grande, comparado
+# con relexear y reparsear el documento entero.
+#
+# Uso:
+#   python benchmarks/bench_incremental.py [--lineas 50000] [--teclas 200]
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generador import generar_programa  # noqa: E402
+from incremental import FrontEndIncremental  # noqa: E402
+from sesion import CompilationSession  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Costo por tecla del front end incremental.")
+    ap.add_argument("--lineas", type=int, default=50000)
+    ap.add_argument("--teclas", type=int, default=200)
+    args = ap.parse_args()
+
+    text = generar_programa(args.lineas)
+    rnd = random.Random(0)
+
+    t = time.perf_counter()
+    fe = FrontEndIncremental(text)
+    carga = time.perf_counter() - t
+
+    t = time.perf_counter()
+    CompilationSession().parse(text)
+    completo = time.perf_counter() - t
+
+    tiempos = []
+    for _ in range(args.teclas):
+        # Escribir o borrar un caracter en una línea cualquiera
+        pos = rnd.randrange(len(fe.text))
+        t = time.perf_counter()
+        if rnd.random() < 0.5:
+            fe.update(pos, 0, rnd.choice("x1+ "))
+        else:
+            fe.update(pos, 1, "")
+        tiempos.append(time.perf_counter() - t)
+
+    t = time.perf_counter()
+    fe.program()
+    fe.analyze()
+    compilar = time.perf_counter() - t
+
+    tiempos.sort()
+    print(f"líneas: {len(fe.text.splitlines())}   sentencias: {len(fe.segmentos)}")
+    print(f"  carga inicial               {carga * 1000:9.2f} ms")
+    print(f"  reparseo completo           {completo * 1000:9.2f} ms")
+    print(f"  por tecla (mediana)         {statistics.median(tiempos) * 1000:9.3f} ms")
+    print(f"  por tecla (p99)             {tiempos[int(len(tiempos) * 0.99) - 1] * 1000:9.3f} ms")
+    print(f"  AST + semántico tras editar {compilar * 1000:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# bench_memoria.py
+# Memoria del AST: bytes por nodo y pico de RSS al parsear programas generados
+# de tamaño creciente. Cada tamaño corre en un proceso aparte para que el pico
+# de RSS de uno no contamine al siguiente.
+#
+# Uso:
+#   python benchmarks/bench_memoria.py [--tamanos 1000 10000 100000]
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def medir(n_sentencias):
+    """Parsea un programa de n_sentencias y devuelve sus números de memoria."""
+    from generador import generar_programa
+    from sesion import CompilationSession
+    from optimizador import contar_nodos
+
+    code = generar_programa(n_sentencias)
+    sesion = CompilationSession()
+    rss_antes = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    ast = sesion.parse(code)
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    nodos = contar_nodos(ast)
+    return {
+        "sentencias": n_sentencias,
+        "nodos": nodos,
+        "bytes_por_nodo": round((despues - antes) / nodos, 1),
+        "tamano_instancia": sys.getsizeof(ast.stmts[-1]),
+        "rss_pico_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "rss_antes_mb": round(rss_antes / 1024, 1),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Memoria del AST por tamaño de programa.")
+    ap.add_argument("--tamanos", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--medir", type=int, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.medir:
+        print(json.dumps(medir(args.medir)))
+        return
+
+    print(f"{'sentencias':>10} {'nodos':>10} {'bytes/nodo':>11} {'sizeof':>7} {'RSS pico MB':>12}")
+    for n in args.tamanos:
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--medir", str(n)],
+                             check=True, capture_output=True, text=True).stdout
+        r = json.loads(out)
+        print(f"{r['sentencias']:>10} {r['nodos']:>10} {r['bytes_por_nodo']:>11} "
+              f"{r['tamano_instancia']:>7} {r['rss_pico_mb']:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# bench_reales.py
+# Microbenchmark de cadenas aritméticas largas con reales. Compara la
+# representación nativa (float desde el parser) con la anterior, en la que
+# los reales viajaban como texto "12,5": cada operando pasaba por _as_number
+# y cada resultado volvía a texto con _to_comma.
+#
+# Uso:
+#   python benchmarks/bench_reales.py [--largo 200] [--sentencias 500] [--repeticiones 5]
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.setrecursionlimit(100000)
+
+from analizador_sintactico import Program, Assign, BinaryOp, Number
+from compilador_bytecode import VM
+from interprete import Interpreter
+from sesion import CompilationSession
+
+N_VARIABLES = 10
+
+
+def generar(largo, sentencias, semilla=0):
+    """Sentencias 'rK = t1 + t2 - ...' con largo términos acotados (no se disparan)."""
+    rnd = random.Random(semilla)
+    lineas = [f"r{i} Real;" for i in range(N_VARIABLES)]
+    lineas += [f"r{i} = {i},5;" for i in range(N_VARIABLES)]
+    for _ in range(sentencias):
+        terminos = []
+        for _ in range(largo):
+            if rnd.random() < 0.5:
+                terminos.append(f"r{rnd.randrange(N_VARIABLES)} * 0,00{rnd.randint(1, 9)}")
+            else:
+                terminos.append(f"{rnd.randint(0, 9)},{rnd.randint(1, 99)} / {rnd.randint(1, 9)},5")
+        ops = [rnd.choice("+-") for _ in terminos[1:]]
+        expr = terminos[0] + "".join(f" {op} {t}" for op, t in zip(ops, terminos[1:]))
+        lineas.append(f"r{rnd.randrange(N_VARIABLES)} = {expr};")
+    return "\n".join(lineas) + "\n"
+
+
+#   REPRESENTACIÓN ANTERIOR (reales como texto)
+
+def a_texto(node):
+    """Copia del AST con los literales reales como texto con coma, como antes."""
+    cls = node.__class__.__name__
+    if cls == "Program":
+        return Program([a_texto(s) for s in node.stmts])
+    if cls == "Assign":
+        return Assign(node.name, a_texto(node.expr))
+    if cls == "BinaryOp":
+        return BinaryOp(node.op, a_texto(node.left), a_texto(node.right))
+    if cls == "Number" and node.kind == "Real":
+        return Number(Interpreter._to_comma(node.value), "Real")
+    return node
+
+
+class InterpreteTexto(Interpreter):
+    """Interpreter.eval tal como era con los reales en texto."""
+
+    @staticmethod
+    def _as_number(value):
+        """Interpreter._as_number tal como era con los reales en texto."""
+        if isinstance(value, str):
+            if "," in value:
+                return float(value.replace(",", "."))
+            if value.isdigit():
+                return int(value)
+        return value
+
+    def eval_BinaryOp(self, node):
+        left_val = self._as_number(self.eval(node.left))
+        right_val = self._as_number(self.eval(node.right))
+        if node.op == "+":
+            result = left_val + right_val
+        elif node.op == "-":
+            result = left_val - right_val
+        elif node.op == "*":
+            result = left_val * right_val
+        else:
+            result = left_val / right_val
+        if isinstance(result, float):
+            return self._to_comma(result)
+        return result
+
+    def log(self, text, error=False, info=False):
+        self.output_log.append(text)
+
+
+class InterpreteMudo(Interpreter):
+    def log(self, text, error=False, info=False):
+        self.output_log.append(text)
+
+
+class VMMuda(VM):
+    def log(self, text, error=False, info=False):
+        self.output_log.append(text)
+
+
+def _mediana(cls, ast, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        interp = cls()
+        t = time.perf_counter()
+        interp.run(ast)
+        tiempos.append(time.perf_counter() - t)
+    return statistics.median(tiempos), interp.output_log
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Reales nativos vs. reales como texto.")
+    ap.add_argument("--largo", type=int, default=200, help="términos por expresión")
+    ap.add_argument("--sentencias", type=int, default=500)
+    ap.add_argument("--repeticiones", type=int, default=5)
+    args = ap.parse_args()
+
+    ast = CompilationSession().parse(generar(args.largo, args.sentencias))
+    ast_texto = a_texto(ast)
+    ops = args.sentencias * (2 * args.largo - 1)
+
+    t_texto, log_texto = _mediana(InterpreteTexto, ast_texto, args.repeticiones)
+    t_nativo, log_nativo = _mediana(InterpreteMudo, ast, args.repeticiones)
+    t_vm, log_vm = _mediana(VMMuda, ast, args.repeticiones)
+
+    print(f"{args.sentencias} sentencias × {args.largo} términos ({ops} operaciones)")
+    print(f"  reales como texto (antes)              {t_texto * 1000:9.1f} ms   {t_texto / ops * 1e9:7.1f} ns/op")
+    print(f"  reales nativos                         {t_nativo * 1000:9.1f} ms   {t_nativo / ops * 1e9:7.1f} ns/op"
+          f"   ×{t_texto / t_nativo:.2f}")
+    print(f"  reales nativos (VM, compila + ejecuta) {t_vm * 1000:9.1f} ms   {t_vm / ops * 1e9:7.1f} ns/op"
+          f"   ×{t_texto / t_vm:.2f}")
+    igual = log_texto == log_nativo == log_vm
+    print(f"  misma salida: {igual}")
+    if not igual:
+        # Los tiempos solo se comparan si las tres corridas hicieron lo mismo
+        print("  las salidas no coinciden: los tiempos no son comparables")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+# bench_resaltado.py
+# Carga un archivo .pqek de 100k líneas y mide el resaltado de sintaxis:
+# una pasada completa sobre el documento (rehighlight) y el costo de marcar y
+# limpiar errores. Compara el resaltador actual con el anterior
+# (un QRegExp nuevo por regla y por bloque, y rehighlight() de todo el
+# documento en cada add_error / clear_errors).
+#
+# Uso:
+#   QT_QPA_PLATFORM=offscreen python benchmarks/bench_resaltado.py [--lineas 100000] [--errores 20]
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+from PyQt5.QtGui import QColor, QFont, QTextCharFormat, QTextDocument, QSyntaxHighlighter  # noqa: E402
+from PyQt5.QtCore import QRegExp  # noqa: E402
+
+from generador import generar_programa  # noqa: E402
+
+
+class ResaltadorAnterior(QSyntaxHighlighter):
+    """PQEKHighlighter tal como era antes, para comparar."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rules = []
+        self.error_ranges = []
+        keywords = [
+            "Entero", "Texto", "Real", "Captura", "Mensaje",
+            "Si", "Sino", "Mientras", "Fin", "Entonces",
+            "Inicio", "Programa", "Verdadero", "Falso",
+        ]
+        keyword_format = QTextCharFormat()
+        keyword_format.setForeground(QColor("#50fa7b"))
+        keyword_format.setFontWeight(QFont.Bold)
+        otro = QTextCharFormat()
+        otro.setForeground(QColor("#f1fa8c"))
+        for word in keywords:
+            self.rules.append((QRegExp(r"\b" + word + r"\b"), keyword_format))
+        self.rules.append((QRegExp(r"\".*\""), otro))
+        self.rules.append((QRegExp(r"\b\d+(\.\d+)?\b"), otro))
+        self.rules.append((QRegExp(r"//[^\n]*"), otro))
+        self.rules.append((QRegExp(r"\b[A-Za-z_]+\.[A-Za-z_]+\b"), otro))
+
+    def highlightBlock(self, text):
+        for pattern, fmt in self.rules:
+            expression = QRegExp(pattern)
+            index = expression.indexIn(text)
+            while index >= 0:
+                length = expression.matchedLength()
+                self.setFormat(index, length, fmt)
+                index = expression.indexIn(text, index + length)
+        for (line, start, end) in self.error_ranges:
+            if self.currentBlock().blockNumber() == line:
+                error_format = QTextCharFormat()
+                error_format.setUnderlineColor(QColor("#ff5555"))
+                error_format.setUnderlineStyle(QTextCharFormat.SpellCheckUnderline)
+                self.setFormat(start, end - start, error_format)
+
+    def clear_errors(self):
+        self.error_ranges.clear()
+        self.rehighlight()
+
+    def add_error(self, line, start=0, end=None):
+        if end is None:
+            end = start + 3
+        self.error_ranges.append((line, start, end))
+        self.rehighlight()
+
+
+def _medir(func):
+    t = time.perf_counter()
+    func()
+    return time.perf_counter() - t
+
+
+def medir(nombre, cls, texto, n_errores):
+    doc = QTextDocument()
+    doc.setPlainText(texto)
+    resaltador = cls(doc)
+    pasada = _medir(resaltador.rehighlight)
+
+    lineas = doc.blockCount()
+    paso = max(1, lineas // max(1, n_errores))
+    marcar = _medir(lambda: [resaltador.add_error(i * paso, 0, 5) for i in range(n_errores)])
+    limpiar = _medir(resaltador.clear_errors)
+
+    print(f"  {nombre:<10} pasada completa {pasada:7.2f} s   "
+          f"add_error {marcar / n_errores * 1000:9.2f} ms c/u   clear_errors {limpiar * 1000:9.2f} ms")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Tiempo del resaltado de sintaxis.")
+    ap.add_argument("--lineas", type=int, default=100000)
+    ap.add_argument("--errores", type=int, default=20)
+    args = ap.parse_args()
+
+    app = QApplication(sys.argv)  # noqa: F841
+    from interfaz_compilador import PQEKSyntaxHighlighter
+
+    with tempfile.NamedTemporaryFile("w", suffix=".pqek", delete=False, encoding="utf-8") as f:
+        f.write(generar_programa(args.lineas))
+    try:
+        with open(f.name, encoding="utf-8") as g:
+            texto = g.read()
+    finally:
+        os.remove(f.name)
+
+    print(f"{texto.count(chr(10))} líneas, {args.errores} errores marcados")
+    medir("actual", PQEKSyntaxHighlighter, texto, args.errores)
+    # El anterior repinta todo el documento por cada error: con pocos alcanza
+    medir("anterior", ResaltadorAnterior, texto, min(args.errores, 2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+# bench_slots.py
+# Variables por slot contra variables por nombre, en programas con muchas
+# variables. Antes la memoria del intérprete y de la VM era un dict nombre →
+# valor y cada VarRef, Assign, LOAD_VAR y STORE buscaba el nombre; ahora el
+# semántico le da a cada variable un slot y la memoria es una lista.
+#
+# Mide el tiempo de ejecución del intérprete de árbol y de la VM (mejor de
+# --repeticiones) y los bytes de la memoria de variables (sin contar los
+# valores, que son los mismos en los dos casos).
+#
+# Uso:
+#   python benchmarks/bench_slots.py [--variables 1000 10000 50000] [--rondas 3] [--repeticiones 3]
+
+import argparse
+import random
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from analizador_semantico import SemanticAnalyzer  # noqa: E402
+from compilador_bytecode import (  # noqa: E402
+    BINARY, BINARY_CONST, BINARY_VAR, CAPTURA, DECLARE, LOAD_CONST, LOAD_VAR,
+    LOG, STORE, VM, Bytecode, compile_program,
+)
+from interprete import Interpreter  # noqa: E402
+from sesion import CompilationSession  # noqa: E402
+
+
+# ANTES
+
+class InterpretePorNombre(Interpreter):
+    """Interpreter con la memoria en un dict por nombre, como era antes de los slots."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.memoria = {}
+
+    def run_VarDecl(self, node):
+        self.memoria[node.name] = None
+        self.log(f"Variable declarada: {node.name} ({node.tipo})")
+
+    def run_Assign(self, node):
+        expr = node.expr
+        value = self._evaluaciones[expr.__class__](self, expr)
+        self.memoria[node.name] = value
+        self.log(f"{node.name} = {self._formatear(value)}")
+
+    def eval_VarRef(self, node):
+        if node.name not in self.memoria:
+            raise Exception(f"Variable '{node.name}' no existe.")
+        if self.memoria[node.name] is None:
+            raise Exception(f"La variable '{node.name}' no tiene valor, llave.")
+        return self.memoria[node.name]
+
+
+def por_nombre(bytecode):
+    """El mismo Bytecode con nombres en vez de slots, como lo emitía el compilador antes."""
+    nombres = bytecode.nombres
+    code = []
+    for op, arg in bytecode.code:
+        if op in (LOAD_VAR, STORE):
+            arg = nombres[arg]
+        elif op == BINARY_VAR:
+            arg = (arg[0], nombres[arg[1]])
+        elif op == DECLARE:
+            arg = (nombres[arg[0]], arg[1])
+        code.append((op, arg))
+    return Bytecode(code, bytecode.stmt_starts, bytecode.stmt_kinds, bytecode.stmt_pos, nombres)
+
+
+class VMPorNombre(VM):
+    """VM._loop tal como era: memory.get(nombre) en cada LOAD_VAR y BINARY_VAR."""
+
+    def preparar(self, bytecode):
+        self.memoria = {}
+
+    def _loop(self, code, pc):
+        memory = self.memoria
+        log = self.log
+        to_comma = self._to_comma
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        n = len(code)
+
+        try:
+            while pc < n:
+                op, arg = code[pc]
+                pc += 1
+
+                if op == BINARY_CONST:
+                    fn, right = arg
+                    stack[-1] = fn(stack[-1], right)
+
+                elif op == BINARY_VAR:
+                    fn, name = arg
+                    right = memory.get(name, memory)
+                    if right is None:
+                        raise Exception(f"La variable '{name}' no tiene valor, llave.")
+                    if right is memory:
+                        raise Exception(f"Variable '{name}' no existe.")
+                    stack[-1] = fn(stack[-1], right)
+
+                elif op == LOAD_VAR:
+                    value = memory.get(arg, memory)
+                    if value is None:
+                        raise Exception(f"La variable '{arg}' no tiene valor, llave.")
+                    if value is memory:
+                        raise Exception(f"Variable '{arg}' no existe.")
+                    push(value)
+
+                elif op == LOAD_CONST:
+                    push(arg)
+
+                elif op == BINARY:
+                    right = pop()
+                    stack[-1] = arg(stack[-1], right)
+
+                elif op == STORE:
+                    value = pop()
+                    memory[arg] = value
+                    if value.__class__ is float:
+                        value = to_comma(value)
+                    log(f"{arg} = {value}")
+
+                elif op == DECLARE:
+                    memory[arg[0]] = None
+                    log(f"Variable declarada: {arg[0]} ({arg[1]})")
+
+                elif op == LOG:
+                    log(arg)
+
+                elif op == CAPTURA:
+                    self._anunciar_captura(arg)
+                    push(self._valor_capturado(arg, self._read_input_from_output()))
+        except Exception as e:
+            return pc - 1, e
+        return None
+
+
+class SinkNulo:
+    def write(self, texto, tipo="info"):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+#   PROGRAMA
+
+def generar_variables(n_variables, rondas, semilla=0):
+    """n_variables declaradas y asignadas, más `rondas` pasadas de asignaciones
+    que leen tres variables al azar cada una."""
+    rnd = random.Random(semilla)
+    lineas = [f"var{i} Entero;" for i in range(n_variables)]
+    lineas += [f"var{i} = {i % 97};" for i in range(n_variables)]
+    for _ in range(rondas):
+        for i in range(n_variables):
+            a, b, c = (rnd.randrange(n_variables) for _ in range(3))
+            lineas.append(f"var{i} = var{a} + var{b} - var{c} * 2 + {i % 7};")
+    return "\n".join(lineas) + "\n"
+
+
+#   MEDICIÓN
+
+def _mejor(funcion, repeticiones):
+    mejor = None
+    for _ in range(repeticiones):
+        t = time.perf_counter()
+        funcion()
+        t = time.perf_counter() - t
+        mejor = t if mejor is None else min(mejor, t)
+    return mejor
+
+
+def medir(n_variables, rondas, repeticiones):
+    code = generar_variables(n_variables, rondas)
+    ast = CompilationSession().parse(code)
+    SemanticAnalyzer().analyze(ast)
+    bytecode = compile_program(ast)
+    viejo = por_nombre(bytecode)
+
+    interpretes = {}
+
+    def correr(cls, programa, ejecutar):
+        def f():
+            interp = cls(sink=SinkNulo(), limite_log=1)
+            ejecutar(interp, programa)
+            interpretes[cls] = interp
+        return f
+
+    filas = []
+    for nombre, antes, despues, ejecutar in (
+        ("árbol", (InterpretePorNombre, ast), (Interpreter, ast), lambda i, p: i.run(p)),
+        ("VM", (VMPorNombre, viejo), (VM, bytecode), lambda i, p: i.execute(p)),
+    ):
+        t_antes = _mejor(correr(*antes, ejecutar), repeticiones)
+        t_despues = _mejor(correr(*despues, ejecutar), repeticiones)
+        memoria_antes = interpretes[antes[0]].memoria
+        valores = interpretes[despues[0]].valores
+        igual = memoria_antes == interpretes[despues[0]].memory
+        filas.append((nombre, t_antes, t_despues, sys.getsizeof(memoria_antes), sys.getsizeof(valores), igual))
+    return len(ast.stmts), filas
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Memoria de variables por slot vs. por nombre.")
+    ap.add_argument("--variables", type=int, nargs="+", default=[1000, 10000, 50000])
+    ap.add_argument("--rondas", type=int, default=3, help="pasadas de asignaciones sobre todas las variables")
+    ap.add_argument("--repeticiones", type=int, default=3)
+    args = ap.parse_args()
+
+    print(f"{'variables':>9} {'ejecución':<9} {'antes ms':>9} {'después ms':>11} {'×':>5} "
+          f"{'memoria antes KB':>17} {'después KB':>11}  misma memoria")
+    for n in args.variables:
+        sentencias, filas = medir(n, args.rondas, args.repeticiones)
+        for nombre, antes, despues, m_antes, m_despues, igual in filas:
+            print(f"{n:>9} {nombre:<9} {antes * 1000:>9.1f} {despues * 1000:>11.1f} {antes / despues:>5.2f} "
+                  f"{m_antes / 1024:>17.1f} {m_despues / 1024:>11.1f}  {igual}")
+
+
+if __name__ == "__main__":
+    main()
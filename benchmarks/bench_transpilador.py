@@ -0,0 +1,100 @@
+# bench_transpilador.py
+# Ejecución de programas aritméticos con el intérprete de árbol, la VM y el
+# programa traducido a Python (transpilador.py). Del traducido se mide aparte
+# la traducción + compile() (se paga una vez y queda en caché) y la corrida.
+#
+# Uso:
+#   python benchmarks/bench_transpilador.py [--sentencias 5000] [--largo 20] [--formas cadenas reales]
+
+import argparse
+import os
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from compilador_bytecode import VM, compile_program  # noqa: E402
+from generador import generar  # noqa: E402
+from interprete import Interpreter  # noqa: E402
+from sesion import CompilationSession  # noqa: E402
+from transpilador import TranspiledInterpreter, transpilar  # noqa: E402
+
+
+class SinkNulo:
+    def write(self, texto, tipo="info"):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _mejor(correr, repeticiones):
+    """Mejor tiempo de correr(interp) con un intérprete nuevo cada vez, y su salida."""
+    mejor = None
+    for _ in range(repeticiones):
+        t = time.perf_counter()
+        interp = correr()
+        t = time.perf_counter() - t
+        mejor = t if mejor is None else min(mejor, t)
+    return mejor, list(interp.output_log)
+
+
+def medir(forma, sentencias, largo, repeticiones):
+    code, _ = generar(forma, sentencias, largo=largo)
+    ast = CompilationSession().parse(code)
+
+    def nuevo(cls):
+        return cls(sink=SinkNulo(), limite_log=None)
+
+    def arbol():
+        interp = nuevo(Interpreter)
+        interp.run(ast)
+        return interp
+
+    bytecode = compile_program(ast)
+
+    def vm():
+        interp = nuevo(VM)
+        interp.execute(bytecode)
+        return interp
+
+    t = time.perf_counter()
+    traducido = transpilar(ast)
+    t_traducir = time.perf_counter() - t
+
+    def python():
+        interp = nuevo(TranspiledInterpreter)
+        interp.execute_python(traducido)
+        return interp
+
+    t_arbol, log_arbol = _mejor(arbol, repeticiones)
+    t_vm, log_vm = _mejor(vm, repeticiones)
+    t_py, log_py = _mejor(python, repeticiones)
+
+    print(f"{forma}: {sentencias} sentencias × {largo} términos")
+    print(f"  intérprete de árbol        {t_arbol * 1000:9.1f} ms")
+    print(f"  VM (bytecode ya compilado) {t_vm * 1000:9.1f} ms   ×{t_arbol / t_vm:.1f}")
+    print(f"  Python (ya compilado)      {t_py * 1000:9.1f} ms   ×{t_arbol / t_py:.1f}")
+    print(f"  traducir + compile()       {t_traducir * 1000:9.1f} ms   (una vez por programa)")
+    print(f"  misma salida: {log_arbol == log_vm == log_py}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Intérprete de árbol vs. VM vs. programa traducido a Python.")
+    ap.add_argument("--sentencias", type=int, default=5000)
+    ap.add_argument("--largo", type=int, default=20, help="términos por expresión")
+    ap.add_argument("--formas", nargs="+", default=["cadenas", "reales"])
+    ap.add_argument("--repeticiones", type=int, default=5)
+    args = ap.parse_args()
+
+    for forma in args.formas:
+        medir(forma, args.sentencias, args.largo, args.repeticiones)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# generador.py
+# Genera programas .pqek válidos y sintéticos para los benchmarks.
+#
+# generar(forma, n) arma un programa de n sentencias con una forma dada:
+#   declaraciones  solo declaraciones de Entero, Real y Texto
+#   cadenas        asignaciones con cadenas largas de + y -
+#   parentesis     expresiones con paréntesis anidados muy hondo
+#   reales         aritmética de reales (productos y divisiones acotados)
+#   captura        Captura.Entero / Captura.Real con sus entradas ya escritas
+#   mixto          un poco de todo
+# Los valores quedan acotados: los operandos salen de constantes que nunca se
+# reasignan, así que ningún entero crece sin freno por más sentencias que haya.
+
+import random
+
+FORMAS = ("mixto", "declaraciones", "cadenas", "parentesis", "reales", "captura")
+
+N_VARIABLES = 10
+
+
+def generar_programa(n_sentencias, n_variables=50, largo_expr=6, semilla=0):
+    """Programa con n_variables declaraciones y n_sentencias asignaciones aritméticas."""
+    rnd = random.Random(semilla)
+    nombres = [f"v{i}" for i in range(n_variables)]
+    lineas = [f"{v} Entero;" for v in nombres]
+    lineas += [f"{v} = {i};" for i, v in enumerate(nombres)]
+
+    for i in range(n_sentencias):
+        operandos = []
+        for _ in range(largo_expr):
+            if rnd.random() < 0.5:
+                operandos.append(rnd.choice(nombres))
+            else:
+                operandos.append(str(rnd.randint(1, 99)))
+        ops = [rnd.choice("+-*") for _ in range(largo_expr - 1)]
+        expr = operandos[0]
+        for op, operando in zip(ops, operandos[1:]):
+            expr += f" {op} {operando}"
+        if i % 20 == 0:
+            lineas.append('Mensaje.Texto("vamos bien");')
+        else:
+            lineas.append(f"{rnd.choice(nombres)} = ({expr}) - {rnd.choice(nombres)} * 0;")
+    return "\n".join(lineas) + "\n"
+
+
+#   FORMAS
+
+def _termino_entero(rnd):
+    r = rnd.random()
+    if r < 0.4:
+        return f"c{rnd.randrange(N_VARIABLES)}"
+    if r < 0.8:
+        return str(rnd.randint(1, 99))
+    return f"c{rnd.randrange(N_VARIABLES)} * {rnd.randint(2, 9)}"
+
+
+def _termino_real(rnd):
+    if rnd.random() < 0.5:
+        return f"f{rnd.randrange(N_VARIABLES)} * 0,00{rnd.randint(1, 9)}"
+    return f"{rnd.randint(0, 9)},{rnd.randint(1, 99)} / {rnd.randint(1, 9)},5"
+
+
+def _cadena(rnd, termino, largo):
+    expr = termino(rnd)
+    for _ in range(largo - 1):
+        expr += f" {rnd.choice('+-')} {termino(rnd)}"
+    return expr
+
+
+def _anidada(rnd, profundidad):
+    """((((c1 + 3) - c4) + 7) ...) con `profundidad` paréntesis abiertos a la vez."""
+    expr = "(" * profundidad + _termino_entero(rnd)
+    for _ in range(profundidad):
+        expr += f" {rnd.choice('+-')} {_termino_entero(rnd)})"
+    return expr
+
+
+def _sentencia(forma, i, rnd, largo, profundidad, entradas):
+    v = rnd.randrange(N_VARIABLES)
+    if forma == "declaraciones":
+        return f"d{i} {('Entero', 'Real', 'Texto')[i % 3]};"
+    if forma == "cadenas":
+        return f"r{v} = {_cadena(rnd, _termino_entero, largo)};"
+    if forma == "parentesis":
+        return f"r{v} = {_anidada(rnd, profundidad)};"
+    if forma == "reales":
+        return f"g{v} = {_cadena(rnd, _termino_real, largo)};"
+    if forma == "captura":
+        # Una lectura y una cuenta que usa lo leído
+        if i % 2 == 0:
+            if rnd.random() < 0.5:
+                entradas.append(str(rnd.randint(0, 999)))
+                return f"e{v} = Captura.Entero();"
+            entradas.append(f"{rnd.randint(0, 99)},{rnd.randint(0, 99)}")
+            return f"g{v} = Captura.Real();"
+        return f"r{v} = e{v} + {_termino_entero(rnd)};"
+    # mixto
+    if i % 20 == 0:
+        return 'Mensaje.Texto("vamos bien");'
+    otra = ("cadenas", "reales", "parentesis", "captura")[i % 4]
+    return _sentencia(otra, i // 4, rnd, largo, min(profundidad, 10), entradas)
+
+
+def generar(forma, n_sentencias, largo=20, profundidad=50, semilla=0):
+    """(código, entradas): un programa de la forma pedida con n_sentencias
+    sentencias (más las declaraciones de arriba) y, en orden, los textos que
+    piden sus Captura."""
+    if forma not in FORMAS:
+        raise ValueError(f"forma desconocida: {forma} (hay {', '.join(FORMAS)})")
+    rnd = random.Random(semilla)
+    lineas, entradas = [], []
+    if forma != "declaraciones":
+        for prefijo, tipo, valor in (("c", "Entero", "{i}"), ("r", "Entero", "0"),
+                                     ("e", "Entero", "0"), ("f", "Real", "{i},5"),
+                                     ("g", "Real", "0,0")):
+            lineas += [f"{prefijo}{i} {tipo};" for i in range(N_VARIABLES)]
+            lineas += [f"{prefijo}{i} = {valor.format(i=i)};" for i in range(N_VARIABLES)]
+    for i in range(n_sentencias):
+        lineas.append(_sentencia(forma, i, rnd, largo, profundidad, entradas))
+    return "\n".join(lineas) + "\n", entradas
@@ -0,0 +1,201 @@
+# cache_compilacion.py
+# Caché en disco de programas ya validados. La clave es el hash del código
+# fuente más la versión del compilador (el hash de los módulos que lexean,
+# parsean, analizan, optimizan y bajan a bytecode) y las opciones de
+# compilación; cualquier cambio en el compilador invalida todo solo.
+#
+# Cada entrada es un archivo <clave>.pqekc con un pickle de
+#   {"bytecode": Bytecode, "simbolos": tabla de símbolos, "nodos_eliminados": n}
+# y, si se corrió con el backend de Python, "python": (cache_tag del
+# intérprete, code object en marshal). Se guarda el bytecode y no el AST
+# porque es plano: pickle no tiene que recursar por expresiones profundas.
+#
+# Varios procesos (la GUI, compilador_cli con --jobs) pueden usar el mismo
+# directorio: cada entrada se escribe en un temporal y se publica con
+# os.replace, así que nadie lee un archivo a medias. El tamaño total se acota
+# con desalojo LRU según la fecha de modificación, que se renueva en cada
+# acierto.
+
+import hashlib
+import mmap
+import os
+import pickle
+import tempfile
+import time
+
+FORMATO = 1
+EXTENSION = ".pqekc"
+
+# Tamaño máximo del directorio por defecto
+MAX_BYTES = 64 * 1024 * 1024
+
+# Temporales de escrituras que se cayeron a mitad: se borran pasado este tiempo
+VIDA_TEMPORAL = 3600
+
+_MODULOS = (
+    "analizador_lexico.py",
+    "analizador_sintactico.py",
+    "analizador_semantico.py",
+    "despacho.py",
+    "diagnosticos.py",
+    "fuente_archivo.py",
+    "incremental.py",
+    "optimizador.py",
+    "compilador_bytecode.py",
+    "transpilador.py",
+)
+
+
+def _version_compilador():
+    h = hashlib.sha256(f"formato {FORMATO}".encode())
+    raiz = os.path.dirname(os.path.abspath(__file__))
+    for nombre in _MODULOS:
+        h.update(nombre.encode())
+        try:
+            with open(os.path.join(raiz, nombre), "rb") as f:
+                h.update(f.read())
+        except OSError:
+            pass
+    return h.hexdigest()
+
+
+VERSION_COMPILADOR = _version_compilador()
+
+
+def directorio_por_defecto():
+    """$PQEK_CACHE o, si no está, ~/.cache/pqek."""
+    return os.environ.get("PQEK_CACHE") or \
+        os.path.join(os.path.expanduser("~"), ".cache", "pqek")
+
+
+class CompileCache:
+    def __init__(self, directorio=None, max_bytes=MAX_BYTES):
+        self.directorio = directorio or directorio_por_defecto()
+        self.max_bytes = max_bytes
+        os.makedirs(self.directorio, exist_ok=True)
+        self.aciertos = 0
+        self.fallos = 0
+        self.escrituras = 0
+        self.desalojos = 0
+        # Estimado del tamaño del directorio; otros procesos también escriben,
+        # así que al pasarse del límite se vuelve a medir antes de desalojar
+        self._tamano = sum(tam for _, _, tam in self._entradas())
+
+    def clave(self, code, opciones=""):
+        h = hashlib.sha256(VERSION_COMPILADOR.encode())
+        h.update(b"\0" + opciones.encode() + b"\0")
+        h.update(code.encode("utf-8"))
+        return h.hexdigest()
+
+    def clave_archivo(self, ruta, opciones=""):
+        """Como clave, pero hashea los bytes del archivo mapeado en memoria sin
+        leerlo a un str. Si el archivo tiene \r\n la clave no es la de su
+        texto: ese programa simplemente queda guardado con otra clave."""
+        h = hashlib.sha256(VERSION_COMPILADOR.encode())
+        h.update(b"\0" + opciones.encode() + b"\0")
+        with open(ruta, "rb") as f:
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    h.update(mm)
+        return h.hexdigest()
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, clave + EXTENSION)
+
+    #   LECTURA Y ESCRITURA
+
+    def get(self, clave):
+        """La entrada guardada con esa clave, o None."""
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, "rb") as f:
+                entrada = pickle.load(f)
+        except FileNotFoundError:
+            self.fallos += 1
+            return None
+        except Exception:
+            # Entrada dañada (o de otra versión de Python): se descarta
+            self.fallos += 1
+            self._borrar(ruta)
+            return None
+
+        try:
+            os.utime(ruta)   # recién usada: queda al final de la fila LRU
+        except OSError:
+            pass
+        self.aciertos += 1
+        return entrada
+
+    def put(self, clave, entrada):
+        datos = pickle.dumps(entrada, protocol=pickle.HIGHEST_PROTOCOL)
+        fd, tmp = tempfile.mkstemp(dir=self.directorio, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(datos)
+            os.replace(tmp, self._ruta(clave))
+        except OSError:
+            self._borrar(tmp)
+            return
+        self.escrituras += 1
+        self._tamano += len(datos)
+        if self._tamano > self.max_bytes:
+            self._recortar()
+
+    #   DESALOJO LRU
+
+    def _entradas(self):
+        """[(mtime, ruta, tamaño)] de las entradas del directorio."""
+        entradas = []
+        ahora = time.time()
+        try:
+            it = os.scandir(self.directorio)
+        except OSError:
+            return entradas
+        with it:
+            for e in it:
+                try:
+                    st = e.stat()
+                except OSError:
+                    continue
+                if e.name.endswith(EXTENSION):
+                    entradas.append((st.st_mtime, e.path, st.st_size))
+                elif e.name.startswith(".tmp-") and ahora - st.st_mtime > VIDA_TEMPORAL:
+                    self._borrar(e.path)
+        return entradas
+
+    def _recortar(self):
+        """Borra las entradas menos usadas hasta bajar al 90% del límite."""
+        entradas = sorted(self._entradas())
+        total = sum(tam for _, _, tam in entradas)
+        objetivo = self.max_bytes * 9 // 10
+        for _, ruta, tam in entradas:
+            if total <= objetivo:
+                break
+            if self._borrar(ruta):
+                self.desalojos += 1
+            total -= tam
+        self._tamano = total
+
+    def _borrar(self, ruta):
+        try:
+            os.remove(ruta)
+            return True
+        except OSError:
+            # Ya la borró otro proceso, o (en Windows) alguien la tiene abierta
+            return False
+
+    def limpiar(self):
+        for _, ruta, _ in self._entradas():
+            self._borrar(ruta)
+        self._tamano = 0
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+            "escrituras": self.escrituras,
+            "desalojos": self.desalojos,
+            "bytes": self._tamano,
+        }
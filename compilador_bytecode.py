@@ -0,0 +1,279 @@
+# compilador_bytecode.py
+# Baja el AST a un arreglo plano de instrucciones y lo ejecuta en una VM de pila.
+# El programa se compila una sola vez y el Bytecode se puede ejecutar muchas veces.
+# Las variables van por slot (el que les dio el semántico): la memoria de la VM
+# es una lista y Bytecode.nombres da el nombre de cada slot para la salida.
+
+import gc
+import operator
+from bisect import bisect_right
+
+from analizador_sintactico import BinaryOp, Node, Number, String, VarRef
+from despacho import Despacho
+from interprete import SIN_DECLARAR, Interpreter
+
+
+# CÓDIGOS DE OPERACIÓN
+
+LOAD_CONST = 0     # arg: valor
+LOAD_VAR = 1       # arg: slot
+BINARY = 2         # arg: función del operador (opera los dos topes de la pila)
+BINARY_CONST = 3   # arg: (función, constante)
+BINARY_VAR = 4     # arg: (función, slot)       → tope <op> variable
+STORE = 5          # arg: slot (guarda y registra "x = valor")
+DECLARE = 6        # arg: (slot, tipo)
+LOG = 7            # arg: texto
+CAPTURA = 8        # arg: tipo
+
+OPNAMES = {
+    LOAD_CONST: "LOAD_CONST",
+    LOAD_VAR: "LOAD_VAR",
+    BINARY: "BINARY",
+    BINARY_CONST: "BINARY_CONST",
+    BINARY_VAR: "BINARY_VAR",
+    STORE: "STORE",
+    DECLARE: "DECLARE",
+    LOG: "LOG",
+    CAPTURA: "CAPTURA",
+}
+
+BINARY_OPS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+}
+
+
+class Bytecode:
+    """Instrucciones (op, arg) más el inicio, el tipo y la posición (línea,
+    columna) de cada sentencia, y el nombre de la variable de cada slot."""
+
+    def __init__(self, code, stmt_starts, stmt_kinds, stmt_pos, nombres):
+        self.code = code
+        self.stmt_starts = stmt_starts
+        self.stmt_kinds = stmt_kinds
+        self.stmt_pos = stmt_pos
+        self.nombres = nombres
+
+    def __len__(self):
+        return len(self.code)
+
+    def desensamblar(self):
+        lineas = []
+        for pc, (op, arg) in enumerate(self.code):
+            if op == BINARY:
+                arg = arg.__name__
+            elif op in (BINARY_CONST, BINARY_VAR):
+                arg = (arg[0].__name__, arg[1])
+            lineas.append(f"{pc:6d}  {OPNAMES[op]:<13} {'' if arg is None else repr(arg)}")
+        return "\n".join(lineas)
+
+
+# COMPILADOR AST → BYTECODE
+
+class BytecodeCompiler:
+    # compile_<clase> por sentencia y emit_<clase> por hoja de una expresión (ver despacho.py)
+    sentencias = Despacho("compile_", "_no_compilable", Node)
+    hojas = Despacho("emit_", "_no_emitible", Node)
+
+    def __init__(self):
+        self._sentencias = self.sentencias.tabla(type(self))
+        self._hojas = self.hojas.tabla(type(self))
+        self.code = []
+        self.stmt_starts = []
+        self.stmt_kinds = []
+        self.stmt_pos = []
+        self.nombres = []   # slot → nombre
+        self.slots = {}     # nombre → slot, para los nodos sin slot
+
+    def compile(self, program):
+        for s in program.stmts:
+            self.stmt_starts.append(len(self.code))
+            self.stmt_kinds.append(s.__class__.__name__)
+            self.stmt_pos.append((s.lineno, s.col))
+            self.compile_stmt(s)
+        return Bytecode(self.code, self.stmt_starts, self.stmt_kinds, self.stmt_pos, self.nombres)
+
+    def slot(self, node):
+        """El slot de la variable del nodo; si el semántico no se lo puso, uno por nombre."""
+        slot = node.slot
+        if slot is None:
+            slot = self.slots.get(node.name, len(self.nombres))
+        nombres = self.nombres
+        if slot >= len(nombres):
+            nombres.extend([None] * (slot + 1 - len(nombres)))
+        nombres[slot] = node.name
+        self.slots[node.name] = slot
+        return slot
+
+    def compile_stmt(self, node):
+        self._sentencias[node.__class__](self, node)
+
+    def compile_VarDecl(self, node):
+        self.code.append((DECLARE, (self.slot(node), node.tipo)))
+
+    def compile_Assign(self, node):
+        self.compile_expr(node.expr)
+        self.code.append((STORE, self.slot(node)))
+
+    def compile_Mensaje(self, node):
+        self.code.append((LOG, node.texto))
+
+    def _no_compilable(self, node):
+        raise Exception(f"No puedo compilar nodo {node.__class__.__name__}")
+
+    def compile_expr(self, node):
+        # Pila explícita en vez de recursión: en ella van nodos por compilar e
+        # instrucciones ya armadas (tuplas) que se emiten cuando les toca.
+        code = self.code
+        hojas = self._hojas
+        pendientes = [node]
+        while pendientes:
+            n = pendientes.pop()
+            cls = n.__class__
+            if cls is tuple:
+                code.append(n)
+
+            elif cls is BinaryOp:
+                if n.op not in BINARY_OPS:
+                    raise Exception(f"Operador '{n.op}' inválido en operación.")
+                fn = BINARY_OPS[n.op]
+                # Superinstrucciones: si el operando derecho es una hoja va fundido con la operación
+                right = n.right
+                rcls = right.__class__
+                if rcls is Number or rcls is String:
+                    pendientes.append((BINARY_CONST, (fn, right.value)))
+                elif rcls is VarRef:
+                    pendientes.append((BINARY_VAR, (fn, self.slot(right))))
+                else:
+                    pendientes.append((BINARY, fn))
+                    pendientes.append(right)
+                pendientes.append(n.left)
+
+            else:
+                # Las hojas devuelven su instrucción ya armada
+                code.append(hojas[cls](self, n))
+
+    def emit_Number(self, node):
+        return (LOAD_CONST, node.value)
+
+    emit_String = emit_Number
+
+    def emit_VarRef(self, node):
+        return (LOAD_VAR, self.slot(node))
+
+    def emit_Captura(self, node):
+        return (CAPTURA, node.tipo)
+
+    def _no_emitible(self, node):
+        raise Exception(f"No hay eval para '{node.__class__.__name__}'.")
+
+
+def compile_program(program):
+    # Bajar un AST grande crea muchas tuplas; sin pausar el recolector de ciclos
+    # éste recorre el árbol entero una y otra vez mientras se compila.
+    reactivar = gc.isenabled()
+    gc.disable()
+    try:
+        return BytecodeCompiler().compile(program)
+    finally:
+        if reactivar:
+            gc.enable()
+
+
+# MÁQUINA VIRTUAL
+
+class VM(Interpreter):
+    """Ejecuta Bytecode con la misma salida y los mismos errores que Interpreter."""
+
+    def run(self, node):
+        self.execute(compile_program(node))
+
+    def preparar(self, bytecode):
+        """Memoria para los slots del programa, con sus nombres."""
+        self.reservar(len(bytecode.nombres))
+        self.slots.update((n, s) for s, n in enumerate(bytecode.nombres) if n is not None)
+        self.nombres = bytecode.nombres
+
+    def execute(self, bytecode):
+        self.preparar(bytecode)
+        code = bytecode.code
+        pc = 0
+        while True:
+            fallo = self._loop(code, pc)
+            if fallo is None:
+                break
+            # Igual que Interpreter.run: se reporta y se sigue con la próxima sentencia
+            pc, e = fallo
+            i = bisect_right(bytecode.stmt_starts, pc) - 1
+            self._error_ejecucion(bytecode.stmt_kinds[i], *bytecode.stmt_pos[i], e)
+            if i + 1 >= len(bytecode.stmt_starts):
+                break
+            pc = bytecode.stmt_starts[i + 1]
+        self.sink.flush()
+
+    def _loop(self, code, pc):
+        """Corre desde pc; si algo falla devuelve (pc de la instrucción, excepción)."""
+        valores = self.valores
+        nombres = self.nombres
+        log = self.log
+        to_comma = self._to_comma
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        n = len(code)
+
+        try:
+            while pc < n:
+                op, arg = code[pc]
+                pc += 1
+
+                if op == BINARY_CONST:
+                    fn, right = arg
+                    stack[-1] = fn(stack[-1], right)
+
+                elif op == BINARY_VAR:
+                    fn, slot = arg
+                    right = valores[slot]
+                    if right is None:
+                        raise Exception(f"La variable '{nombres[slot]}' no tiene valor, llave.")
+                    if right is SIN_DECLARAR:
+                        raise Exception(f"Variable '{nombres[slot]}' no existe.")
+                    stack[-1] = fn(stack[-1], right)
+
+                elif op == LOAD_VAR:
+                    value = valores[arg]
+                    if value is None:
+                        raise Exception(f"La variable '{nombres[arg]}' no tiene valor, llave.")
+                    if value is SIN_DECLARAR:
+                        raise Exception(f"Variable '{nombres[arg]}' no existe.")
+                    push(value)
+
+                elif op == LOAD_CONST:
+                    push(arg)
+
+                elif op == BINARY:
+                    right = pop()
+                    stack[-1] = arg(stack[-1], right)
+
+                elif op == STORE:
+                    value = pop()
+                    valores[arg] = value
+                    if value.__class__ is float:
+                        value = to_comma(value)
+                    log(f"{nombres[arg]} = {value}")
+
+                elif op == DECLARE:
+                    valores[arg[0]] = None
+                    log(f"Variable declarada: {nombres[arg[0]]} ({arg[1]})")
+
+                elif op == LOG:
+                    log(arg)
+
+                elif op == CAPTURA:
+                    self._anunciar_captura(arg)
+                    push(self._valor_capturado(arg, self._read_input_from_output()))
+        except Exception as e:
+            return pc - 1, e
+        return None
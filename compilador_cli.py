@@ -0,0 +1,330 @@
+# compilador_cli.py
+# Compilador por lotes sin interfaz gráfica: nunca importa PyQt5.
+#
+# Uso:
+#   python compilador_cli.py programas/ "tareas/**/*.pqek" --jobs 8 -o resultados.jsonl
+#
+# Cada archivo produce una línea JSON con sus diagnósticos y su salida.
+# Los programas que ya pasaron el análisis semántico quedan en la caché de
+# compilación (ver cache_compilacion.py): la próxima vez van directo a ejecución.
+# Con --medir cada línea trae además el tiempo y los contadores de cada fase
+# (ver instrumentacion.py); con --perfil, también el perfil de cProfile.
+# Con --backend python el programa se traduce a Python (ver transpilador.py) y
+# el code object también queda en la caché. Con --entradas, las Capturas de
+# cada programa leen en orden las líneas de ese archivo (ver entradas.py); para
+# correr un programa con muchos juegos de entradas está correr_casos.py.
+# Los archivos de ARCHIVO_GRANDE bytes o más no se leen enteros: se lexean por
+# trozos directo del archivo mapeado en memoria (ver fuente_archivo.py).
+
+import argparse
+import glob
+import json
+import marshal
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from analizador_semantico import SemanticAnalyzer
+from cache_compilacion import CompileCache, directorio_por_defecto
+from entradas import EntradaScript
+from fuente_archivo import FuenteArchivo
+from sesion import CompilationSession
+from compilador_bytecode import compile_program
+from instrumentacion import Medicion, SIN_MEDICION
+from optimizador import contar_nodos, optimizar
+from transpilador import Transpilado, TranspiledInterpreter, transpilar
+
+
+# INTÉRPRETE PARA MODO LOTE
+
+class BatchInterpreter(TranspiledInterpreter):
+    """VM (o programa traducido a Python) que guarda la salida en memoria en vez de imprimirla."""
+
+    def __init__(self, entrada=None):
+        # La salida completa va al JSON: output_log sin límite
+        super().__init__(gui=None, limite_log=None, entrada=entrada)
+
+    def log(self, text, error=False, info=False):
+        self.output_log.append(text)
+
+    def _read_input_from_output(self):
+        if self.entrada is None:
+            raise Exception("Captura no disponible en modo lote, llave.")
+        return self.entrada.leer()
+
+
+# Desde este tamaño el archivo se parsea con CompilationSession.parse_archivo
+ARCHIVO_GRANDE = 32 * 1024 * 1024
+
+
+# TRABAJADOR (una sesión con su parser caliente por proceso)
+
+_sesion = None
+_optimizar = True
+_cache = None
+_medir = False
+_perfilar = False
+_backend = "vm"
+_entradas = None
+
+
+def _inicializar_worker(optimizar_ast=True, directorio_cache=None, medir=False, perfilar=False,
+                        backend="vm", entradas=None):
+    global _sesion, _optimizar, _cache, _medir, _perfilar, _backend, _entradas
+    _sesion = CompilationSession()
+    _optimizar = optimizar_ast
+    _cache = CompileCache(directorio_cache) if directorio_cache else None
+    _medir = medir or perfilar
+    _perfilar = perfilar
+    _backend = backend
+    _entradas = entradas
+
+
+def compilar_archivo(path):
+    """Corre léxico, sintáctico, semántico, optimización y ejecución sobre un archivo."""
+    if _sesion is None:
+        _inicializar_worker(_optimizar)
+
+    inicio = time.perf_counter()
+    med = Medicion(_perfilar) if _medir else SIN_MEDICION
+    resultado = {
+        "archivo": path,
+        "ok": False,
+        "fase": "lectura",
+        "diagnosticos": [],
+        "salida": [],
+    }
+
+    try:
+        # code queda en None para los archivos grandes: se leen por trozos al parsear
+        code = None
+        if os.path.getsize(path) < ARCHIVO_GRANDE:
+            with open(path, "r", encoding="utf-8") as f:
+                code = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        # Un archivo que no se puede leer (o que no es UTF-8) es un resultado
+        # más del lote, no un error que corte a los demás
+        return _error_lectura(resultado, inicio, e)
+
+    clave = None
+    if _cache is not None:
+        with med.fase("cache"):
+            opciones = "optimizado" if _optimizar else ""
+            if code is None:
+                clave = _cache.clave_archivo(path, opciones)
+            else:
+                clave = _cache.clave(code, opciones)
+            entrada = _cache.get(clave)
+        resultado["cache"] = "acierto" if entrada is not None else "fallo"
+        if entrada is not None:
+            if _optimizar:
+                resultado["nodos_eliminados"] = entrada["nodos_eliminados"]
+            return _ejecutar(entrada["bytecode"], resultado, inicio, med, entrada, clave)
+
+    try:
+        if med.activa:
+            # El léxico corre dentro del parser: para medirlo aparte se lexea una vez más
+            with med.fase("lexico") as datos:
+                if code is None:
+                    datos["tokens"] = sum(1 for _ in FuenteArchivo(path).tokens())
+                else:
+                    datos["tokens"] = len(_sesion.tokens(code))
+
+        # Sintáctico. Se reportan todos los errores y el semántico revisa igual las
+        # sentencias válidas, pero con errores de léxico o sintaxis no se ejecuta nada.
+        resultado["fase"] = "sintactico"
+        with med.fase("sintactico") as datos:
+            ast = _sesion.parse(code) if code is not None else _sesion.parse_archivo(path)
+    except UnicodeDecodeError as e:
+        # Los archivos grandes se decodifican recién al lexear cada trozo
+        return _error_lectura(resultado, inicio, e)
+    if med.activa:
+        datos["sentencias"] = len(ast.stmts)
+        datos["nodos"] = contar_nodos(ast)
+    errores_lexicos = _sesion.diagnosticos_lexicos
+    for d in _sesion.errores_sintacticos + errores_lexicos:
+        resultado["diagnosticos"].append(d.a_dict())
+
+    # Semántico
+    analyzer = SemanticAnalyzer()
+    with med.fase("semantico") as datos:
+        analyzer.visit(ast)
+    datos["simbolos"] = len(analyzer.symbols)
+    for d in analyzer.diagnosticos:
+        resultado["diagnosticos"].append(d.a_dict())
+    if resultado["diagnosticos"]:
+        # La fase que se reporta es la primera que falló
+        if errores_lexicos:
+            resultado["fase"] = "lexico"
+        elif not _sesion.errores_sintacticos:
+            resultado["fase"] = "semantico"
+        return _terminar(resultado, inicio, med)
+
+    # Optimización
+    eliminados = 0
+    if _optimizar:
+        with med.fase("optimizacion") as datos:
+            ast, eliminados = optimizar(ast)
+        datos["nodos_eliminados"] = eliminados
+        resultado["nodos_eliminados"] = eliminados
+
+    with med.fase("bytecode") as datos:
+        bytecode = compile_program(ast)
+    datos["instrucciones"] = len(bytecode)
+    entrada = {
+        "bytecode": bytecode,
+        "simbolos": analyzer.symbols,
+        "nodos_eliminados": eliminados,
+    }
+    if _cache is not None and _backend == "vm":
+        _cache.put(clave, entrada)
+    return _ejecutar(bytecode, resultado, inicio, med, entrada, clave)
+
+
+def _traducido(bytecode, entrada, clave, med):
+    """El programa traducido a Python: de la caché si está, si no se traduce y se guarda."""
+    guardado = entrada.get("python")
+    if guardado is not None and guardado[0] == sys.implementation.cache_tag:
+        # El code object va en marshal, que solo lee la misma versión de Python
+        return Transpilado(bytecode, None, marshal.loads(guardado[1]))
+    with med.fase("transpilar"):
+        traducido = transpilar(bytecode)
+    if _cache is not None:
+        entrada["python"] = (sys.implementation.cache_tag, marshal.dumps(traducido.codigo))
+        _cache.put(clave, entrada)
+    return traducido
+
+
+def _ejecutar(bytecode, resultado, inicio, med=SIN_MEDICION, entrada=None, clave=None):
+    resultado["fase"] = "ejecucion"
+    interp = BatchInterpreter(None if _entradas is None else EntradaScript(_entradas))
+    if _backend == "python":
+        traducido = _traducido(bytecode, entrada, clave, med)
+        with med.fase("ejecucion") as datos:
+            interp.execute_python(traducido)
+    else:
+        with med.fase("ejecucion") as datos:
+            interp.execute(bytecode)
+    datos["sentencias"] = len(bytecode.stmt_starts)
+    resultado["salida"] = list(interp.output_log)
+    for d in interp.diagnosticos:
+        resultado["diagnosticos"].append(d.a_dict())
+
+    if not interp.diagnosticos:
+        resultado["ok"] = True
+        resultado["fase"] = "ok"
+    return _terminar(resultado, inicio, med)
+
+
+def _error_lectura(resultado, inicio, e):
+    resultado["fase"] = "lectura"
+    resultado["diagnosticos"].append({"fase": "lectura", "mensaje": str(e)})
+    return _terminar(resultado, inicio)
+
+
+def _terminar(resultado, inicio, med=SIN_MEDICION):
+    resultado["tiempo_ms"] = round((time.perf_counter() - inicio) * 1000, 3)
+    if med.activa:
+        resultado["medicion"] = med.a_dict()
+    return resultado
+
+
+# BÚSQUEDA DE ARCHIVOS
+
+def expandir_rutas(rutas):
+    """Convierte directorios y globs en una lista ordenada de archivos .pqek."""
+    archivos = []
+    vistos = set()
+    for ruta in rutas:
+        if os.path.isdir(ruta):
+            encontrados = glob.glob(os.path.join(ruta, "**", "*.pqek"), recursive=True)
+        elif glob.has_magic(ruta):
+            encontrados = glob.glob(ruta, recursive=True)
+        else:
+            encontrados = [ruta]
+        for f in sorted(encontrados):
+            if f not in vistos and not os.path.isdir(f):
+                vistos.add(f)
+                archivos.append(f)
+    return archivos
+
+
+# PUNTO DE ENTRADA
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Compila y ejecuta archivos .pqek por lotes (salida en JSON lines)."
+    )
+    ap.add_argument("rutas", nargs="+", help="archivos, directorios o globs")
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                    help="procesos en paralelo (por defecto: núcleos de la máquina)")
+    ap.add_argument("-o", "--salida", default="-",
+                    help="archivo JSON lines de salida ('-' para stdout)")
+    ap.add_argument("--sin-optimizar", action="store_true",
+                    help="no plegar constantes ni simplificar antes de ejecutar")
+    ap.add_argument("--cache", default=directorio_por_defecto(),
+                    help="directorio de la caché de compilación (por defecto: $PQEK_CACHE o ~/.cache/pqek)")
+    ap.add_argument("--sin-cache", action="store_true",
+                    help="compilar todo de cero sin leer ni escribir la caché")
+    ap.add_argument("--medir", action="store_true",
+                    help="agregar a cada resultado el tiempo y los contadores de cada fase")
+    ap.add_argument("--perfil", action="store_true",
+                    help="además, el perfil de cProfile de cada fase (implica --medir)")
+    ap.add_argument("--backend", choices=("vm", "python"), default="vm",
+                    help="vm: bytecode en la VM; python: traducir a Python, compilar y correr con exec")
+    ap.add_argument("--entradas", metavar="ARCHIVO",
+                    help="valores para Captura, uno por línea (cada programa los lee desde el principio)")
+    args = ap.parse_args(argv)
+
+    entradas = None
+    if args.entradas:
+        with open(args.entradas, encoding="utf-8") as f:
+            entradas = f.read().splitlines()
+
+    archivos = expandir_rutas(args.rutas)
+    if not archivos:
+        print("Nojoda llave, no encontré ningún archivo .pqek.", file=sys.stderr)
+        return 2
+
+    directorio_cache = None if args.sin_cache else args.cache
+    out = sys.stdout if args.salida == "-" else open(args.salida, "w", encoding="utf-8")
+    fallidos = 0
+    aciertos = 0
+    try:
+        if args.jobs <= 1:
+            _inicializar_worker(not args.sin_optimizar, directorio_cache, args.medir, args.perfil,
+                                args.backend, entradas)
+            resultados = map(compilar_archivo, archivos)
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(max_workers=args.jobs,
+                                           initializer=_inicializar_worker,
+                                           initargs=(not args.sin_optimizar, directorio_cache,
+                                                     args.medir, args.perfil, args.backend,
+                                                     entradas))
+            chunk = max(1, len(archivos) // (args.jobs * 8))
+            resultados = executor.map(compilar_archivo, archivos, chunksize=chunk)
+
+        for r in resultados:
+            if not r["ok"]:
+                fallidos += 1
+            if r.get("cache") == "acierto":
+                aciertos += 1
+            out.write(json.dumps(r, ensure_ascii=False) + "\n")
+
+        if executor:
+            executor.shutdown()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if directorio_cache:
+        # Los aciertos se cuentan aquí porque cada proceso tiene su propia CompileCache
+        print(f"caché: {aciertos} aciertos, {len(archivos) - aciertos} fallos"
+              f" ({directorio_cache})", file=sys.stderr)
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
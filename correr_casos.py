@@ -0,0 +1,151 @@
+# correr_casos.py
+# Corre un mismo programa .pqek con muchos juegos de entradas para Captura.
+# El programa se compila una sola vez (léxico, sintáctico, semántico,
+# optimización y bytecode) y cada caso es una ejecución nueva, con su propia
+# memoria y su propia salida, repartida en un pool de procesos.
+#
+# Uso:
+#   python correr_casos.py programa.pqek casos.json --jobs 8 -o resultados.jsonl
+#
+# casos.json es un arreglo JSON; cada caso es la lista de valores que se van
+# ingresando, o un objeto con "entradas" y "esperado" (la salida que debería dar):
+#   [["7", "12,5"], [3, 4.5], {"entradas": ["1"], "esperado": ["x = 1"]}]
+#
+# Cada caso produce una línea JSON con su salida y sus diagnósticos. Sale con
+# código 1 si algún caso tuvo errores o no dio la salida esperada.
+
+import argparse
+import json
+import marshal
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from analizador_semantico import SemanticAnalyzer
+from compilador_bytecode import compile_program
+from compilador_cli import BatchInterpreter
+from entradas import EntradaScript, cargar_casos
+from optimizador import optimizar
+from sesion import CompilationSession
+from transpilador import Transpilado, transpilar
+
+
+# COMPILACIÓN (una vez, en el proceso principal)
+
+def compilar(code, optimizar_ast=True):
+    """Código → (Bytecode, []), o (None, diagnósticos) si no pasa el análisis."""
+    sesion = CompilationSession()
+    ast = sesion.parse(code)
+    diagnosticos = sesion.errores_sintacticos + sesion.diagnosticos_lexicos
+    analyzer = SemanticAnalyzer()
+    analyzer.visit(ast)
+    diagnosticos += analyzer.diagnosticos
+    if diagnosticos:
+        return None, diagnosticos
+    if optimizar_ast:
+        ast, _ = optimizar(ast)
+    return compile_program(ast), []
+
+
+# EJECUCIÓN (una vez por caso, en cada trabajador)
+
+_bytecode = None
+_traducido = None
+
+
+def _inicializar_worker(bytecode, codigo=None):
+    """codigo es el programa traducido a Python, en marshal (None = correr en la VM)."""
+    global _bytecode, _traducido
+    _bytecode = bytecode
+    _traducido = None if codigo is None else Transpilado(bytecode, None, marshal.loads(codigo))
+
+
+def correr_caso(numerado):
+    """(índice, caso) → resultado del caso, listo para volcarlo a JSON."""
+    indice, caso = numerado
+    inicio = time.perf_counter()
+    entrada = EntradaScript(caso["entradas"])
+    interp = BatchInterpreter(entrada)
+    if _traducido is not None:
+        interp.execute_python(_traducido)
+    else:
+        interp.execute(_bytecode)
+
+    resultado = {
+        "caso": indice,
+        "ok": not interp.diagnosticos,
+        "entradas": caso["entradas"],
+        "salida": list(interp.output_log),
+        "diagnosticos": [d.a_dict() for d in interp.diagnosticos],
+    }
+    if entrada.leidas < len(caso["entradas"]):
+        resultado["sin_usar"] = len(caso["entradas"]) - entrada.leidas
+    if "esperado" in caso:
+        resultado["esperado"] = caso["esperado"]
+        resultado["coincide"] = resultado["salida"] == caso["esperado"]
+        resultado["ok"] = resultado["ok"] and resultado["coincide"]
+    resultado["tiempo_ms"] = round((time.perf_counter() - inicio) * 1000, 3)
+    return resultado
+
+
+def correr_casos(bytecode, casos, jobs=1, backend="vm"):
+    """Generador: el resultado de cada caso, en el mismo orden que casos."""
+    # Al pool se manda el code object en marshal: los code objects no se pueden picklear
+    codigo = marshal.dumps(transpilar(bytecode).codigo) if backend == "python" else None
+    if jobs <= 1:
+        _inicializar_worker(bytecode, codigo)
+        yield from map(correr_caso, enumerate(casos))
+        return
+    chunk = max(1, len(casos) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_inicializar_worker,
+                             initargs=(bytecode, codigo)) as executor:
+        yield from executor.map(correr_caso, enumerate(casos), chunksize=chunk)
+
+
+# PUNTO DE ENTRADA
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Corre un programa .pqek con muchos juegos de entradas (salida en JSON lines)."
+    )
+    ap.add_argument("programa", help="archivo .pqek")
+    ap.add_argument("casos", help="arreglo JSON de casos ('-' para leerlo de stdin)")
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                    help="procesos en paralelo (por defecto: núcleos de la máquina)")
+    ap.add_argument("-o", "--salida", default="-",
+                    help="archivo JSON lines de salida ('-' para stdout)")
+    ap.add_argument("--sin-optimizar", action="store_true",
+                    help="no plegar constantes ni simplificar antes de ejecutar")
+    ap.add_argument("--backend", choices=("vm", "python"), default="vm",
+                    help="vm: bytecode en la VM; python: traducir a Python, compilar y correr con exec")
+    args = ap.parse_args(argv)
+
+    with open(args.programa, encoding="utf-8") as f:
+        code = f.read()
+    casos = cargar_casos(args.casos)
+
+    inicio = time.perf_counter()
+    bytecode, diagnosticos = compilar(code, not args.sin_optimizar)
+    if bytecode is None:
+        for d in diagnosticos:
+            print(f"{args.programa}:{d.linea}:{d.columna}: {d.mensaje}", file=sys.stderr)
+        return 2
+
+    out = sys.stdout if args.salida == "-" else open(args.salida, "w", encoding="utf-8")
+    fallidos = 0
+    try:
+        for r in correr_casos(bytecode, casos, args.jobs, args.backend):
+            fallidos += not r["ok"]
+            out.write(json.dumps(r, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"{len(casos)} casos: {len(casos) - fallidos} bien, {fallidos} con errores"
+          f" ({(time.perf_counter() - inicio) * 1000:.0f} ms)", file=sys.stderr)
+    return 1 if fallidos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+# despacho.py
+# Tablas de despacho por tipo de nodo para los recorridos del AST
+# (SemanticAnalyzer.visit, Interpreter.run, Interpreter.eval, BytecodeCompiler).
+# En vez de armar "visit_" + nombre de la clase y buscarlo con getattr en cada
+# nodo, o de comparar el nombre de la clase contra cada rama, cada visitante
+# tiene un dict {clase del nodo: función} y despachar es una sola búsqueda en
+# ese dict.
+#
+#   class SemanticAnalyzer:
+#       visitas = Despacho("visit_", "generic_visit", Node)
+#
+#       def __init__(self):
+#           self._visitas = self.visitas.tabla(type(self))
+#
+#       def visit(self, node):
+#           return self._visitas[node.__class__](self, node)
+#
+# La función de cada tipo de nodo es el método prefijo + nombre de la clase
+# (visit_VarRef para VarRef), buscado una sola vez por clase visitante y tipo
+# de nodo; así las subclases que redefinen un método lo siguen usando. La
+# tabla se arma completa, con todas las subclases de Node, la primera vez que
+# se pide: es un dict común y no una subclase de dict con __missing__, porque
+# el intérprete de Python solo acelera las búsquedas en un dict común (con
+# __missing__ cada nodo costaba más que la cadena de ifs de antes). Un objeto
+# que no es un nodo, o una clase de nodo creada después de armarse la tabla,
+# da KeyError: un tipo de nodo nuevo se agrega con registrar.
+#
+#   SemanticAnalyzer.visitas.registrar(MiNodo, visitar_mi_nodo)
+
+
+def _subclases(base):
+    """base y todas las clases que heredan de ella, a cualquier profundidad."""
+    pendientes = [base]
+    while pendientes:
+        clase = pendientes.pop()
+        yield clase
+        pendientes += clase.__subclasses__()
+
+
+class Despacho:
+    """Las tablas de un recorrido (un prefijo de métodos), una por clase visitante."""
+
+    def __init__(self, prefijo, por_defecto, nodos):
+        self.prefijo = prefijo
+        self.por_defecto = por_defecto   # método para los nodos sin función propia
+        self.nodos = nodos               # clase base de los nodos del AST
+        self.visitante = None
+        self._tablas = {}                # clase visitante → {clase del nodo: función}
+
+    def __set_name__(self, visitante, nombre):
+        self.visitante = visitante
+
+    def tabla(self, visitante):
+        """La tabla de esa clase (type(self) del visitante); se arma una sola vez."""
+        tabla = self._tablas.get(visitante)
+        if tabla is None:
+            tabla = self._tablas[visitante] = {
+                tipo: self._funcion(visitante, tipo) for tipo in _subclases(self.nodos)}
+        return tabla
+
+    def _funcion(self, visitante, tipo):
+        funcion = getattr(visitante, self.prefijo + tipo.__name__, None)
+        if funcion is None:
+            funcion = getattr(visitante, self.por_defecto)
+        return funcion
+
+    def registrar(self, tipo, funcion, visitante=None):
+        """Usa funcion(visitante, nodo) para los nodos de la clase tipo, en la
+        clase donde se declaró el Despacho (o en visitante) y sus subclases."""
+        visitante = visitante or self.visitante
+        setattr(visitante, self.prefijo + tipo.__name__, funcion)
+        # Las tablas ya armadas se corrigen en el lugar: los visitantes que ya
+        # existen tienen guardada la misma tabla
+        for clase, tabla in self._tablas.items():
+            if issubclass(clase, visitante):
+                tabla[tipo] = self._funcion(clase, tipo)
+        return funcion
@@ -0,0 +1,81 @@
+# diagnosticos.py
+# Posiciones exactas y errores estructurados.
+#
+# TablaLineas guarda el offset donde empieza cada línea del texto y convierte
+# un offset (lexpos) en (línea, columna) con búsqueda binaria: O(log n) por
+# consulta, sin volver a recorrer el texto. Diagnostico es un error de
+# cualquier fase con su posición; el editor lo subraya tal cual y
+# compilador_cli lo vuelca a JSON.
+
+import re
+from bisect import bisect_right
+
+
+# TABLA DE LÍNEAS
+
+_SALTO = re.compile("\n")
+
+
+class TablaLineas:
+    """Inicios de línea de texto[inicio:fin]. `linea` es el número (desde 1) de
+    la línea que contiene `inicio`; con los valores por defecto cubre todo el texto."""
+
+    __slots__ = ("texto", "linea", "inicios")
+
+    def __init__(self, texto, inicio=0, fin=None, linea=1):
+        self.texto = texto
+        self.linea = linea
+        fin = len(texto) if fin is None else fin
+        self.inicios = [texto.rfind("\n", 0, inicio) + 1]
+        self.inicios += [m.end() for m in _SALTO.finditer(texto, inicio, fin)]
+
+    def posicion(self, offset):
+        """(línea, columna) del offset, ambas desde 1."""
+        i = bisect_right(self.inicios, offset) - 1
+        return self.linea + i, offset - self.inicios[i] + 1
+
+
+def tabla_de(lexer):
+    """La TablaLineas del texto que tiene cargado el lexer; se arma una sola
+    vez por texto y queda guardada en lexer.tabla_lineas."""
+    tabla = getattr(lexer, "tabla_lineas", None)
+    if tabla is None or tabla.texto is not lexer.lexdata:
+        tabla = lexer.tabla_lineas = TablaLineas(lexer.lexdata)
+    return tabla
+
+
+# DIAGNÓSTICOS
+
+class Diagnostico:
+    """Error de una fase ("lexico", "sintactico", "semantico" o "ejecucion").
+    linea y columna van desde 1 (None si no se sabe); largo es cuántos
+    caracteres subrayar desde la columna."""
+
+    __slots__ = ("fase", "linea", "columna", "mensaje", "largo")
+
+    def __init__(self, fase, linea, columna, mensaje, largo=1):
+        self.fase = fase
+        self.linea = linea
+        self.columna = columna
+        self.mensaje = mensaje
+        self.largo = max(1, largo)
+
+    def __eq__(self, otro):
+        return isinstance(otro, Diagnostico) and all(
+            getattr(self, a) == getattr(otro, a) for a in self.__slots__)
+
+    def __repr__(self):
+        return f"Diagnostico({self.fase!r}, {self.linea}, {self.columna}, {self.mensaje!r})"
+
+    def a_dict(self):
+        d = {"fase": self.fase}
+        if self.linea is not None:
+            d["linea"] = self.linea
+            d["columna"] = self.columna
+        d["mensaje"] = self.mensaje
+        return d
+
+
+def diagnosticos_lexicos(errores, tabla):
+    """listar_errores_lexicos ([(línea desde 0, offset, mensaje)]) → Diagnosticos."""
+    return [Diagnostico("lexico", *tabla.posicion(offset), msg) for (_, offset, msg) in errores]
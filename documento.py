@@ -0,0 +1,80 @@
+# documento.py
+# Las fases del front end sobre el texto del editor, guardadas por revisión del
+# documento. Los botones de CompilerGUI (léxico, sintáctico, semántico,
+# ejecutar) piden cada uno las fases que necesitan: mientras el texto no
+# cambie, los tokens se lexean una sola vez, el parser los toma de la lista ya
+# lexeada y el análisis semántico tampoco se repite. Así "Ejecutar" después de
+# "Analizar Semántico" va directo al intérprete.
+#
+#   doc = PipelineDocumento()
+#   doc.actualizar(editor.toPlainText())
+#   doc.tokens(), doc.errores_lexicos   # fase léxica
+#   doc.ast(), doc.errores_sintacticos  # + sintáctica (todos los errores de una)
+#   doc.semantico()                     # + semántica (el SemanticAnalyzer ya revisado)
+#
+# Como en la ventana principal, el parser no se detiene en el primer error:
+# ast() trae las sentencias válidas y errores_sintacticos todos los errores
+# (Diagnostico). Un error semántico también queda guardado: pedir otra vez la
+# fase lanza el mismo error sin volver a calcularla.
+
+from functools import partial
+
+from analizador_semantico import SemanticAnalyzer
+from analizador_sintactico import parsear_flujo
+from sesion import CompilationSession
+
+
+class PipelineDocumento:
+    """Tokens, AST y tabla de símbolos del texto actual, calculados una vez por revisión."""
+
+    def __init__(self):
+        # Lexer y parser propios: los tokens guardados apuntan a este lexer y
+        # sus posiciones salen del texto que tiene cargado (ver tabla_de)
+        self.sesion = CompilationSession()
+        self.texto = None
+        self.revision = 0           # sube cada vez que cambia el texto
+        self._olvidar()
+
+    def _olvidar(self):
+        self._tokens = None
+        self.errores_lexicos = []   # [(línea desde 0, posición, mensaje)] del lexer
+        self._ast = None
+        self.errores_sintacticos = []   # [Diagnostico] del parser
+        self._sem = None
+        self._error_semantico = None
+
+    def actualizar(self, texto):
+        """Carga el texto del documento; si es el mismo de antes, todo lo calculado sigue valiendo."""
+        if texto != self.texto:
+            self.texto = texto
+            self.revision += 1
+            self._olvidar()
+
+    #   FASES
+
+    def tokens(self):
+        if self._tokens is None:
+            self._tokens = self.sesion.tokens(self.texto)
+            self.errores_lexicos = list(self.sesion.listar_errores_lexicos)
+        return self._tokens
+
+    def ast(self):
+        """Program con las sentencias válidas; los errores quedan en errores_sintacticos."""
+        if self._ast is None:
+            siguiente = partial(next, iter(self.tokens()), None)
+            self._ast, self.errores_sintacticos = parsear_flujo(
+                siguiente, self.sesion.lexer, self.sesion.parser)
+        return self._ast
+
+    def semantico(self):
+        if self._sem is None and self._error_semantico is None:
+            sem = SemanticAnalyzer()
+            try:
+                sem.analyze(self.ast())
+                self._sem = sem
+            except Exception as e:
+                self._error_semantico = e
+                raise
+        if self._error_semantico is not None:
+            raise self._error_semantico.with_traceback(None)
+        return self._sem
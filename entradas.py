@@ -0,0 +1,73 @@
+# entradas.py
+# De dónde sale lo que pide Captura cuando no hay nadie escribiendo. Un
+# intérprete con Interpreter(entrada=...) le pide cada valor a entrada.leer()
+# en vez de a la consola o a la GUI; cualquier objeto con leer() sirve.
+#
+#   EntradaScript(["7", "12,5"])          # una lista o cualquier iterador
+#   entrada_de_archivo("entradas.txt")    # un valor por línea
+#   cargar_casos("casos.json")            # muchos juegos de entradas (ver correr_casos.py)
+#
+# Los valores se entregan como texto, igual que si se hubieran tecleado: la
+# conversión a Entero o Real la hace el intérprete (Interpreter._valor_capturado).
+
+import json
+import sys
+from decimal import Decimal
+
+
+class EntradaScript:
+    """Entrega los valores de un iterable en orden, uno por Captura."""
+
+    def __init__(self, valores):
+        self._valores = iter(valores)
+        self.leidas = 0
+
+    def leer(self):
+        try:
+            valor = next(self._valores)
+        except StopIteration:
+            raise Exception(f"Se acabaron las entradas, llave: la Captura número "
+                            f"{self.leidas + 1} no tiene valor.") from None
+        self.leidas += 1
+        return texto_de(valor)
+
+
+def texto_de(valor):
+    """Un valor de JSON como se teclearía: los reales con coma y sin exponente
+    (str(1e-07) da "1e-07", que Captura no acepta como Real)."""
+    if isinstance(valor, float):
+        return format(Decimal(repr(valor)), "f").replace(".", ",")
+    return str(valor)
+
+
+def entrada_de_archivo(ruta):
+    """EntradaScript con las líneas de un archivo de texto."""
+    with open(ruta, encoding="utf-8") as f:
+        return EntradaScript(f.read().splitlines())
+
+
+# CASOS
+
+def normalizar_casos(datos):
+    """Arreglo JSON de casos → [{"entradas": [texto, ...], ...}].
+
+    Cada caso es la lista de valores en el orden en que se ingresan, o un
+    objeto con "entradas" y, si se quiere comparar la salida, "esperado"."""
+    if not isinstance(datos, list):
+        raise Exception("Los casos tienen que ser un arreglo JSON, llave.")
+    casos = []
+    for i, caso in enumerate(datos):
+        if isinstance(caso, list):
+            caso = {"entradas": caso}
+        elif not isinstance(caso, dict) or not isinstance(caso.get("entradas", []), list):
+            raise Exception(f"Esa vaina del caso {i} no es ni una lista ni un objeto con \"entradas\".")
+        casos.append({**caso, "entradas": [texto_de(v) for v in caso.get("entradas", [])]})
+    return casos
+
+
+def cargar_casos(ruta):
+    """Los casos de un archivo JSON ('-' para leerlos de stdin)."""
+    if ruta == "-":
+        return normalizar_casos(json.load(sys.stdin))
+    with open(ruta, encoding="utf-8") as f:
+        return normalizar_casos(json.load(f))
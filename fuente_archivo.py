@@ -0,0 +1,194 @@
+# fuente_archivo.py
+# Front end para archivos .pqek muy grandes: en vez de leer todo el archivo a
+# un solo str (y copiarlo al widget, y de vuelta con toPlainText), se mapea con
+# mmap y se lexea por trozos de TAMANO_TROZO bytes que siempre terminan justo
+# después de un ';', así que ninguna sentencia queda partida entre dos trozos.
+# Los tokens salen en flujo hacia el parser; en memoria solo está el texto del
+# trozo que se está lexeando.
+#
+#   fuente = FuenteArchivo("enorme.pqek")
+#   ast, errores = parsear_flujo(fuente.siguiente_token(), fuente, parser)
+#   fuente.diagnosticos_lexicos
+#
+# La FuenteArchivo hace de lexer para el parser: los tokens traen su lexpos
+# contado desde el principio del archivo y tabla_lineas lo convierte en línea
+# y columna con las tablas de los últimos trozos (una sentencia nunca mira más
+# atrás). Los saltos de línea \r\n y \r se leen como \n, igual que open() en
+# modo texto.
+
+import mmap
+import os
+from collections import deque
+from functools import partial
+
+from analizador_lexico import nuevo_lexer
+from analizador_sintactico import parsear_flujo
+from diagnosticos import Diagnostico, TablaLineas
+
+# Bytes que se lexean de una vez (el trozo se alarga hasta el próximo ';').
+# Los tokens del trozo se guardan en una lista hasta saber dónde cortar, y cada
+# token pesa decenas de veces lo que ocupa en el texto: el trozo es chico.
+TAMANO_TROZO = 1 << 16
+
+
+class _TablaTrozos:
+    """Posiciones de offsets del archivo completo, con las tablas de los últimos trozos."""
+
+    __slots__ = ("texto", "trozos")
+
+    def __init__(self):
+        self.texto = None
+        # (offset donde empieza el trozo, TablaLineas); el primero es el del archivo vacío
+        self.trozos = deque([(0, TablaLineas(""))], maxlen=2)
+
+    def posicion(self, offset):
+        for base, tabla in reversed(self.trozos):
+            if offset >= base:
+                break
+        return tabla.posicion(offset - base)
+
+
+class FuenteArchivo:
+    """Tokens de un archivo mapeado en memoria, lexeado por trozos."""
+
+    def __init__(self, ruta, lexer=None, tamano_trozo=TAMANO_TROZO):
+        self.ruta = ruta
+        self.lexer = lexer if lexer is not None else nuevo_lexer()
+        self.tamano_trozo = tamano_trozo
+        self.diagnosticos_lexicos = []
+        # Lo que el parser le pide a su lexer (ver parsear_flujo y tabla_de)
+        self.lineno = 1
+        self.lexdata = ""
+        self.tabla_lineas = _TablaTrozos()
+        self.tabla_lineas.texto = self.lexdata
+
+    def siguiente_token(self):
+        """Función sin argumentos que da el próximo token (None al final), para parsear_flujo."""
+        return partial(next, self.tokens(), None)
+
+    def tokens(self):
+        """Genera los tokens del archivo, con lexpos, lineno y lexer del archivo completo."""
+        with open(self.ruta, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield from self._tokens(mm)
+
+    def _tokens(self, mm):
+        lexer = self.lexer
+        errores = lexer.listar_errores_lexicos
+        total = len(mm)
+        inicio = 0          # byte donde empieza el trozo
+        base = 0            # carácter (ya con \n) donde empieza el trozo
+        linea = 1
+        previa = 0          # caracteres de la línea que quedaron en el trozo anterior
+        liberado = 0
+
+        while inicio < total:
+            fin = inicio
+            while True:
+                fin = _fin_de_trozo(mm, fin + self.tamano_trozo, total)
+                crudo = mm[inicio:fin].decode("utf-8")
+                texto = crudo.replace("\r\n", "\n").replace("\r", "\n") if "\r" in crudo else crudo
+
+                tabla = TablaLineas(texto, linea=linea)
+                tabla.inicios[0] = -previa     # el trozo puede empezar a mitad de una línea
+                lexer.lineno = linea
+                lexer.input(texto)
+                lexer.tabla_lineas = tabla
+                antes = len(errores)
+                toks = list(iter(lexer.token, None))
+                if fin == total:
+                    corte = len(texto)
+                    break
+                # Una cadena es el único token que puede seguir después del trozo:
+                # si quedó una comilla sin cerrar y el archivo la cierra más
+                # adelante, se lexea de nuevo con la cadena completa adentro
+                comilla = next((offset for _, offset, _ in errores[antes:] if texto[offset] == '"'), None)
+                if comilla is not None:
+                    cierre = mm.find(b'"', inicio + _bytes_hasta(crudo, texto, comilla) + 1)
+                    if cierre >= fin:
+                        del errores[antes:]
+                        fin = cierre
+                        continue
+                # Se corta después del último ';' que el lexer vio como token (no dentro de una cadena)
+                k = len(toks) - 1
+                while k >= 0 and toks[k].type != "PUNTOYCOMA":
+                    k -= 1
+                if k >= 0:
+                    corte = toks[k].lexpos + 1
+                    del toks[k + 1:]
+                    break
+                # Ni una sentencia completa en el trozo: se lexea uno más largo
+                del errores[antes:]
+
+            # Lo que quedó después del corte se vuelve a lexear con el trozo siguiente
+            for _, offset, mensaje in errores[antes:]:
+                if offset < corte:
+                    self.diagnosticos_lexicos.append(Diagnostico("lexico", *tabla.posicion(offset), mensaje))
+            del errores[antes:]
+
+            self.lexdata = self.tabla_lineas.texto = texto
+            self.tabla_lineas.trozos.append((base, tabla))
+            for tok in toks:
+                tok.lexpos += base
+                tok.lexer = self
+                yield tok
+
+            salto = texto.rfind("\n", 0, corte)
+            previa = corte - salto - 1 if salto >= 0 else previa + corte
+            linea += texto.count("\n", 0, corte)
+            base += corte
+            inicio += _bytes_hasta(crudo, texto, corte)
+
+            # Las páginas ya lexeadas no hacen falta: que no cuenten en la memoria del proceso
+            pagina = inicio - inicio % mmap.PAGESIZE
+            if pagina > liberado and hasattr(mmap, "MADV_DONTNEED"):
+                mm.madvise(mmap.MADV_DONTNEED, liberado, pagina - liberado)
+                liberado = pagina
+
+    def sentencias(self, parser, errores):
+        """Genera cada sentencia (con la recuperación de errores de parsear_flujo)
+        apenas se lee su ';'; los errores sintácticos se van agregando a errores."""
+        pendientes = []
+        vacio = True
+        for tok in self.tokens():
+            vacio = False
+            pendientes.append(tok)
+            if tok.type == "PUNTOYCOMA":
+                yield from self._parsear(pendientes, parser, errores)
+                pendientes = []
+        if pendientes or vacio:
+            # Sentencia sin ';' al final, o ni una sentencia: parsear_flujo
+            # reporta el error de siempre
+            yield from self._parsear(pendientes, parser, errores)
+
+    def _parsear(self, pendientes, parser, errores):
+        self.lineno = pendientes[0].lineno if pendientes else 1
+        ast, nuevos = parsear_flujo(partial(next, iter(pendientes), None), self, parser)
+        errores += nuevos
+        return ast.stmts
+
+
+def _fin_de_trozo(mm, desde, total):
+    """Byte justo después del primer ';' desde `desde` (o el final del archivo).
+    ';' es ASCII: cortar ahí nunca parte un carácter UTF-8."""
+    if desde >= total:
+        return total
+    i = mm.find(b";", desde)
+    return total if i < 0 else i + 1
+
+
+def _bytes_hasta(crudo, texto, corte):
+    """Bytes del archivo que ocupan los primeros `corte` caracteres de texto
+    (texto es crudo con los \\r\\n cambiados por \\n)."""
+    n = corte
+    if texto is not crudo:
+        # Cada \r\n del crudo es un carácter menos en texto: se busca el largo
+        # en crudo que, sin sus \r\n, mide corte (con el \n del último par adentro)
+        while True:
+            m = corte + crudo.count("\r\n", 0, n + 1)
+            if m == n:
+                break
+            n = m
+    return n if crudo.isascii() else len(crudo[:n].encode("utf-8"))
@@ -0,0 +1,50 @@
+# generar_tablas.py
+# Regenera las tablas precalculadas del léxico (pqek_lextab.py) y del parser
+# LALR (pqek_parsetab.py). Hay que correrlo cada vez que cambien los tokens o
+# la gramática, y subir los archivos generados junto con el cambio.
+#
+# Uso:
+#   python generar_tablas.py
+
+import importlib
+import os
+import sys
+
+import ply.lex as lex
+import ply.yacc as yacc
+
+DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _borrar(modulo):
+    path = os.path.join(DIR, modulo + ".py")
+    if os.path.exists(path):
+        os.remove(path)
+    sys.modules.pop(modulo, None)
+
+
+def generar():
+    import analizador_lexico
+    import analizador_sintactico
+
+    # Léxico: PLY escribe la tabla en modo optimize cuando no la encuentra
+    _borrar(analizador_lexico.LEXTAB)
+    importlib.invalidate_caches()
+    lex.lex(module=analizador_lexico, optimize=True,
+            lextab=analizador_lexico.LEXTAB, outputdir=DIR)
+    path = os.path.join(DIR, analizador_lexico.LEXTAB + ".py")
+    with open(path, "a") as f:
+        f.write(f"_firma_pqek   = {analizador_lexico.firma_lexico()!r}\n")
+
+    # Parser
+    _borrar(analizador_sintactico.PARSETAB)
+    importlib.invalidate_caches()
+    yacc.yacc(module=analizador_sintactico, tabmodule=analizador_sintactico.PARSETAB,
+              outputdir=DIR, write_tables=True, debug=False)
+
+    print(f"Tablas generadas en {DIR}: "
+          f"{analizador_lexico.LEXTAB}.py, {analizador_sintactico.PARSETAB}.py")
+
+
+if __name__ == "__main__":
+    generar()
@@ -0,0 +1,329 @@
+# incremental.py
+# Front end incremental para el editor: guarda tokens, AST y errores por
+# sentencia (cada segmento va desde el ';' anterior hasta su propio ';') y, en
+# cada edición, vuelve a lexear y parsear solo los segmentos tocados.
+#
+# Las sentencias no anidan, así que el lexer queda sincronizado justo después
+# de cada ';'. Tras una edición se relexea desde el segmento que la contiene
+# hasta que un ';' cae exactamente sobre un borde viejo (corrido por la
+# edición); de ahí en adelante todo se reutiliza. Eso cubre también las
+# comillas: un '"' nuevo puede tragarse varios ';' y el relexeo sigue hasta
+# volver a sincronizar (ver update para el caso de la comilla suelta).
+
+from bisect import bisect_right
+
+from analizador_lexico import nuevo_lexer
+from analizador_sintactico import Program, nuevo_parser, parsear, _TokenFeed
+from analizador_semantico import SemanticAnalyzer
+from diagnosticos import Diagnostico, TablaLineas
+
+# Cada cuántos segmentos se guarda una copia de la tabla de símbolos
+CADA_CHECKPOINT = 512
+
+
+class Segmento:
+    __slots__ = ("tokens", "stmt", "error", "errores_lexicos", "inicio_parseo",
+                 "linea_parseo", "base_parseo", "errores_sem")
+
+    def __init__(self, tokens, stmt, error, errores_lexicos, inicio_parseo, linea_parseo,
+                 base_parseo):
+        self.tokens = tokens                    # posiciones de cuando se lexeó
+        self.stmt = stmt
+        self.error = error                      # Diagnostico sintáctico o None
+        self.errores_lexicos = errores_lexicos  # [(línea relativa, posición relativa, msg)]
+        self.inicio_parseo = inicio_parseo      # dónde empezaba el segmento al parsearlo
+        self.linea_parseo = linea_parseo        # y en qué línea
+        self.base_parseo = base_parseo          # y en qué columna (desde 0) de esa línea
+        self.errores_sem = []
+
+
+def _mover(node, dl, dc, primera):
+    """Corre las líneas en dl y, solo en la primera línea del segmento, las columnas en dc."""
+    pila = [node]
+    while pila:
+        n = pila.pop()
+        if n.lineno is not None:
+            n.lineno += dl
+            if n.lineno == primera:
+                n.col += dc
+        cls = n.__class__.__name__
+        if cls == "Assign":
+            pila.append(n.expr)
+        elif cls == "BinaryOp":
+            pila.append(n.left)
+            pila.append(n.right)
+
+
+class FrontEndIncremental:
+    def __init__(self, text=""):
+        self.lexer = nuevo_lexer()
+        # Parser propio: la GUI arma los documentos grandes en otro hilo
+        self.parser = nuevo_parser()
+        self.version = 0            # sube con cada edición (ver SemanticaPendiente)
+        self.reset(text)
+
+    #   CARGA COMPLETA
+
+    def reset(self, text):
+        self.text = text
+        self.inicios = []
+        self.lineas = []
+        self.segmentos = []
+        self._reemplazar(0, 0, 0, 1)
+        self._invalidar_semantica(0)
+
+    #   EDICIÓN
+
+    def update(self, pos, removed, added_text):
+        """Aplica una edición (como QTextDocument.contentsChange) y devuelve
+        cuántas sentencias se volvieron a parsear."""
+        if pos + removed > len(self.text):
+            self.reset(self.text[:pos] + added_text)
+            return len(self.segmentos)
+
+        fin_viejo = pos + removed
+        delta = len(added_text) - removed
+        i = max(0, bisect_right(self.inicios, pos) - 1)
+
+        # Única excepción a la localidad: una comilla suelta se lexea mirando si
+        # hay otra más adelante. Las comillas se emparejan en orden, así que solo
+        # puede haber una suelta (la última, si son impares); si escribimos otra
+        # comilla después de ella, hay que relexear desde donde está.
+        if '"' in added_text and self.text.count('"') % 2:
+            suelta = self.text.rfind('"')
+            if suelta < pos:
+                i = min(i, bisect_right(self.inicios, suelta) - 1)
+
+        self.text = self.text[:pos] + added_text + self.text[fin_viejo:]
+        # Primer segmento que empieza después de la edición: ahí buscamos sincronizar
+        j = bisect_right(self.inicios, fin_viejo)
+        n = self._reemplazar(i, j, delta, self.lineas[i])
+        self._invalidar_semantica(i)
+        return n
+
+    def _reemplazar(self, i, j, delta, linea):
+        """Relexea desde el inicio del segmento i y reemplaza los segmentos viejos
+        hasta sincronizar con alguno a partir de j (ya corrido en delta)."""
+        lexer = self.lexer
+        lexer.input(self.text)
+        inicio = self.inicios[i] if self.segmentos else 0
+        lexer.lexpos = inicio
+        lexer.lineno = linea
+        errores = lexer.listar_errores_lexicos
+        errores.clear()
+        lexer.errores_Desc.clear()
+
+        nuevos_inicios, nuevas_lineas, nuevos = [], [], []
+        k = j
+        total = len(self.segmentos)
+        pendientes = []
+        seg_inicio, seg_linea, n_err = inicio, linea, 0
+
+        for tok in iter(lexer.token, None):
+            pendientes.append(tok)
+            if tok.type != "PUNTOYCOMA":
+                continue
+            nuevos_inicios.append(seg_inicio)
+            nuevas_lineas.append(seg_linea)
+            nuevos.append(self._segmento(pendientes, seg_inicio, seg_linea, errores[n_err:]))
+            pendientes = []
+            seg_inicio, seg_linea, n_err = tok.lexpos + 1, lexer.lineno, len(errores)
+
+            while k < total and self.inicios[k] + delta < seg_inicio:
+                k += 1
+            if k < total and self.inicios[k] + delta == seg_inicio:
+                # Sincronizados: el resto se reutiliza, corrido en posición y línea
+                dl = seg_linea - self.lineas[k]
+                self.inicios[i:] = nuevos_inicios + [x + delta for x in self.inicios[k:]]
+                self.lineas[i:] = nuevas_lineas + [x + dl for x in self.lineas[k:]]
+                self.segmentos[i:k] = nuevos
+                # Los reutilizados que siguen en el renglón de la edición pueden
+                # haber cambiado de columna aunque su inicio no se haya movido
+                m = i + len(nuevos)
+                while m < len(self.segmentos) and self.lineas[m] == seg_linea:
+                    self.segmentos[m].inicio_parseo = -1
+                    m += 1
+                return len(nuevos)
+
+        # Llegamos al final: el último segmento es lo que quede sin ';'
+        nuevos_inicios.append(seg_inicio)
+        nuevas_lineas.append(seg_linea)
+        nuevos.append(self._segmento(pendientes, seg_inicio, seg_linea, errores[n_err:]))
+        self.inicios[i:] = nuevos_inicios
+        self.lineas[i:] = nuevas_lineas
+        self.segmentos[i:] = nuevos
+        return len(nuevos)
+
+    def _segmento(self, tokens, inicio, linea, errores_lexicos):
+        relativos = [(l + 1 - linea, col - inicio, msg) for (l, col, msg) in errores_lexicos]
+        stmt = error = None
+        if tokens:
+            # Tabla de líneas solo del pedazo del segmento, no de todo el texto
+            fin = tokens[-1].lexpos + len(tokens[-1].value)
+            tabla = TablaLineas(self.text, inicio, fin, linea)
+            ast, errores = parsear(self.text, _TokenFeed(tokens, self.text, tabla), self.parser)
+            if ast.stmts:
+                stmt = ast.stmts[0]
+            if errores:
+                error = errores[0]
+        return Segmento(tokens, stmt, error, relativos, inicio, linea, self._base(inicio))
+
+    def _base(self, inicio):
+        return inicio - (self.text.rfind("\n", 0, inicio) + 1)
+
+    def _al_dia(self, idx):
+        """Pone al día un segmento que otra edición corrió de lugar."""
+        seg = self.segmentos[idx]
+        inicio, linea = self.inicios[idx], self.lineas[idx]
+        if seg.error is not None or seg.errores_lexicos:
+            if inicio == seg.inicio_parseo and linea == seg.linea_parseo:
+                return seg
+            # Los mensajes traen la línea y la posición escritas: se relexea el segmento
+            fin = self.inicios[idx + 1] if idx + 1 < len(self.inicios) else len(self.text)
+            lexer = self.lexer
+            lexer.input(self.text)
+            lexer.lexpos, lexer.lexlen, lexer.lineno = inicio, fin, linea
+            lexer.listar_errores_lexicos.clear()
+            tokens = list(iter(lexer.token, None))
+            seg = self.segmentos[idx] = self._segmento(
+                tokens, inicio, linea, list(lexer.listar_errores_lexicos))
+            return seg
+
+        if inicio == seg.inicio_parseo and linea == seg.linea_parseo:
+            return seg
+        # Lo que esté en la primera línea del segmento comparte renglón con el
+        # texto de antes, así que su columna también pudo cambiar
+        base = self._base(inicio)
+        if seg.stmt is not None:
+            _mover(seg.stmt, linea - seg.linea_parseo, base - seg.base_parseo, linea)
+        seg.inicio_parseo, seg.linea_parseo, seg.base_parseo = inicio, linea, base
+        return seg
+
+    #   RESULTADOS
+
+    def tokens(self):
+        for seg in self.segmentos:
+            yield from seg.tokens
+
+    def program(self):
+        stmts = []
+        for idx in range(len(self.segmentos)):
+            seg = self._al_dia(idx)
+            if seg.stmt is not None:
+                stmts.append(seg.stmt)
+        return Program(stmts)
+
+    def errores_sintacticos(self):
+        """[Diagnostico] de las sentencias que no parsearon, igual que parsear."""
+        errores = []
+        for idx, seg in enumerate(self.segmentos):
+            if seg.error is not None:
+                seg = self._al_dia(idx)
+                errores.append(seg.error)
+        return errores
+
+    def errores_lexicos(self):
+        """Igual que listar_errores_lexicos: [(línea desde 0, posición, mensaje)]."""
+        errores = []
+        for idx, seg in enumerate(self.segmentos):
+            if seg.errores_lexicos:
+                seg = self._al_dia(idx)
+            for (l, col, msg) in seg.errores_lexicos:
+                errores.append((self.lineas[idx] + l - 1, self.inicios[idx] + col, msg))
+        return errores
+
+    def diagnosticos(self):
+        """Errores léxicos y sintácticos como Diagnostico, en orden de posición."""
+        diags = []
+        for idx, seg in enumerate(self.segmentos):
+            if seg.error is None and not seg.errores_lexicos:
+                continue
+            seg = self._al_dia(idx)
+            if seg.errores_lexicos:
+                inicio = self.inicios[idx]
+                fin = self.inicios[idx + 1] if idx + 1 < len(self.inicios) else len(self.text)
+                tabla = TablaLineas(self.text, inicio, fin, self.lineas[idx])
+                for (_, col, msg) in seg.errores_lexicos:
+                    diags.append(Diagnostico("lexico", *tabla.posicion(inicio + col), msg))
+            if seg.error is not None:
+                diags.append(seg.error)
+        diags.sort(key=lambda d: (d.linea, d.columna))
+        return diags
+
+    #   ANÁLISIS SEMÁNTICO CON CHECKPOINTS
+
+    def _invalidar_semantica(self, idx):
+        self.version += 1
+        if idx == 0:
+            self._checkpoints = {0: ({}, {})}
+            self._sem_hasta = 0
+            return
+        self._checkpoints = {c: s for c, s in self._checkpoints.items() if c <= idx}
+        self._sem_hasta = min(self._sem_hasta, idx)
+
+    def analyze(self):
+        """SemanticAnalyzer con la tabla de símbolos al día. Solo se vuelven a
+        visitar las sentencias desde el último checkpoint antes del primer
+        segmento modificado; la tabla de ahí para atrás se reutiliza."""
+        pendiente = self.semantica_pendiente()
+        sem = pendiente.analizar()
+        self.guardar_semantica(pendiente)
+        return sem
+
+    def semantica_pendiente(self):
+        """Lo que analyze tiene que visitar, separado del front end para que
+        pueda correr en otro hilo mientras el editor sigue recibiendo ediciones."""
+        desde = max(c for c in self._checkpoints if c <= self._sem_hasta)
+        stmts = [self._al_dia(idx).stmt for idx in range(desde, len(self.segmentos))]
+        anteriores = [d for seg in self.segmentos[:desde] for d in seg.errores_sem]
+        return SemanticaPendiente(self.version, desde, self._checkpoints[desde], stmts, anteriores)
+
+    def guardar_semantica(self, pendiente):
+        """Se queda con los checkpoints y errores de pendiente.analizar(), si
+        el texto no cambió desde semantica_pendiente (si cambió, se descartan)."""
+        if pendiente.version != self.version:
+            return
+        self._checkpoints.update(pendiente.checkpoints)
+        for seg, errores in zip(self.segmentos[pendiente.desde:], pendiente.errores_sem):
+            seg.errores_sem = errores
+        self._sem_hasta = len(self.segmentos)
+
+
+class SemanticaPendiente:
+    """Sentencias de un FrontEndIncremental desde un checkpoint, con la tabla
+    de símbolos de ese punto. analizar no toca el front end: los checkpoints
+    nuevos y los errores por segmento quedan acá para guardar_semantica."""
+
+    def __init__(self, version, desde, checkpoint, stmts, anteriores):
+        self.version = version
+        self.desde = desde
+        self.checkpoint = checkpoint    # (símbolos, slots) antes de la sentencia desde
+        self.stmts = stmts              # stmt (o None) de cada segmento desde ahí
+        self.anteriores = anteriores    # errores semánticos de los segmentos de antes
+        self.checkpoints = {}
+        self.errores_sem = []
+
+    def analizar(self, paso=None):
+        """SemanticAnalyzer como el de analyze; paso(hechas, total), si se da,
+        se llama antes de cada sentencia."""
+        sem = SemanticAnalyzer()
+        simbolos, slots = self.checkpoint
+        sem.symbols = {k: dict(v) for k, v in simbolos.items()}
+        sem.slots = dict(slots)
+
+        total = len(self.stmts)
+        for i, stmt in enumerate(self.stmts):
+            idx = self.desde + i
+            if paso is not None:
+                paso(i, total)
+            if idx % CADA_CHECKPOINT == 0 and idx != self.desde:
+                self.checkpoints[idx] = ({k: dict(v) for k, v in sem.symbols.items()}, dict(sem.slots))
+            sem.errors = []
+            sem.diagnosticos = errores = []
+            self.errores_sem.append(errores)
+            if stmt is not None:
+                sem.visit(stmt)
+
+        sem.diagnosticos = self.anteriores + [d for errores in self.errores_sem for d in errores]
+        sem.errors = [d.mensaje for d in sem.diagnosticos]
+        return sem
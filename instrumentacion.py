@@ -0,0 +1,121 @@
+# instrumentacion.py
+# Mediciones por fase (léxico, sintáctico, semántico, optimización, ejecución):
+# tiempo de pared, contadores (tokens, nodos del AST, símbolos, sentencias
+# ejecutadas) y, si se pide, un perfil de cProfile de cada fase.
+#
+#   med = Medicion(perfilar=True)
+#   with med.fase("semantico") as datos:
+#       sem.analyze(ast)
+#       datos["simbolos"] = len(sem.symbols)
+#   med.a_dict()      # para el JSON de compilador_cli
+#   med.resumen()     # para el panel de la GUI
+#
+# Con la medición apagada se usa SIN_MEDICION, que no mide nada: cuesta una
+# llamada por fase, nunca una por token ni por sentencia. Los contadores que
+# hay que calcular aparte (tokens, nodos) solo se calculan si med.activa.
+
+import cProfile
+import io
+import pstats
+import time
+from contextlib import contextmanager
+
+# Funciones que se muestran del perfil de cada fase
+LINEAS_PERFIL = 15
+
+
+class Medicion:
+    activa = True
+
+    def __init__(self, perfilar=False):
+        self.perfilar = perfilar
+        self.fases = {}       # nombre → {"segundos": s, contador: n, ...}, en orden de ejecución
+        self._perfiles = {}   # nombre → cProfile.Profile
+
+    @contextmanager
+    def fase(self, nombre):
+        """Mide lo que corre adentro; entrega el dict de la fase para anotar contadores.
+        Si la misma fase se mide varias veces, los tiempos se suman."""
+        datos = self.fases.setdefault(nombre, {"segundos": 0.0})
+        perfil = None
+        if self.perfilar:
+            # cProfile solo mira el hilo que lo habilita: hay que medir desde el hilo que trabaja
+            perfil = self._perfiles.setdefault(nombre, cProfile.Profile())
+            perfil.enable()
+        inicio = time.perf_counter()
+        try:
+            yield datos
+        finally:
+            datos["segundos"] += time.perf_counter() - inicio
+            if perfil is not None:
+                perfil.disable()
+
+    def perfil(self, nombre, lineas=LINEAS_PERFIL):
+        """Las funciones que más tiempo acumularon en la fase, como texto de pstats."""
+        perfil = self._perfiles.get(nombre)
+        if perfil is None:
+            return ""
+        texto = io.StringIO()
+        pstats.Stats(perfil, stream=texto).sort_stats("cumulative").print_stats(lineas)
+        return texto.getvalue()
+
+    def total(self):
+        return sum(datos["segundos"] for datos in self.fases.values())
+
+    def a_dict(self):
+        d = {
+            "fases": {
+                nombre: {"ms": round(datos["segundos"] * 1000, 3),
+                         **{k: v for k, v in datos.items() if k != "segundos"}}
+                for nombre, datos in self.fases.items()
+            },
+            "total_ms": round(self.total() * 1000, 3),
+        }
+        if self._perfiles:
+            d["perfil"] = {nombre: self.perfil(nombre) for nombre in self._perfiles}
+        return d
+
+    def resumen(self):
+        """Una línea por fase: tiempo, porcentaje del total y contadores."""
+        total = self.total() or 1.0
+        lineas = []
+        for nombre, datos in self.fases.items():
+            contadores = "  ".join(f"{k}={v}" for k, v in datos.items() if k != "segundos")
+            lineas.append(f"{nombre:<12} {datos['segundos'] * 1000:10.1f} ms "
+                          f"{datos['segundos'] / total:6.1%}   {contadores}")
+        lineas.append(f"{'total':<12} {self.total() * 1000:10.1f} ms")
+        return "\n".join(lineas)
+
+
+class _FaseNula:
+    def __enter__(self):
+        return {}
+
+    def __exit__(self, *exc):
+        return False
+
+
+_FASE_NULA = _FaseNula()
+
+
+class _SinMedicion:
+    """Medicion que no mide: se usa cuando la instrumentación está apagada."""
+
+    activa = False
+    perfilar = False
+    fases = {}
+
+    def fase(self, nombre):
+        return _FASE_NULA
+
+    def perfil(self, nombre, lineas=LINEAS_PERFIL):
+        return ""
+
+    def a_dict(self):
+        return {}
+
+    def resumen(self):
+        return ""
+
+
+SIN_MEDICION = _SinMedicion()
@@ -1,8 +1,12 @@
 import sys
 import os
+import queue
+import threading
+import time
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
+    QMessageBox,
     QWidget,
     QTextEdit,
     QPushButton,
@@ -11,27 +15,31 @@ from PyQt5.QtWidgets import (
     QFileDialog,
     QLabel,
     QSplitter,
-    QLineEdit
+    QLineEdit,
+    QProgressBar,
+    QCheckBox
 )
 from PyQt5.QtGui import QColor, QTextCharFormat, QTextCursor, QFont, QSyntaxHighlighter
-from PyQt5.QtCore import Qt, QRegExp
+from PyQt5.QtCore import Qt, QRegExp, QEventLoop, QObject, QThread, pyqtSignal
 
-from analizador_lexico import lexer
-from analizador_sintactico import build_parser
-from analizador_semantico import SemanticAnalyzer
+from cache_compilacion import CompileCache
+from compilador_bytecode import compile_program
 from interprete import Interpreter as BaseInterpreter
-
-parser = build_parser()
+from incremental import FrontEndIncremental
+from instrumentacion import Medicion, SIN_MEDICION
+from optimizador import contar_nodos
+from salida import BatchedSink, agrupar
 
 
 
 # CLASE PARA RESALTADO DE SINTAXIS PQEK
+# (no confundir con el PQEKHighlighter de CompilerGUI, más abajo, que solo marca errores)
 
-class PQEKHighlighter(QSyntaxHighlighter):
+class PQEKSyntaxHighlighter(QSyntaxHighlighter):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.rules = []
-        self.error_ranges = []
+        self.error_ranges = {}  # número de bloque → [(inicio, fin)]
 
         keywords = [
             "Entero", "Texto", "Real", "Captura", "Mensaje",
@@ -57,16 +65,23 @@ class PQEKHighlighter(QSyntaxHighlighter):
         function_format.setForeground(QColor("#8be9fd"))
         function_format.setFontItalic(True)
 
-        for word in keywords:
-            self.rules.append((QRegExp(r"\b" + word + r"\b"), keyword_format))
-        self.rules.append((QRegExp(r"\".*\""), string_format))
-        self.rules.append((QRegExp(r"\b\d+(\.\d+)?\b"), number_format))
-        self.rules.append((QRegExp(r"//[^\n]*"), comment_format))
-        self.rules.append((QRegExp(r"\b[A-Za-z_]+\.[A-Za-z_]+\b"), function_format))
+        # Patrones compilados una sola vez; las palabras clave van en una sola
+        # alternación. El primer campo es un texto que la línea tiene que tener
+        # para que valga la pena buscar el patrón (None = buscar siempre).
+        self.rules.append((None, QRegExp(r"\b(?:" + "|".join(keywords) + r")\b"), keyword_format))
+        self.rules.append(('"', QRegExp(r"\".*\""), string_format))
+        self.rules.append((None, QRegExp(r"\b\d+(\.\d+)?\b"), number_format))
+        self.rules.append(("//", QRegExp(r"//[^\n]*"), comment_format))
+        self.rules.append((".", QRegExp(r"\b[A-Za-z_]+\.[A-Za-z_]+\b"), function_format))
+
+        self.error_format = QTextCharFormat()
+        self.error_format.setUnderlineColor(QColor("#ff5555"))
+        self.error_format.setUnderlineStyle(QTextCharFormat.SpellCheckUnderline)
 
     def highlightBlock(self, text):
-        for pattern, fmt in self.rules:
-            expression = QRegExp(pattern)
+        for requisito, expression, fmt in self.rules:
+            if requisito is not None and requisito not in text:
+                continue
             index = expression.indexIn(text)
             while index >= 0:
                 length = expression.matchedLength()
@@ -74,22 +89,40 @@ class PQEKHighlighter(QSyntaxHighlighter):
                 index = expression.indexIn(text, index + length)
 
         # Resaltar errores
-        for (line, start, end) in self.error_ranges:
-            if self.currentBlock().blockNumber() == line:
-                error_format = QTextCharFormat()
-                error_format.setUnderlineColor(QColor("#ff5555"))
-                error_format.setUnderlineStyle(QTextCharFormat.SpellCheckUnderline)
-                self.setFormat(start, end - start, error_format)
+        rangos = self.error_ranges.get(self.currentBlock().blockNumber())
+        if rangos:
+            for (start, end) in rangos:
+                self.setFormat(start, end - start, self.error_format)
 
     def clear_errors(self):
+        lineas = list(self.error_ranges)
         self.error_ranges.clear()
-        self.rehighlight()
+        for line in lineas:
+            self._rehighlight_line(line)
 
     def add_error(self, line, start=0, end=None):
         if end is None:
             end = start + 3
-        self.error_ranges.append((line, start, end))
-        self.rehighlight()
+        self.error_ranges.setdefault(line, []).append((start, end))
+        self._rehighlight_line(line)
+
+    def _rehighlight_line(self, line):
+        """Repinta solo el bloque de esa línea, no todo el documento."""
+        block = self.document().findBlockByNumber(line)
+        if block.isValid():
+            self.rehighlightBlock(block)
+
+
+def _esperar_enter(gui):
+    """Suspende hasta que _handle_input marque input_ready, sin busy-wait."""
+    gui.input_ready = False
+    gui.input_line.setFocus()
+    espera = QEventLoop()
+    gui.input_line.returnPressed.connect(espera.quit)
+    while not gui.input_ready:
+        espera.exec_()
+    gui.input_line.returnPressed.disconnect(espera.quit)
+    return gui.input_value
 
 
 # INTERPRETE ADAPTADO A GUI CON RESALTADO DE ERRORES
@@ -109,12 +142,7 @@ class Interpreter(BaseInterpreter):
         self.gui.output_area.setTextCursor(cursor)
 
         # Esperar input
-        self.gui.input_ready = False
-        self.gui.input_line.setFocus()
-        while not self.gui.input_ready:
-            QApplication.processEvents()
-
-        value = self.gui.input_value
+        value = _esperar_enter(self.gui)
 
         # Mostrar lo ingresado
         cursor = self.gui.output_area.textCursor()
@@ -133,6 +161,184 @@ class Interpreter(BaseInterpreter):
 
 
 
+# COMPILACIÓN EN SEGUNDO PLANO
+# El análisis semántico y la ejecución corren en un QThread; el worker no toca
+# widgets: la salida, el progreso y los pedidos de Captura viajan por señales.
+# El semántico es el del front end incremental: el worker recibe las sentencias
+# desde el último checkpoint antes de lo editado (SemanticaPendiente) y la GUI
+# guarda los checkpoints nuevos cuando el worker termina de analizarlas.
+
+class EjecucionCancelada(BaseException):
+    """Como KeyboardInterrupt: hereda de BaseException para que el
+    except Exception de Interpreter.run no la tome por un error de la sentencia."""
+
+
+class WorkerInterpreter(BaseInterpreter):
+    def __init__(self, worker):
+        super().__init__(gui=None, sink=worker.salida)
+        self.worker = worker
+
+    def _avisar_error(self, msg):
+        if not self.worker.cancelado.is_set():
+            self.worker.flush()
+            self.worker.error_ejecucion.emit(msg)
+
+    def _anunciar_captura(self, tipo):
+        self.log(f"Ingresa un valor de tipo {tipo} y presiona Enter:", info=True)
+
+
+
+class CompileWorker(QObject):
+    mensajes = pyqtSignal(list)             # [(texto, tipo)]
+    progreso = pyqtSignal(str, int, int)    # fase, sentencias hechas, total
+    pedir_entrada = pyqtSignal()
+    error_ejecucion = pyqtSignal(str)
+    diagnosticos = pyqtSignal(list)         # [Diagnostico] del semántico o de la ejecución
+    semantica = pyqtSignal(object)          # la SemanticaPendiente ya analizada
+    medicion = pyqtSignal(object)           # la Medicion de la corrida, al terminar
+    terminado = pyqtSignal()
+
+    # La salida se manda en tandas para no inundar el hilo de la GUI
+    INTERVALO = 0.05
+
+    def __init__(self, ast, pendiente, code="", cache=None, ejecutar=True, medicion=SIN_MEDICION):
+        super().__init__()
+        self.ast = ast
+        self.pendiente = pendiente  # SemanticaPendiente del front end incremental
+        self.code = code
+        self.cache = cache
+        self.ejecutar = ejecutar    # False: solo el semántico (el código tiene errores de léxico o sintaxis)
+        self.med = medicion
+        self.cancelado = threading.Event()
+        self.entradas = queue.Queue()
+        self.salida = BatchedSink(self.mensajes.emit, self.INTERVALO)
+        self._avance = None
+        self._ultimo = time.monotonic()
+        self._esperado = 0.0    # segundos esperando entradas de Captura
+
+    def cancelar(self):
+        """Se puede llamar desde cualquier hilo; despierta también a una Captura en espera."""
+        self.cancelado.set()
+        self.entradas.put(None)
+
+    def run(self):
+        stmts = self.ast.stmts
+        total = len(stmts)
+        med = self.med
+        try:
+            # Un programa que ya pasó el semántico está en la caché: se salta
+            entrada = None
+            if self.cache is not None and self.ejecutar:
+                with med.fase("cache"):
+                    clave = self.cache.clave(self.code)
+                    entrada = self.cache.get(clave)
+            if entrada is None:
+                with med.fase("semantico") as datos:
+                    sem = self.pendiente.analizar(
+                        lambda hechas, total: self._paso("Análisis semántico", hechas, total))
+                datos["simbolos"] = len(sem.symbols)
+                self.semantica.emit(self.pendiente)
+                if sem.diagnosticos:
+                    self.diagnosticos.emit(sem.diagnosticos)
+                sem.check()
+                self.emitir("Análisis semántico completado.\n", "success")
+                if not self.ejecutar:
+                    return
+                if self.cache is not None:
+                    # Misma entrada que guarda compilador_cli --sin-optimizar
+                    with med.fase("cache"):
+                        self.cache.put(clave, {
+                            "bytecode": compile_program(self.ast),
+                            "simbolos": sem.symbols,
+                            "nodos_eliminados": 0,
+                        })
+            else:
+                self.emitir("Análisis semántico completado (ya estaba en caché).\n", "success")
+
+            interpreter = WorkerInterpreter(self)
+            self.emitir("Ejecutando programa...\n", "info")
+            with med.fase("ejecucion") as datos:
+                ejecutadas = 0
+                try:
+                    for stmt in stmts:
+                        self._paso("Ejecución", ejecutadas, total)
+                        # Cada Captura suspende el generador hasta que llegue la entrada
+                        pasos = interpreter.ejecutar(stmt)
+                        valor = None
+                        while True:
+                            try:
+                                pasos.send(valor)
+                            except StopIteration:
+                                break
+                            valor = self.esperar_entrada()
+                        ejecutadas += 1
+                finally:
+                    datos["sentencias"] = ejecutadas
+                    if self._esperado:
+                        # El tiempo de la fase incluye lo que se esperó al usuario
+                        datos["espera_entrada_ms"] = round(self._esperado * 1000, 1)
+            if interpreter.diagnosticos:
+                self.diagnosticos.emit(interpreter.diagnosticos)
+            self.emitir(" Ejecución finalizada con éxito.\n", "success")
+
+        except EjecucionCancelada:
+            self.emitir(" Ejecución cancelada.\n", "error")
+        except Exception as e:
+            self.emitir(f"Error: {str(e)}\n", "error")
+        finally:
+            self.flush()
+            if med.activa:
+                self.medicion.emit(med)
+            self.terminado.emit()
+
+    def _paso(self, fase, hechas, total):
+        if self.cancelado.is_set():
+            raise EjecucionCancelada()
+        self._avance = (fase, hechas, total)
+        if time.monotonic() - self._ultimo >= self.INTERVALO:
+            self.flush()
+
+    def emitir(self, texto, tipo):
+        self.salida.write(texto, tipo)
+
+    def flush(self):
+        self.salida.flush()
+        if self._avance is not None:
+            self.progreso.emit(*self._avance)
+        self._ultimo = time.monotonic()
+
+    def esperar_entrada(self):
+        self.flush()
+        self.pedir_entrada.emit()
+        inicio = time.perf_counter()
+        value = self.entradas.get()
+        self._esperado += time.perf_counter() - inicio
+        if value is None:
+            raise EjecucionCancelada()
+        return value
+
+
+
+# CARGA DE DOCUMENTOS ENTEROS
+# Abrir un archivo (o setText) reemplaza todo el documento: en vez de pasar el
+# texto entero por la edición incremental en el hilo de la GUI, el front end
+# del documento nuevo se arma de una vez en otro hilo.
+
+# Desde cuántos caracteres un documento nuevo se carga en segundo plano
+CARGA_EN_FONDO = 1 << 16
+
+
+class CargaFrontEnd(QThread):
+    def __init__(self, texto):
+        super().__init__()
+        self.texto = texto
+        self.frontend = None
+
+    def run(self):
+        self.frontend = FrontEndIncremental(self.texto)
+
+
+
 #  APLICACIÓN PRINCIPAL PQEK
 
 class PQEKCompilerApp(QMainWindow):
@@ -148,7 +354,15 @@ class PQEKCompilerApp(QMainWindow):
         self.code_area = QTextEdit()
         self.code_area.setFont(font)
         self.code_area.setStyleSheet("background-color: #282a36; color: #f8f8f2;")
-        self.highlighter = PQEKHighlighter(self.code_area.document())
+        self.highlighter = PQEKSyntaxHighlighter(self.code_area.document())
+
+        # Front end incremental: cada edición relexea/reparsea solo sus sentencias
+        self.frontend = FrontEndIncremental()
+        self._carga = None          # CargaFrontEnd del documento actual, mientras se arma
+        self._cargas = set()        # todas las que siguen corriendo (ver closeEvent)
+        self._pendientes = []       # ediciones hechas durante la carga
+        self._frontend_analizado = None
+        self.code_area.document().contentsChange.connect(self._on_contents_change)
 
         # ---------- Output ----------
         self.output_area = QTextEdit()
@@ -164,14 +378,45 @@ class PQEKCompilerApp(QMainWindow):
         self.input_ready = False
         self.input_value = ""
 
+        # ---------- Worker de compilación ----------
+        try:
+            self.cache = CompileCache()
+        except OSError:
+            self.cache = None   # sin directorio de caché se compila todo cada vez
+        self.worker = None
+        self.worker_thread = None
+        self.esperando_entrada = False
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFont(QFont("Consolas", 10))
+        self.progress_bar.setStyleSheet("color: #f8f8f2;")
+        self.progress_bar.hide()
+
+        # ---------- Estadísticas por fase ----------
+        self.stats_area = QTextEdit()
+        self.stats_area.setFont(QFont("Consolas", 10))
+        self.stats_area.setReadOnly(True)
+        self.stats_area.setStyleSheet("background-color: #11111b; color: #8be9fd;")
+        self.stats_area.hide()
+        self.medir_check = QCheckBox("Medir fases")
+        self.perfil_check = QCheckBox("Perfil (cProfile)")
+        for check in (self.medir_check, self.perfil_check):
+            check.setFont(QFont("Consolas", 10))
+            check.setStyleSheet("color: #f8f8f2;")
+        # Sin medir no hay panel que mostrar
+        self.medir_check.toggled.connect(self.perfil_check.setEnabled)
+        self.medir_check.toggled.connect(lambda activo: activo or self.stats_area.hide())
+        self.perfil_check.setEnabled(False)
+
         # ---------- Botones ----------
         self.open_btn = QPushButton(" Abrir .pqek")
         self.save_btn = QPushButton(" Guardar")
         self.compile_btn = QPushButton(" Compilar")
         self.clear_btn = QPushButton(" Limpiar")
+        self.cancel_btn = QPushButton(" Cancelar")
+        self.cancel_btn.setEnabled(False)
 
         button_layout = QHBoxLayout()
-        for btn in [self.open_btn, self.save_btn, self.compile_btn, self.clear_btn]:
+        for btn in [self.open_btn, self.save_btn, self.compile_btn, self.cancel_btn, self.clear_btn]:
             btn.setFont(QFont("Consolas", 11, QFont.Bold))
             btn.setStyleSheet("""
                 QPushButton {
@@ -184,10 +429,13 @@ class PQEKCompilerApp(QMainWindow):
                 }
             """)
             button_layout.addWidget(btn)
+        button_layout.addWidget(self.medir_check)
+        button_layout.addWidget(self.perfil_check)
 
         self.open_btn.clicked.connect(self.open_file)
         self.save_btn.clicked.connect(self.save_file)
         self.compile_btn.clicked.connect(self.compile_code)
+        self.cancel_btn.clicked.connect(self.cancel_compile)
         self.clear_btn.clicked.connect(self.clear_output)
 
         # ---------- Título ----------
@@ -203,8 +451,10 @@ class PQEKCompilerApp(QMainWindow):
         code_output_layout.addWidget(self.code_area)
         code_output_layout.addWidget(self.output_area)
         code_output_layout.addWidget(self.input_line)
+        code_output_layout.addWidget(self.progress_bar)
         code_output_widget.setLayout(code_output_layout)
         splitter.addWidget(code_output_widget)
+        splitter.addWidget(self.stats_area)
         splitter.setSizes([400, 200])
 
         # ---------- Layout principal ----------
@@ -242,9 +492,61 @@ class PQEKCompilerApp(QMainWindow):
 
     # Compilar y ejecutar con resaltado de errores
 
+    def _on_contents_change(self, pos, removed, added):
+        doc = self.code_area.document()
+        fin = min(pos + added, doc.characterCount() - 1)
+        cursor = QTextCursor(doc)
+        cursor.setPosition(pos)
+        cursor.setPosition(fin, QTextCursor.KeepAnchor)
+        texto = cursor.selectedText().replace("\u2029", "\n").replace("\u2028", "\n")
+        if pos == 0 and len(texto) == doc.characterCount() - 1 and len(texto) >= CARGA_EN_FONDO:
+            # Lo agregado es el documento entero: se arma en otro hilo
+            self._cargar(texto)
+            return
+        if self._carga is not None:
+            self._pendientes.append((pos, removed, texto))
+            return
+        self.frontend.update(pos, removed, texto)
+        self._cuadrar_frontend()
+
+    def _cuadrar_frontend(self):
+        # Qt cuenta de más al reemplazar el documento entero (y cuenta en UTF-16):
+        # si las longitudes no cuadran se vuelve a cargar todo
+        if len(self.frontend.text) != self.code_area.document().characterCount() - 1:
+            self.frontend.reset(self.code_area.toPlainText())
+
+    def _cargar(self, texto):
+        # Una carga anterior que no terminó queda descartada (sigue hasta el final)
+        self._pendientes = []
+        self._carga = CargaFrontEnd(texto)
+        self._cargas.add(self._carga)
+        self._carga.finished.connect(self._on_carga_terminada)
+        self._carga.start()
+
+    def _on_carga_terminada(self):
+        carga = self.sender()
+        if carga is self._carga:
+            self._usar_carga()
+        self._cargas.discard(carga)
+        carga.deleteLater()
+
+    def _usar_carga(self):
+        """Toma el front end ya armado y le aplica las ediciones que llegaron mientras tanto."""
+        self.frontend = self._carga.frontend
+        self._carga = None
+        for edicion in self._pendientes:
+            self.frontend.update(*edicion)
+        self._pendientes = []
+        self._cuadrar_frontend()
+
     def compile_code(self):
-        code = self.code_area.toPlainText().strip()
-        if not code:
+        if self.worker is not None:
+            return
+        if self._carga is not None:
+            # El documento recién abierto todavía se está armando: hay que esperarlo
+            self._carga.wait()
+            self._usar_carga()
+        if not self.frontend.text.strip():
             self.print_message(" El código está vacío.", "error")
             return
 
@@ -252,36 +554,131 @@ class PQEKCompilerApp(QMainWindow):
         self.highlighter.clear_errors()
         self.print_message("Compilando código PQEK...\n", "info")
 
-        try:
-            ast = parser.parse(code, lexer=lexer)
+        if self.medir_check.isChecked():
+            med = Medicion(self.perfil_check.isChecked())
+        else:
+            med = SIN_MEDICION
+
+        # Todos los errores léxicos y de sintaxis de una vez, con su posición; el
+        # semántico revisa igual las sentencias válidas, pero así no se ejecuta nada.
+        # El front end es incremental: aquí solo se pone al día lo que se editó
+        with med.fase("sintactico") as datos:
+            ast = self.frontend.program()
+            diagnosticos = self.frontend.diagnosticos()
+        if med.activa:
+            datos["tokens"] = sum(len(seg.tokens) for seg in self.frontend.segmentos)
+            datos["sentencias"] = len(ast.stmts)
+            datos["nodos"] = contar_nodos(ast)
+        # El semántico también es incremental: el worker retoma la tabla de
+        # símbolos desde el último checkpoint antes de lo editado
+        pendiente = self.frontend.semantica_pendiente()
+        self._frontend_analizado = self.frontend
+        for d in diagnosticos:
+            self.print_message(f"Error: {d.mensaje}\n", "error")
+        self._marcar_diagnosticos(diagnosticos)
+        errores = sum(d.fase == "sintactico" for d in diagnosticos)
+        lexicos = len(diagnosticos) - errores
+        if errores:
+            self.print_message(
+                f" {errores} errores de sintaxis: se revisa la semántica del resto, sin ejecutar.\n",
+                "error")
+        else:
             self.print_message(" AST generado correctamente.\n", "success")
+            if lexicos:
+                # Como en compilador_cli: con errores léxicos tampoco se ejecuta
+                # (ni se guarda en la caché, que el CLI usaría sin lexear)
+                self.print_message(
+                    f" {lexicos} errores léxicos: se revisa la semántica, sin ejecutar.\n", "error")
+        # Los errores semánticos y la ejecución siguen en el worker
+        self._start_worker(ast, pendiente, self.frontend.text, ejecutar=not diagnosticos, medicion=med)
+
+    def _guardar_semantica(self, pendiente):
+        # Si mientras tanto se abrió otro documento, sus checkpoints no sirven
+        if self.frontend is self._frontend_analizado:
+            self.frontend.guardar_semantica(pendiente)
+
+    def _marcar_diagnosticos(self, diagnosticos):
+        """Subraya en el editor el rango exacto de cada Diagnostico."""
+        for d in diagnosticos:
+            if d.linea is not None:
+                self.highlighter.add_error(d.linea - 1, d.columna - 1, d.columna - 1 + d.largo)
+
+    def _start_worker(self, ast, pendiente, code, ejecutar=True, medicion=SIN_MEDICION):
+        self.worker = CompileWorker(ast, pendiente, code, self.cache, ejecutar, medicion)
+        self.worker_thread = QThread()
+        self.worker.moveToThread(self.worker_thread)
+
+        self.worker_thread.started.connect(self.worker.run)
+        self.worker.mensajes.connect(self._on_worker_messages)
+        self.worker.progreso.connect(self._on_worker_progress)
+        self.worker.pedir_entrada.connect(self._on_input_requested)
+        # Bloqueante: el worker espera a que cierren el cuadro, igual que antes
+        self.worker.error_ejecucion.connect(self._on_runtime_error, Qt.BlockingQueuedConnection)
+        self.worker.diagnosticos.connect(self._marcar_diagnosticos)
+        self.worker.semantica.connect(self._guardar_semantica)
+        self.worker.medicion.connect(self._mostrar_medicion)
+        self.worker.terminado.connect(self.worker_thread.quit)
+        self.worker_thread.finished.connect(self._on_worker_finished)
+
+        self.compile_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.progress_bar.setValue(0)
+        self.progress_bar.show()
+        self.worker_thread.start()
+
+    def cancel_compile(self):
+        if self.worker is not None:
+            self.worker.cancelar()
+            self.cancel_btn.setEnabled(False)
+
+    def _on_worker_messages(self, mensajes):
+        # Los mensajes seguidos del mismo tipo se insertan de una sola vez
+        for bloque, tipo in agrupar(mensajes):
+            self.print_message(bloque, tipo)
+
+    def _on_worker_progress(self, fase, hechas, total):
+        self.progress_bar.setFormat(f"{fase}: %v/%m")
+        self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(hechas)
+
+    def _on_input_requested(self):
+        cursor = self.output_area.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(">> ")
+        self.output_area.setTextCursor(cursor)
+        self.esperando_entrada = True
+        self.input_line.setFocus()
 
-            analyzer = SemanticAnalyzer()
-            analyzer.analyze(ast)
-            self.print_message("Análisis semántico completado.\n", "success")
-
-            interpreter = Interpreter(gui=self)
-            self.print_message("Ejecutando programa...\n", "info")
-            interpreter.run(ast)
-            self.print_message(" Ejecución finalizada con éxito.\n", "success")
-
-        except Exception as e:
-            # Resaltar línea donde ocurrió error si es posible
-            import traceback
-            tb = traceback.format_exc().splitlines()
-            self.print_message(f"Error: {str(e)}\n", "error")
-            # Intento de resaltar línea de error en editor (si traceback indica línea)
-            for line in tb:
-                if "line" in line.lower():
-                    parts = line.strip().split()
-                    for i, p in enumerate(parts):
-                        if p.lower() == "line":
-                            try:
-                                line_no = int(parts[i+1]) - 1
-                                self.highlighter.add_error(line_no, 0)
-                                break
-                            except:
-                                continue
+    def _mostrar_medicion(self, med):
+        texto = med.resumen()
+        for fase in med.fases:
+            perfil = med.perfil(fase)
+            if perfil:
+                texto += f"\n\n--- perfil: {fase} ---\n{perfil.strip()}"
+        self.stats_area.setPlainText(texto)
+        self.stats_area.show()
+
+    def _on_runtime_error(self, msg):
+        QMessageBox.critical(self, "Error en ejecución", msg)
+
+    def _on_worker_finished(self):
+        self.worker_thread.deleteLater()
+        self.worker.deleteLater()
+        self.worker = None
+        self.worker_thread = None
+        self.esperando_entrada = False
+        self.compile_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        self.progress_bar.hide()
+
+    def closeEvent(self, event):
+        if self.worker_thread is not None:
+            self.worker.cancelar()
+            self.worker_thread.quit()
+            self.worker_thread.wait()
+        for carga in self._cargas:
+            carga.wait()
+        super().closeEvent(event)
 
 
     # Colores de salida
@@ -318,12 +715,12 @@ class PQEKCompilerApp(QMainWindow):
         cursor.insertText(self.input_value + "\n")
         self.output_area.moveCursor(QTextCursor.End)
 
+        if self.esperando_entrada:
+            self.esperando_entrada = False
+            self.worker.entradas.put(self.input_value)
+
     def read_input(self):
-        self.input_ready = False
-        self.input_line.setFocus()
-        while not self.input_ready:
-            QApplication.processEvents()
-        return self.input_value, True
+        return _esperar_enter(self), True
 
 
 
@@ -344,9 +741,7 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QColor, QTextCharFormat, QTextCursor, QFont, QSyntaxHighlighter
 from PyQt5.QtCore import Qt, QRegExp
 
-from analizador_lexico import lexer, listar_errores_lexicos
-from analizador_sintactico import build_parser
-from analizador_semantico import SemanticAnalyzer
+from documento import PipelineDocumento
 from interprete import Interpreter
 
 
@@ -366,11 +761,18 @@ class PQEKHighlighter(QSyntaxHighlighter):
 
     def mark_error_line(self, line):
         self.error_lines.add(line)
-        self.rehighlight()
+        self._rehighlight_line(line)
 
     def clear_errors(self):
+        lineas = list(self.error_lines)
         self.error_lines.clear()
-        self.rehighlight()
+        for line in lineas:
+            self._rehighlight_line(line)
+
+    def _rehighlight_line(self, line):
+        block = self.document().findBlockByNumber(line)
+        if block.isValid():
+            self.rehighlightBlock(block)
 
 
 
@@ -429,7 +831,8 @@ class CompilerGUI(QMainWindow):
         container.setLayout(layout)
         self.setCentralWidget(container)
 
-        self.parser = build_parser()
+        # Tokens, AST y símbolos del texto del editor, compartidos por los botones
+        self.documento = PipelineDocumento()
 
 
     # IMPRESIÓN EN SALIDA
@@ -442,6 +845,8 @@ class CompilerGUI(QMainWindow):
         else:
             color = "#FFFFFF"
 
+        # Un mensaje puede traer varias líneas (la salida llega en tandas)
+        msg = msg.replace("\n", "<br>")
         self.output_area.append(f"<span style='color:{color}'>{msg}</span>")
 
 
@@ -466,18 +871,14 @@ class CompilerGUI(QMainWindow):
                                 "hey loco yo que? adivino?, escribe algo pa' poder analizar.")
             return
 
-        lexer.input(code)
-        listar_errores_lexicos.clear()
+        self.documento.actualizar(code)
 
         try:
-            while True:
-                tok = lexer.token()
-                if not tok:
-                    break
+            for tok in self.documento.tokens():
                 self.print_message(f"(TOKEN {tok.type}, '{tok.value}')")
 
-            if listar_errores_lexicos:
-                for (line, col, msg) in listar_errores_lexicos:
+            if self.documento.errores_lexicos:
+                for (line, col, msg) in self.documento.errores_lexicos:
                     self.highlighter.mark_error_line(line)
                     self.print_message(msg, kind="error")
                 return
@@ -494,21 +895,56 @@ class CompilerGUI(QMainWindow):
         self.output_area.clear()
         self.highlighter.clear_errors()
 
-        code = self.editor.toPlainText().strip()
-        if not code:
+        code = self.editor.toPlainText()
+        if not code.strip():
             QMessageBox.warning(self, "Vacío",
                                 "Nojoda llave, esa vaina no se entiende.")
             return
 
+        self.documento.actualizar(code)
         try:
-            ast = self.parser.parse(code, lexer=lexer)
-            self.print_message("✔ Estructura sintáctica correcta")
-            return ast
-
+            ast = self.documento.ast()
         except Exception as e:
             msg = str(e)
             self.print_message(msg, kind="error")
             QMessageBox.critical(self, "Error Sintáctico", msg)
+            return
+
+        mensajes = self._errores_sintacticos()
+        if mensajes:
+            self._caja_de_errores("Error Sintáctico", mensajes)
+            return
+        self.print_message("✔ Estructura sintáctica correcta")
+        return ast
+
+    def _errores_sintacticos(self):
+        """Marca e imprime todos los errores de sintaxis del documento; devuelve sus mensajes."""
+        mensajes = []
+        for d in self.documento.errores_sintacticos:
+            if d.linea is not None:
+                self.highlighter.mark_error_line(d.linea - 1)
+            self.print_message(d.mensaje, kind="error")
+            mensajes.append(d.mensaje)
+        return mensajes
+
+    def _revisar(self):
+        """Sintaxis y semántica de una pasada, como la ventana principal: con
+        errores de sintaxis igual se revisan las sentencias válidas. Devuelve
+        (mensajes de sintaxis, mensaje del semántico o None)."""
+        self.documento.ast()
+        sintaxis = self._errores_sintacticos()
+        try:
+            self.documento.semantico()
+        except Exception as e:
+            self.print_message(str(e), kind="error")
+            return sintaxis, str(e)
+        return sintaxis, None
+
+    def _caja_de_errores(self, titulo, mensajes, maximo=20):
+        texto = "\n".join(mensajes[:maximo])
+        if len(mensajes) > maximo:
+            texto += f"\n… y {len(mensajes) - maximo} errores más (ver la salida)"
+        QMessageBox.critical(self, titulo, texto)
 
 
     # ANÁLISIS SEMÁNTICO
@@ -517,22 +953,26 @@ class CompilerGUI(QMainWindow):
         self.output_area.clear()
         self.highlighter.clear_errors()
 
-        code = self.editor.toPlainText().strip()
-        if not code:
+        code = self.editor.toPlainText()
+        if not code.strip():
             QMessageBox.warning(self, "Vacío",
                                 "hey loco, ¿que voy a analzar si no hay nah?")
             return
 
+        self.documento.actualizar(code)
         try:
-            ast = self.parser.parse(code, lexer=lexer)
-            sem = SemanticAnalyzer()
-            sem.analyze(ast)
-            self.print_message("✔ Análisis semántico correcto")
-
+            sintaxis, semantico = self._revisar()
         except Exception as e:
             msg = str(e)
             self.print_message(msg, kind="error")
             QMessageBox.critical(self, "Error Semántico", msg)
+            return
+
+        if sintaxis or semantico:
+            titulo = "Error Sintáctico" if sintaxis else "Error Semántico"
+            self._caja_de_errores(titulo, sintaxis + [semantico] if semantico else sintaxis)
+            return
+        self.print_message("✔ Análisis semántico correcto")
 
 
     # EJECUCIÓN
@@ -541,19 +981,22 @@ class CompilerGUI(QMainWindow):
         self.output_area.clear()
         self.highlighter.clear_errors()
 
-        code = self.editor.toPlainText().strip()
-        if not code:
+        code = self.editor.toPlainText()
+        if not code.strip():
             QMessageBox.warning(self, "Vacío",
                                 " hey llave, esa vaina esta vacia. Escribe algo.")
             return
 
+        self.documento.actualizar(code)
         try:
-            ast = self.parser.parse(code, lexer=lexer)
-            sem = SemanticAnalyzer()
-            sem.analyze(ast)
+            # Sin cambios desde el último análisis, ninguna fase se repite
+            sintaxis, semantico = self._revisar()
+            if sintaxis or semantico:
+                self._caja_de_errores("Error al ejecutar", sintaxis + [semantico] if semantico else sintaxis)
+                return
 
             interp = Interpreter(gui=self)
-            interp.run(ast)
+            interp.run(self.documento.ast())
 
         except Exception as e:
             msg = str(e)
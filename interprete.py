@@ -1,142 +1,330 @@
 # interprete.py
-from PyQt5.QtWidgets import QApplication, QMessageBox
-from PyQt5.QtGui import QTextCursor
+# PyQt5 solo se importa cuando hay GUI, así el intérprete corre sin Qt en modo consola.
 
+import re
 
-class Interpreter:
-    def __init__(self, gui=None):
-        self.memory = {}
-        self.output_log = []
-        self.gui = gui
+from analizador_sintactico import Assign, BinaryOp, Captura, Node, Number, Program, String
+from despacho import Despacho
+from diagnosticos import Diagnostico
+from salida import LIMITE_LOG, StreamSink, WidgetSink, registro
 
-    #   EJECUCIÓN DE NODOS
+# Lo que Captura acepta como número: signo opcional y decimales con coma o
+# punto (el grupo son los decimales, que solo un Real puede traer)
+_NUMERO = re.compile(r"\s*[+-]?\d+(?:[.,](\d+))?\s*")
 
-    def run(self, node):
-        cls = node.__class__.__name__
-        try:
-            if cls == "Program":
-                for s in node.stmts:
-                    self.run(s)
+# Lo que hay en el slot de una variable cuya declaración todavía no se ejecutó
+# (None es una variable declarada que aún no tiene valor)
+SIN_DECLARAR = object()
 
-            elif cls == "VarDecl":
-                self.memory[node.name] = None
-                self.log(f"Variable declarada: {node.name} ({node.tipo})")
 
-            elif cls == "Assign":
-                value = self.eval(node.expr)
-                self.memory[node.name] = value
-                self.log(f"{node.name} = {value}")
+class Interpreter:
+    # run_<clase> y eval_<clase> por tipo de nodo (ver despacho.py)
+    ejecuciones = Despacho("run_", "_no_ejecutable", Node)
+    evaluaciones = Despacho("eval_", "_no_evaluable", Node)
+
+    def __init__(self, gui=None, sink=None, limite_log=LIMITE_LOG, entrada=None):
+        self._ejecuciones = self.ejecuciones.tabla(type(self))
+        self._evaluaciones = self.evaluaciones.tabla(type(self))
+        # Memoria: el valor de cada variable en el slot que le dio el semántico
+        # (node.slot). slots es nombre → slot, para memory y para los nodos sin
+        # slot (un AST que no pasó por el semántico se resuelve por nombre).
+        self.valores = []
+        self.slots = {}
+        # Buffer circular: guarda las últimas limite_log líneas (None = todas)
+        self.output_log = registro(limite_log)
+        self.gui = gui
+        # A dónde va la salida (ver salida.py): la GUI en tandas o la consola
+        if sink is None:
+            sink = WidgetSink(gui) if gui else StreamSink()
+        self.sink = sink
+        self.diagnosticos = []  # errores de ejecución con la posición de su sentencia
+        # De dónde salen los valores de Captura (ver entradas.py); None = consola o GUI
+        self.entrada = entrada
+
+    #   MEMORIA
+
+    @property
+    def memory(self):
+        """{nombre: valor} de las variables declaradas, armado desde los slots."""
+        valores = self.valores
+        return {n: valores[s] for n, s in self.slots.items() if valores[s] is not SIN_DECLARAR}
+
+    def reservar(self, n):
+        """Deja lugar para n slots (los que faltan quedan sin declarar)."""
+        if len(self.valores) < n:
+            self.valores.extend([SIN_DECLARAR] * (n - len(self.valores)))
+
+    def _guardar(self, node, value):
+        slot = node.slot
+        if slot is None:
+            slot = self._slot(node.name)
+        valores = self.valores
+        if slot >= len(valores) or valores[slot] is SIN_DECLARAR:
+            # Asignar sin declarar crea la variable (el semántico igual le dio slot)
+            self.reservar(slot + 1)
+            self.slots[node.name] = slot
+        valores[slot] = value
+
+    def _slot(self, nombre):
+        """Slot de la variable por nombre, para los nodos sin slot; uno nuevo si no tenía."""
+        slot = self.slots.get(nombre)
+        if slot is None:
+            slot = self.slots[nombre] = len(self.valores)
+            self.valores.append(SIN_DECLARAR)
+        return slot
 
-            elif cls == "Mensaje":
-                self.log(f"{node.texto}")
 
-            else:
-                raise Exception(f"No puedo ejecutar nodo {cls}")
+    #   EJECUCIÓN DE NODOS
 
+    def run(self, node):
+        try:
+            self._ejecuciones[node.__class__](self, node)
         except Exception as e:
-            msg = f"Nojoda llave… error en ejecución ({cls}): {e}"
-            self.log(msg, error=True)
-            if self.gui:
-                QMessageBox.critical(self.gui, "Error en ejecución", msg)
+            self._error_ejecucion(node.__class__.__name__, node.lineno, node.col, e)
+
+    def run_Program(self, node):
+        for s in node.stmts:
+            self.run(s)
+        self.sink.flush()
+
+    def run_VarDecl(self, node):
+        slot = node.slot
+        valores = self.valores
+        if slot is None:
+            slot = self._slot(node.name)
+        elif slot >= len(valores):
+            self.reservar(slot + 1)
+        self.slots[node.name] = slot
+        valores[slot] = None
+        self.log(f"Variable declarada: {node.name} ({node.tipo})")
+
+    def run_Assign(self, node):
+        expr = node.expr
+        cls = expr.__class__
+        # Las constantes van directo, sin pasar por la tabla
+        if cls is Number or cls is String:
+            value = expr.value
+        else:
+            value = self._evaluaciones[cls](self, expr)
+        slot = node.slot
+        valores = self.valores
+        if slot is not None and slot < len(valores) and valores[slot] is not SIN_DECLARAR:
+            valores[slot] = value   # lo de siempre: una variable ya declarada
+        else:
+            self._guardar(node, value)
+        self.log(f"{node.name} = {self._formatear(value)}")
+
+    def run_Mensaje(self, node):
+        self.log(f"{node.texto}")
+
+    def _no_ejecutable(self, node):
+        raise Exception(f"No puedo ejecutar nodo {node.__class__.__name__}")
+
+    def _error_ejecucion(self, cls, linea, columna, e):
+        """Reporta el error de una sentencia; quien llama sigue con la próxima."""
+        msg = f"Nojoda llave… error en ejecución ({cls}): {e}"
+        self.diagnosticos.append(Diagnostico("ejecucion", linea, columna, msg))
+        self.log(msg, error=True)
+        self._avisar_error(msg)
+
+
+    #   EJECUCIÓN POR PASOS (CAPTURA SIN BLOQUEAR)
+
+    def ejecutar(self, node):
+        """Igual que run, pero es un generador: en cada Captura entrega el tipo
+        pedido y se queda suspendido hasta que le manden el valor con send().
+
+            pasos = interp.ejecutar(ast)
+            tipo = next(pasos)          # StopIteration cuando termina
+            tipo = pasos.send("7")
+        """
+        cls = node.__class__
+        if cls is Program:
+            for s in node.stmts:
+                yield from self.ejecutar(s)
+            self.sink.flush()
+        elif cls is Assign and node.expr.__class__ is Captura:
+            # La gramática solo deja a Captura como lado derecho completo
+            self._anunciar_captura(node.expr.tipo)
+            self.sink.flush()
+            texto = yield node.expr.tipo
+            try:
+                value = self._valor_capturado(node.expr.tipo, texto)
+            except Exception as e:
+                self._error_ejecucion(cls.__name__, node.lineno, node.col, e)
+                return
+            self._guardar(node, value)
+            self.log(f"{node.name} = {self._formatear(value)}")
+        else:
+            self.run(node)
+
+    async def ejecutar_async(self, node, leer_entrada):
+        """Corre ejecutar() desde asyncio; leer_entrada(tipo) es una corrutina
+        que devuelve el texto ingresado."""
+        pasos = self.ejecutar(node)
+        try:
+            tipo = next(pasos)
+            while True:
+                tipo = pasos.send(await leer_entrada(tipo))
+        except StopIteration:
+            pass
 
 
     #   EVALUACIÓN DE EXPRESIONES
 
     def eval(self, node):
-        cls = node.__class__.__name__
-
-
-        # OPERACIONES ( + - * / )
-
-        if cls == "BinaryOp":
-            left = self.eval(node.left)
-            right = self.eval(node.right)
-
-            # Convertir strings "1,5" → 1.5
-            left_val = self._as_number(left)
-            right_val = self._as_number(right)
-
-            if node.op == "+":
-                result = left_val + right_val
-            elif node.op == "-":
-                result = left_val - right_val
-            elif node.op == "*":
-                result = left_val * right_val
-            elif node.op == "/":
-                result = left_val / right_val
-            else:
-                raise Exception(f"Operador '{node.op}' inválido en operación.")
-
-            # Convertir de vuelta a coma si es float
-            if isinstance(result, float):
-                return self._to_comma(result)
+        cls = node.__class__
+        if cls is Number or cls is String:
+            return node.value
+        return self._evaluaciones[cls](self, node)
 
-            return result
 
+    # NÚMEROS
 
-        # NÚMEROS
+    def eval_Number(self, node):
+        # p.ej. 12.5 o 7
+        return node.value
 
-        elif cls == "Number":
-            # p.ex. "12,5" o 7
-            return node.value
 
+    # CADENA
 
-        # CADENA
+    def eval_String(self, node):
+        return node.value
 
-        elif cls == "String":
-            return node.value
 
+    # VARIABLES
 
-        # VARIABLES
+    def eval_VarRef(self, node):
+        slot = node.slot
+        try:
+            value = self.valores[slot if slot is not None else self._slot(node.name)]
+        except IndexError:
+            value = SIN_DECLARAR
+        if value is None:
+            raise Exception(f"La variable '{node.name}' no tiene valor, llave.")
+        if value is SIN_DECLARAR:
+            raise Exception(f"Variable '{node.name}' no existe.")
+        return value
 
-        elif cls == "VarRef":
-            if node.name not in self.memory:
-                raise Exception(f"Variable '{node.name}' no existe.")
-            if self.memory[node.name] is None:
-                raise Exception(f"La variable '{node.name}' no tiene valor, llave.")
-            return self.memory[node.name]
 
-        # CAPTURA
+    # CAPTURA
+
+    def eval_Captura(self, node):
+        self._anunciar_captura(node.tipo)
+        return self._valor_capturado(node.tipo, self._read_input_from_output())
+
+
+    # OPERACIONES ( + - * / )
+
+    def eval_BinaryOp(self, node):
+        """Evalúa un árbol de operaciones con una pila explícita (postorden), así
+        la profundidad de la expresión no choca con el límite de recursión.
+
+        En la pila de trabajo van nodos y, como str, los operadores pendientes:
+        cuando sale un operador sus dos operandos ya están en values.
+        """
+        values = []
+        push = values.append
+        pop = values.pop
+        evaluaciones = self._evaluaciones
+        pending = [node]
+        while pending:
+            n = pending.pop()
+            cls = n.__class__
+
+            if cls is str:
+                # Los valores ya son int/float: se opera directo
+                right = pop()
+                if n == "+":
+                    values[-1] = values[-1] + right
+                elif n == "-":
+                    values[-1] = values[-1] - right
+                elif n == "*":
+                    values[-1] = values[-1] * right
+                elif n == "/":
+                    values[-1] = values[-1] / right
+                else:
+                    raise Exception(f"Operador '{n}' inválido en operación.")
+
+            elif cls is BinaryOp:
+                pending.append(n.op)
+                pending.append(n.right)
+                pending.append(n.left)
+
+            elif cls is Number:
+                push(n.value)
 
-        elif cls == "Captura":
-            if self.gui:
-                self.log(f"Ingresa un valor de tipo {node.tipo} y presiona Enter:", info=True)
-                return self._read_input_from_output()
             else:
-                return input(">> ")
+                push(evaluaciones[cls](self, n))
 
+        return values[0]
 
-        # DESCONOCIDO
 
-        else:
-            raise Exception(f"No hay eval para '{cls}'.")
+    # DESCONOCIDO
 
+    def _no_evaluable(self, node):
+        raise Exception(f"No hay eval para '{node.__class__.__name__}'.")
 
-    #   CONVERSIÓN DE NÚMEROS
 
-    def _as_number(self, value):
-        """Convierte '12,5' → 12.5 o '7' → 7 para operar."""
-        if isinstance(value, str):
-            if "," in value:
-                return float(value.replace(",", "."))
-            if value.isdigit():
-                return int(value)
-        return value
+    #   CONVERSIÓN DE NÚMEROS
 
-    def _to_comma(self, num):
+    @staticmethod
+    def _to_comma(num):
         """Convierte 12.5 → '12,5'."""
         txt = str(num)
         if "." in txt:
             return txt.replace(".", ",")
         return txt
 
+    @classmethod
+    def _formatear(cls, value):
+        """Texto de un valor para la salida: los reales con coma."""
+        if isinstance(value, float):
+            return cls._to_comma(value)
+        return value
+
+    @classmethod
+    def _valor_capturado(cls, tipo, texto):
+        """Lo que se ingresa por Captura se convierte una sola vez, al leerlo:
+        '-7' → -7 en un Entero; '12,5' → 12.5 y '7' → 7.0 en un Real."""
+        if tipo in ("Entero", "Real"):
+            numero = _NUMERO.fullmatch(texto)
+            if numero is None:
+                raise Exception(f"Esa vaina '{texto}' no es un {tipo}, llave.")
+            if tipo == "Real":
+                return float(texto.replace(",", "."))
+            if numero.group(1) is not None:
+                raise Exception(f"Esa vaina '{texto}' trae decimales y un Entero no lleva, llave.")
+            return int(texto)
+        return texto
+
+
+    #   AVISOS A LA GUI
+
+    def _avisar_error(self, msg):
+        """Muestra el error de ejecución en un cuadro de diálogo (solo con GUI)."""
+        if self.gui:
+            from PyQt5.QtWidgets import QMessageBox
+            self.sink.flush()
+            QMessageBox.critical(self.gui, "Error en ejecución", msg)
+
+    def _anunciar_captura(self, tipo):
+        if self.gui:
+            self.log(f"Ingresa un valor de tipo {tipo} y presiona Enter:", info=True)
+
 
     #   LECTURA DESDE GUI
 
     def _read_input_from_output(self):
+        self.sink.flush()
+        if self.entrada is not None:
+            return self.entrada.leer()
         if not self.gui:
             return input(">> ")
 
+        from PyQt5.QtCore import QEventLoop
+        from PyQt5.QtGui import QTextCursor
+
         cursor = self.gui.output_area.textCursor()
         cursor.movePosition(QTextCursor.End)
         cursor.insertText(">> ")
@@ -145,8 +333,12 @@ class Interpreter:
         self.gui.input_ready = False
         self.gui.input_line.setFocus()
 
+        # Se duerme en un event loop anidado hasta el Enter, sin girar en processEvents
+        espera = QEventLoop()
+        self.gui.input_line.returnPressed.connect(espera.quit)
         while not self.gui.input_ready:
-            QApplication.processEvents()
+            espera.exec_()
+        self.gui.input_line.returnPressed.disconnect(espera.quit)
 
         text = self.gui.input_value
 
@@ -159,8 +351,8 @@ class Interpreter:
 
     def log(self, text, error=False, info=False):
         self.output_log.append(text)
-        if self.gui:
-            msg_type = "error" if error else "info"
-            self.gui.print_message(text, msg_type)
-        else:
-            print(text)
+        self.sink.write(text, "error" if error else "info")
+
+    def flush(self):
+        """Escribe lo que el sink tenga pendiente (run ya lo hace al terminar un Program)."""
+        self.sink.flush()
@@ -0,0 +1,179 @@
+# optimizador.py
+# Pasada de optimización entre el análisis semántico y la ejecución:
+#   - plegado de constantes  (3 + 4 * 2  →  11)
+#   - identidades algebraicas sobre enteros  (x * 1, x + 0, x - 0  →  x ;  x * 0  →  0)
+#   - propagación de constantes por las asignaciones en línea recta
+# Devuelve un AST nuevo (el original no se toca) y cuenta los nodos eliminados.
+
+from analizador_sintactico import Program, Assign, BinaryOp, Number
+
+
+def contar_nodos(node):
+    total = 0
+    pendientes = [node]
+    while pendientes:
+        n = pendientes.pop()
+        total += 1
+        cls = n.__class__.__name__
+        if cls == "Program":
+            pendientes.extend(n.stmts)
+        elif cls == "Assign":
+            pendientes.append(n.expr)
+        elif cls == "BinaryOp":
+            pendientes.append(n.left)
+            pendientes.append(n.right)
+    return total
+
+
+class Optimizer:
+    def __init__(self):
+        self.removed = 0
+        self.consts = {}      # variable → Number con su valor conocido
+        self.enteros = set()  # variables que seguro tienen un int (ya asignado)
+
+    def optimize(self, program):
+        antes = contar_nodos(program)
+        stmts = [self.visit_stmt(s) for s in program.stmts]
+        result = Program(stmts)
+        self.removed = antes - contar_nodos(result)
+        return result
+
+    # SENTENCIAS
+
+    def visit_stmt(self, node):
+        cls = node.__class__.__name__
+
+        if cls == "VarDecl":
+            self.consts.pop(node.name, None)
+            self.enteros.discard(node.name)
+            return node
+
+        if cls == "Assign":
+            expr, entero = self._visit_expr(node.expr)
+            # Si la expresión puede fallar en ejecución la variable queda con su
+            # valor anterior, que ya no conocemos: se olvida.
+            self.consts.pop(node.name, None)
+            self.enteros.discard(node.name)
+            if isinstance(expr, Number):
+                self.consts[node.name] = expr
+                if expr.kind == "Entero":
+                    self.enteros.add(node.name)
+            elif entero:
+                self.enteros.add(node.name)
+            if expr is node.expr:
+                return node
+            return Assign(node.name, expr, node.lineno, node.col, node.slot)
+
+        return node
+
+    # EXPRESIONES
+
+    def visit_expr(self, node):
+        return self._visit_expr(node)[0]
+
+    def _visit_expr(self, node):
+        """(expresión optimizada, es entera). Recorre en postorden con una pila
+        explícita, sin recursión; "es entera" (da un int y no puede fallar en
+        ejecución) se arma de abajo hacia arriba junto con cada resultado."""
+        resultados = []
+        pendientes = [node]
+        while pendientes:
+            n = pendientes.pop()
+            if n is not None:
+                if n.__class__.__name__ == "BinaryOp":
+                    # None: al volver a él, n ya tiene sus operandos en resultados
+                    pendientes += (n, None, n.right, n.left)
+                else:
+                    resultados.append(self.visit_hoja(n))
+            else:
+                n = pendientes.pop()
+                right, er = resultados.pop()
+                left, el = resultados.pop()
+                resultados.append(self.combinar(n, left, el, right, er))
+        return resultados.pop()
+
+    def visit_hoja(self, node):
+        cls = node.__class__.__name__
+        if cls == "VarRef":
+            const = self.consts.get(node.name)
+            if const is not None:
+                return Number(const.value, const.kind, node.lineno, node.col), const.kind == "Entero"
+            return node, node.name in self.enteros
+        if cls == "Number":
+            return node, node.kind == "Entero"
+        return node, False
+
+    def combinar(self, node, left, el, right, er):
+        """La operación de node sobre sus operandos ya optimizados."""
+        if isinstance(left, Number) and isinstance(right, Number):
+            folded = self.fold(node.op, left, right)
+            if folded is not None:
+                folded.lineno, folded.col = node.lineno, node.col
+                return folded, folded.kind == "Entero"
+
+        simplified = self.simplify(node.op, left, el, right, er)
+        if simplified is not None:
+            if simplified.lineno is None:
+                simplified.lineno, simplified.col = node.lineno, node.col
+            return simplified, True
+
+        entero = node.op in ("+", "-", "*") and el and er
+        if left is node.left and right is node.right:
+            return node, entero
+        return BinaryOp(node.op, left, right, node.lineno, node.col), entero
+
+    def fold(self, op, left, right):
+        """Calcula la operación igual que Interpreter.eval, o None si no se puede."""
+        l, r = left.value, right.value
+        if l.__class__ not in (int, float) or r.__class__ not in (int, float):
+            return None
+
+        try:
+            if op == "+":
+                result = l + r
+            elif op == "-":
+                result = l - r
+            elif op == "*":
+                result = l * r
+            elif op == "/":
+                result = l / r
+            else:
+                return None
+        except ArithmeticError:
+            # División por cero, o un entero enorme que no cabe en un float: que
+            # el error salga en ejecución, en su sentencia
+            return None
+
+        if isinstance(result, float):
+            return Number(result, "Real")
+        return Number(result, "Entero")
+
+    def simplify(self, op, left, el, right, er):
+        """Identidades que solo valen si el otro operando es seguro un int
+        (el / er: si left / right son enteros). El resultado siempre es entero."""
+        if op == "*":
+            if self.es_literal(right, 1) and el:
+                return left
+            if self.es_literal(left, 1) and er:
+                return right
+            if (self.es_literal(right, 0) and el) or (self.es_literal(left, 0) and er):
+                return Number(0, "Entero")
+        elif op == "+":
+            if self.es_literal(right, 0) and el:
+                return left
+            if self.es_literal(left, 0) and er:
+                return right
+        elif op == "-":
+            if self.es_literal(right, 0) and el:
+                return left
+        return None
+
+    def es_literal(self, node, valor):
+        return isinstance(node, Number) and node.kind == "Entero" and node.value == valor
+
+
+def optimizar(program):
+    """Atajo: devuelve (programa optimizado, nodos eliminados)."""
+    opt = Optimizer()
+    result = opt.optimize(program)
+    return result, opt.removed
@@ -0,0 +1,11 @@
+# pqek_lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('ASSIGN', 'CADENA', 'DIVIDE', 'ENTERO', 'FUNCION', 'ID', 'MINUS', 'PAREN_A', 'PAREN_C', 'PLUS', 'PUNTO', 'PUNTOYCOMA', 'REAL', 'TIMES', 'TIPO'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_CADENA>"[^"]*")|(?P<t_REAL>\\d+,\\d+)|(?P<t_ENTERO>\\d+)|(?P<t_ID>[A-Za-z_][A-Za-z0-9_]*)|(?P<t_newline>\\n+)|(?P<t_PAREN_A>\\()|(?P<t_PAREN_C>\\))|(?P<t_PLUS>\\+)|(?P<t_PUNTO>\\.)|(?P<t_TIMES>\\*)|(?P<t_ASSIGN>=)|(?P<t_DIVIDE>/)|(?P<t_MINUS>-)|(?P<t_PUNTOYCOMA>;)', [None, ('t_CADENA', 'CADENA'), ('t_REAL', 'REAL'), ('t_ENTERO', 'ENTERO'), ('t_ID', 'ID'), ('t_newline', 'newline'), (None, 'PAREN_A'), (None, 'PAREN_C'), (None, 'PLUS'), (None, 'PUNTO'), (None, 'TIMES'), (None, 'ASSIGN'), (None, 'DIVIDE'), (None, 'MINUS'), (None, 'PUNTOYCOMA')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
+_firma_pqek   = 'c10642d3123abbbcb02789462a312f98'
@@ -0,0 +1,52 @@
+
+# pqek_parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'programleftPLUSMINUSleftTIMESDIVIDEASSIGN CADENA DIVIDE ENTERO FUNCION ID INICIO MINUS PAREN_A PAREN_C PLUS PUNTO PUNTOYCOMA REAL TIMES TIPOprogram : stmt_list\n               | INICIO stmt_liststmt_list : stmt_list statementstmt_list : statementstatement : declaracion PUNTOYCOMA\n                 | asignacion PUNTOYCOMA\n                 | lectura PUNTOYCOMA\n                 | escritura PUNTOYCOMAstatement : error PUNTOYCOMAdeclaracion : ID TIPOasignacion : ID ASSIGN expresionlectura : ID ASSIGN FUNCION PUNTO TIPO PAREN_A PAREN_Cescritura : FUNCION PUNTO TIPO PAREN_A CADENA PAREN_Cexpresion : expresion PLUS expresion\n                 | expresion MINUS expresion\n                 | expresion TIMES expresion\n                 | expresion DIVIDE expresionexpresion : PAREN_A expresion PAREN_Cexpresion : ENTERO\n                 | REALexpresion : CADENAexpresion : ID'
+    
+_lr_action_items = {'INICIO':([0,],[3,]),'error':([0,2,3,4,12,13,14,15,16,17,18,],[9,9,9,-4,-3,9,-5,-6,-7,-8,-9,]),'ID':([0,2,3,4,12,13,14,15,16,17,18,20,25,30,31,32,33,],[10,10,10,-4,-3,10,-5,-6,-7,-8,-9,22,22,22,22,22,22,]),'FUNCION':([0,2,3,4,12,13,14,15,16,17,18,20,],[11,11,11,-4,-3,11,-5,-6,-7,-8,-9,24,]),'$end':([1,2,4,12,13,14,15,16,17,18,],[0,-1,-4,-3,-2,-5,-6,-7,-8,-9,]),'PUNTOYCOMA':([5,6,7,8,9,19,22,23,26,27,28,37,38,39,40,42,45,46,],[14,15,16,17,18,-10,-22,-11,-19,-20,-21,-14,-15,-16,-17,-18,-13,-12,]),'TIPO':([10,21,34,],[19,29,41,]),'ASSIGN':([10,],[20,]),'PUNTO':([11,24,],[21,34,]),'PAREN_A':([20,25,29,30,31,32,33,41,],[25,25,36,25,25,25,25,44,]),'ENTERO':([20,25,30,31,32,33,],[26,26,26,26,26,26,]),'REAL':([20,25,30,31,32,33,],[27,27,27,27,27,27,]),'CADENA':([20,25,30,31,32,33,36,],[28,28,28,28,28,28,43,]),'PLUS':([22,23,26,27,28,35,37,38,39,40,42,],[-22,30,-19,-20,-21,30,-14,-15,-16,-17,-18,]),'MINUS':([22,23,26,27,28,35,37,38,39,40,42,],[-22,31,-19,-20,-21,31,-14,-15,-16,-17,-18,]),'TIMES':([22,23,26,27,28,35,37,38,39,40,42,],[-22,32,-19,-20,-21,32,32,32,-16,-17,-18,]),'DIVIDE':([22,23,26,27,28,35,37,38,39,40,42,],[-22,33,-19,-20,-21,33,33,33,-16,-17,-18,]),'PAREN_C':([22,26,27,28,35,37,38,39,40,42,43,44,],[-22,-19,-20,-21,42,-14,-15,-16,-17,-18,45,46,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'program':([0,],[1,]),'stmt_list':([0,3,],[2,13,]),'statement':([0,2,3,13,],[4,12,4,12,]),'declaracion':([0,2,3,13,],[5,5,5,5,]),'asignacion':([0,2,3,13,],[6,6,6,6,]),'lectura':([0,2,3,13,],[7,7,7,7,]),'escritura':([0,2,3,13,],[8,8,8,8,]),'expresion':([20,25,30,31,32,33,],[23,35,37,38,39,40,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> program","S'",1,None,None,None),
+  ('program -> stmt_list','program',1,'p_program','analizador_sintactico.py',116),
+  ('program -> INICIO stmt_list','program',2,'p_program','analizador_sintactico.py',117),
+  ('stmt_list -> stmt_list statement','stmt_list',2,'p_stmt_list_multi','analizador_sintactico.py',122),
+  ('stmt_list -> statement','stmt_list',1,'p_stmt_list_single','analizador_sintactico.py',130),
+  ('statement -> declaracion PUNTOYCOMA','statement',2,'p_statement','analizador_sintactico.py',135),
+  ('statement -> asignacion PUNTOYCOMA','statement',2,'p_statement','analizador_sintactico.py',136),
+  ('statement -> lectura PUNTOYCOMA','statement',2,'p_statement','analizador_sintactico.py',137),
+  ('statement -> escritura PUNTOYCOMA','statement',2,'p_statement','analizador_sintactico.py',138),
+  ('statement -> error PUNTOYCOMA','statement',2,'p_statement_error','analizador_sintactico.py',143),
+  ('declaracion -> ID TIPO','declaracion',2,'p_declaracion','analizador_sintactico.py',151),
+  ('asignacion -> ID ASSIGN expresion','asignacion',3,'p_asignacion','analizador_sintactico.py',158),
+  ('lectura -> ID ASSIGN FUNCION PUNTO TIPO PAREN_A PAREN_C','lectura',7,'p_lectura','analizador_sintactico.py',165),
+  ('escritura -> FUNCION PUNTO TIPO PAREN_A CADENA PAREN_C','escritura',6,'p_escritura','analizador_sintactico.py',172),
+  ('expresion -> expresion PLUS expresion','expresion',3,'p_expresion_binaria','analizador_sintactico.py',180),
+  ('expresion -> expresion MINUS expresion','expresion',3,'p_expresion_binaria','analizador_sintactico.py',181),
+  ('expresion -> expresion TIMES expresion','expresion',3,'p_expresion_binaria','analizador_sintactico.py',182),
+  ('expresion -> expresion DIVIDE expresion','expresion',3,'p_expresion_binaria','analizador_sintactico.py',183),
+  ('expresion -> PAREN_A expresion PAREN_C','expresion',3,'p_expresion_paren','analizador_sintactico.py',188),
+  ('expresion -> ENTERO','expresion',1,'p_expresion_numero','analizador_sintactico.py',193),
+  ('expresion -> REAL','expresion',1,'p_expresion_numero','analizador_sintactico.py',194),
+  ('expresion -> CADENA','expresion',1,'p_expresion_cadena','analizador_sintactico.py',206),
+  ('expresion -> ID','expresion',1,'p_expresion_id','analizador_sintactico.py',211),
+]
@@ -0,0 +1,93 @@
+# salida.py
+# Destinos (sinks) para la salida del intérprete. Interpreter.log le pasa cada
+# línea al sink con write(texto, tipo) y el sink decide cuándo escribirla de
+# verdad: de una en la consola (o en otro stream), o en tandas en un widget.
+#
+# Todo sink tiene write(texto, tipo), flush() y close(). PyQt5 no se importa
+# aquí: WidgetSink solo llama a gui.print_message.
+
+import sys
+import time
+from collections import deque
+
+# Líneas que guarda Interpreter.output_log por defecto; las más viejas se descartan
+LIMITE_LOG = 10000
+
+
+def registro(limite=LIMITE_LOG):
+    """Buffer circular para output_log: al llenarse descarta lo más viejo (None = sin límite)."""
+    return deque(maxlen=limite)
+
+
+def agrupar(mensajes):
+    """Junta las líneas seguidas del mismo tipo: [(texto, tipo)] → [(bloque, tipo)]."""
+    bloques = []
+    for texto, tipo in mensajes:
+        if bloques and bloques[-1][1] == tipo:
+            bloques[-1][0].append(texto)
+        else:
+            bloques.append(([texto], tipo))
+    return [("\n".join(lineas), tipo) for lineas, tipo in bloques]
+
+
+# CONSOLA
+
+class StreamSink:
+    """Escribe cada línea en un stream; sin stream usa el sys.stdout del momento."""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def _destino(self):
+        return self.stream if self.stream is not None else sys.stdout
+
+    def write(self, texto, tipo="info"):
+        self._destino().write(texto + "\n")
+
+    def flush(self):
+        self._destino().flush()
+
+    def close(self):
+        self.flush()
+
+
+# TANDAS
+
+class BatchedSink:
+    """Acumula las líneas y se las entrega a destino([(texto, tipo)]) en tandas:
+    cuando pasó `intervalo` desde la última entrega, cuando junta `max_tanda`
+    líneas o con flush()."""
+
+    def __init__(self, destino, intervalo=0.05, max_tanda=5000):
+        self.destino = destino
+        self.intervalo = intervalo
+        self.max_tanda = max_tanda
+        self.pendientes = []
+        self._ultimo = time.monotonic()
+
+    def write(self, texto, tipo="info"):
+        self.pendientes.append((texto, tipo))
+        if len(self.pendientes) >= self.max_tanda or \
+           time.monotonic() - self._ultimo >= self.intervalo:
+            self.flush()
+
+    def flush(self):
+        if self.pendientes:
+            tanda, self.pendientes = self.pendientes, []
+            self.destino(tanda)
+        self._ultimo = time.monotonic()
+
+    def close(self):
+        self.flush()
+
+
+class WidgetSink(BatchedSink):
+    """Imprime en la GUI con un solo print_message por bloque de líneas del mismo tipo."""
+
+    def __init__(self, gui, **kwargs):
+        super().__init__(self._imprimir, **kwargs)
+        self.gui = gui
+
+    def _imprimir(self, tanda):
+        for bloque, tipo in agrupar(tanda):
+            self.gui.print_message(bloque, tipo)
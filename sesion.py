@@ -0,0 +1,107 @@
+# sesion.py
+# Una CompilationSession tiene su propio lexer, su parser y sus listas de errores,
+# así que varias sesiones pueden compilar al mismo tiempo (p. ej. desde un
+# ThreadPoolExecutor) sin pisarse. Cada sesión se usa desde un solo hilo a la vez.
+# parse_archivo e iter_statements_archivo leen el programa directo del archivo,
+# por trozos (ver fuente_archivo.py), sin cargarlo entero en memoria.
+
+from analizador_lexico import nuevo_lexer
+from analizador_sintactico import nuevo_parser, iter_statements, parsear, parsear_flujo
+from analizador_semantico import SemanticAnalyzer
+from diagnosticos import diagnosticos_lexicos, tabla_de
+from fuente_archivo import FuenteArchivo
+from interprete import Interpreter
+
+
+class CompilationSession:
+    def __init__(self):
+        self.lexer = nuevo_lexer()
+        self.parser = nuevo_parser()
+        self.errores_sintacticos = []
+        self.fuente = None      # FuenteArchivo del último parse_archivo
+
+    @property
+    def listar_errores_lexicos(self):
+        return self.lexer.listar_errores_lexicos
+
+    @property
+    def errores_Desc(self):
+        return self.lexer.errores_Desc
+
+    @property
+    def diagnosticos_lexicos(self):
+        """listar_errores_lexicos del último texto como Diagnostico (línea y columna exactas)."""
+        if self.fuente is not None:
+            return self.fuente.diagnosticos_lexicos
+        return diagnosticos_lexicos(self.lexer.listar_errores_lexicos, tabla_de(self.lexer))
+
+    def reset(self):
+        """Deja la sesión lista para otro programa: línea 1 y sin errores."""
+        self.lexer.lineno = 1
+        self.lexer.listar_errores_lexicos.clear()
+        self.lexer.errores_Desc.clear()
+        self.errores_sintacticos = []
+        self.fuente = None
+
+    #   FASES
+
+    def tokens(self, code):
+        """Tokens del código; cada uno trae lineno y col (desde 1) de la tabla de líneas."""
+        self.reset()
+        self.lexer.input(code)
+        toks = list(iter(self.lexer.token, None))
+        tabla = tabla_de(self.lexer)
+        for tok in toks:
+            tok.lineno, tok.col = tabla.posicion(tok.lexpos)
+        return toks
+
+    def parse(self, code):
+        """AST con las sentencias válidas; los errores sintácticos de todo el
+        archivo quedan en errores_sintacticos como Diagnostico."""
+        self.reset()
+        ast, self.errores_sintacticos = parsear(code, self.lexer, self.parser)
+        return ast
+
+    def iter_statements(self, code):
+        """Sentencias una a una, a medida que se parsean (ver analizador_sintactico)."""
+        self.reset()
+        return iter_statements(code, lexer=self.lexer, parser=self.parser)
+
+    def parse_archivo(self, ruta):
+        """Como parse, pero con los tokens del archivo mapeado en memoria y
+        lexeado por trozos: el texto completo nunca está en un solo str."""
+        self.reset()
+        self.fuente = FuenteArchivo(ruta, lexer=self.lexer)
+        ast, self.errores_sintacticos = parsear_flujo(self.fuente.siguiente_token(),
+                                                      self.fuente, self.parser)
+        return ast
+
+    def iter_statements_archivo(self, ruta):
+        """Sentencias del archivo una a una; tampoco se queda con el AST completo.
+        Los errores sintácticos se van agregando a errores_sintacticos."""
+        self.reset()
+        self.fuente = FuenteArchivo(ruta, lexer=self.lexer)
+        return self.fuente.sentencias(self.parser, self.errores_sintacticos)
+
+    def analyze(self, ast):
+        sem = SemanticAnalyzer()
+        sem.analyze(ast)
+        return sem
+
+    def run(self, ast, interpreter=None):
+        interp = interpreter if interpreter is not None else Interpreter()
+        interp.run(ast)
+        return interp
+
+    def run_streaming(self, code, interpreter=None):
+        """Analiza y ejecuta cada sentencia apenas se parsea, sin armar el AST completo.
+
+        A diferencia de analyze + run, las sentencias anteriores a un error
+        semántico ya se ejecutaron cuando éste aparece.
+        """
+        sem = SemanticAnalyzer()
+        interp = interpreter if interpreter is not None else Interpreter()
+        for stmt in self.iter_statements(code):
+            sem.analyze(stmt)
+            interp.run(stmt)
+        return interp
@@ -0,0 +1,224 @@
+# transpilador.py
+# Traduce un programa a una función de Python, la compila una vez con compile()
+# y la corre con exec: las variables son locales de la función, las
+# operaciones son los operadores nativos y cada sentencia queda en su propio
+# try, así que un error se reporta y se sigue con la próxima, igual que en
+# Interpreter.run.
+#
+# Se traduce desde el Bytecode (ya plano), no desde el AST: armar el texto de
+# las expresiones es simular la pila de la VM, sin recursión. Las expresiones
+# más hondas que PROFUNDIDAD_MAXIMA se parten en temporales (_t0, _t1, ...)
+# para que compile() no choque con sus propios límites de anidamiento.
+#
+# Para los mensajes de error no se traduce nada: cuando una sentencia falla, la
+# VM la vuelve a evaluar con las mismas variables y el error que reporta es
+# exactamente el del intérprete.
+
+import math
+from collections import OrderedDict
+
+from compilador_bytecode import (
+    BINARY, BINARY_CONST, BINARY_OPS, BINARY_VAR, CAPTURA, DECLARE, LOAD_CONST,
+    LOAD_VAR, LOG, STORE, VM, compile_program,
+)
+
+# Paréntesis anidados que se dejan en una expresión antes de pasar a un temporal
+PROFUNDIDAD_MAXIMA = 50
+
+# Programas ya compilados que guarda TranspiledInterpreter.run
+MAX_COMPILADOS = 16
+
+SIMBOLOS = {fn: op for op, fn in BINARY_OPS.items()}
+PRECEDENCIA = {"+": 1, "-": 1, "*": 2, "/": 2}
+ATOMO = 3
+
+# Prefijo de las variables del programa en el código generado: así ningún
+# nombre choca con una palabra reservada de Python ni con los temporales
+PREFIJO = "v_"
+
+
+class Transpilado:
+    """El código fuente generado, su code object y el Bytecode del que salió
+    (la VM lo usa para reportar los errores)."""
+
+    def __init__(self, bytecode, fuente, codigo):
+        self.bytecode = bytecode
+        self.fuente = fuente
+        self.codigo = codigo
+
+    def funcion(self):
+        espacio = {}
+        exec(self.codigo, espacio)
+        return espacio["_programa"]
+
+
+#   TRADUCCIÓN
+
+def _literal(valor):
+    if valor.__class__ is float and not math.isfinite(valor):
+        # inf o nan: no tienen literal en Python
+        return f"float({str(valor)!r})"
+    texto = repr(valor)
+    return f"({texto})" if texto.startswith("-") else texto
+
+
+class _Traductor:
+    def __init__(self, bytecode):
+        self.bytecode = bytecode
+        self.nombres = {}       # dict ordenado: nombres del programa en orden de aparición
+
+    def variable(self, slot):
+        """La local de Python de la variable del slot (las locales ya van por slot en CPython)."""
+        nombre = self.bytecode.nombres[slot]
+        self.nombres[nombre] = None
+        return PREFIJO + nombre
+
+    def traducir(self):
+        bc = self.bytecode
+        fines = bc.stmt_starts[1:] + [len(bc.code)]
+        cuerpo = []
+        for i, (inicio, fin) in enumerate(zip(bc.stmt_starts, fines)):
+            cuerpo += self.sentencia(i, bc.code[inicio:fin])
+
+        lineas = ["def _programa(M, log, coma, captura, fallo):"]
+        # Lo que ya estaba en memoria (otro run sobre el mismo intérprete)
+        lineas += [f"    if {n!r} in M: {PREFIJO}{n} = M[{n!r}]" for n in self.nombres]
+        lineas += cuerpo
+        lineas.append("    return locals()")
+        return "\n".join(lineas) + "\n"
+
+    def sentencia(self, i, code):
+        """Líneas de una sentencia; las que pueden fallar van dentro de un try."""
+        lineas = []
+        pila = []             # (texto, profundidad, precedencia)
+        temporales = 0
+        puede_fallar = False
+
+        for op, arg in code:
+            if op == LOAD_CONST:
+                pila.append((_literal(arg), 0, ATOMO))
+            elif op == LOAD_VAR:
+                pila.append((self.variable(arg), 0, ATOMO))
+            elif op in (BINARY, BINARY_CONST, BINARY_VAR):
+                puede_fallar = True
+                if op == BINARY:
+                    fn = arg
+                    derecha = pila.pop()
+                elif op == BINARY_CONST:
+                    fn, valor = arg
+                    derecha = (_literal(valor), 0, ATOMO)
+                else:
+                    fn, slot = arg
+                    derecha = (self.variable(slot), 0, ATOMO)
+                izquierda = pila.pop()
+                simbolo = SIMBOLOS[fn]
+                p = PRECEDENCIA[simbolo]
+                # Asociativo a la izquierda: a la derecha también van paréntesis con
+                # la misma precedencia (en reales a + (b + c) no es (a + b) + c)
+                lt = izquierda[0] if izquierda[2] >= p else f"({izquierda[0]})"
+                rt = derecha[0] if derecha[2] > p else f"({derecha[0]})"
+                prof = max(izquierda[1], derecha[1]) + 1
+                texto = f"{lt} {simbolo} {rt}"
+                if prof > PROFUNDIDAD_MAXIMA:
+                    tmp = f"_t{temporales}"
+                    temporales += 1
+                    lineas.append(f"{tmp} = {texto}")
+                    pila.append((tmp, 0, ATOMO))
+                else:
+                    pila.append((texto, prof, p))
+            elif op == CAPTURA:
+                puede_fallar = True
+                pila.append((f"captura({arg!r})", 0, ATOMO))
+            elif op == STORE:
+                texto, _, _ = pila.pop()
+                destino = self.variable(arg)
+                if texto.startswith(PREFIJO) and texto.isidentifier():
+                    # x = y: si y no tiene valor no hay operación que falle sola
+                    puede_fallar = True
+                    lineas.append(f"if {texto} is None: raise LookupError")
+                lineas.append(f"{destino} = {texto}")
+                nombre = self.bytecode.nombres[arg]
+                lineas.append(f"log(f'{nombre} = {{coma({destino}) if {destino}.__class__ is float else {destino}}}')")
+            elif op == DECLARE:
+                slot, tipo = arg
+                lineas.append(f"{self.variable(slot)} = None")
+                lineas.append(f"log({f'Variable declarada: {self.bytecode.nombres[slot]} ({tipo})'!r})")
+            elif op == LOG:
+                lineas.append(f"log({arg!r})")
+            else:
+                raise Exception(f"No puedo traducir la instrucción {op}")
+
+        if not puede_fallar:
+            return ["    " + l for l in lineas]
+        return (["    try:"] + ["        " + l for l in lineas] +
+                ["    except Exception as e:", f"        fallo({i}, e, locals())"])
+
+
+def transpilar(programa):
+    """Program (o su Bytecode) → Transpilado, listo para TranspiledInterpreter."""
+    bytecode = programa if hasattr(programa, "stmt_starts") else compile_program(programa)
+    fuente = _Traductor(bytecode).traducir()
+    return Transpilado(bytecode, fuente, compile(fuente, "<pqek>", "exec"))
+
+
+#   EJECUCIÓN
+
+_compilados = OrderedDict()   # id(programa) → (programa, Transpilado), LRU
+
+
+def transpilado_de(programa):
+    """El Transpilado del programa, compilado solo la primera vez que se corre."""
+    clave = id(programa)
+    if clave in _compilados:
+        _compilados.move_to_end(clave)
+        return _compilados[clave][1]
+    t = transpilar(programa)
+    # Se guarda también el programa para que su id no se reuse mientras esté aquí
+    _compilados[clave] = (programa, t)
+    if len(_compilados) > MAX_COMPILADOS:
+        _compilados.popitem(last=False)
+    return t
+
+
+class TranspiledInterpreter(VM):
+    """Corre programas traducidos a Python, con la misma salida y los mismos
+    errores que Interpreter."""
+
+    def run(self, node):
+        self.execute_python(transpilado_de(node))
+
+    def execute_python(self, t):
+        bc = t.bytecode
+        self.preparar(bc)
+        memory = self.memory
+
+        def captura(tipo):
+            self._anunciar_captura(tipo)
+            return self._valor_capturado(tipo, self._read_input_from_output())
+
+        def fallo(i, e, variables):
+            self._volcar(variables)
+            inicio = bc.stmt_starts[i]
+            fin = bc.stmt_starts[i + 1] if i + 1 < len(bc.stmt_starts) else len(bc.code)
+            code = bc.code[inicio:fin]
+            if not any(op == CAPTURA for op, _ in code):
+                # La VM evalúa la sentencia otra vez (sin el STORE final) y falla
+                # igual que el intérprete, con su mismo mensaje
+                if code[-1][0] == STORE:
+                    code = code[:-1]
+                reintento = self._loop(code, 0)
+                if reintento is not None:
+                    e = reintento[1]
+            self._error_ejecucion(bc.stmt_kinds[i], *bc.stmt_pos[i], e)
+
+        variables = t.funcion()(memory, self.log, self._to_comma, captura, fallo)
+        self._volcar(variables)
+        self.sink.flush()
+
+    def _volcar(self, variables):
+        """Pasa las locales de la función generada a la memoria, cada una a su slot."""
+        n = len(PREFIJO)
+        valores, slots = self.valores, self.slots
+        for k, v in variables.items():
+            if k.startswith(PREFIJO):
+                valores[slots[k[n:]]] = v